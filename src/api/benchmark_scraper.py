@@ -0,0 +1,171 @@
+import os
+import io
+import json
+import time
+import argparse
+import tempfile
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from typing import Dict
+
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+from src.api.crawl_frontier import CrawlFrontier
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.response_cache import SerpAPIResponseCache
+from src.api.serpapi_standin import DEFAULT_SAMPLE_CSV, SerpAPIStandIn
+
+# Variables that would connect the scraper to a database or its local write state
+DATABASE_ENV = ("SUPABASE_URL", "SUPABASE_API_KEY", "SUPABASE_WRITE_BEHIND", "SUPABASE_DIFF_SYNC")
+
+
+@contextmanager
+def database_disabled():
+    """
+    Blank the database settings while a scraper is built, so it opens no
+    Supabase client, write-behind journal or sync index
+
+    Blank values (rather than unset ones) also stop load_dotenv() from
+    filling them in from a .env file.
+    """
+    saved = {name: os.environ.get(name) for name in DATABASE_ENV}
+    os.environ.update({name: "" for name in DATABASE_ENV})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_benchmark(pages: int = 5,
+                  page_size: int = 10,
+                  max_concurrency: int = 5,
+                  requests_per_second: float = 1000.0,
+                  burst: int = 50,
+                  cache_mode: str = "bypass",
+                  cache_dir: str = None,
+                  fetch_details: bool = False,
+                  prefetch_pages: int = 1,
+                  quiet: bool = True,
+                  **standin_options) -> Dict:
+    """
+    Run search_and_save against a local SerpAPI stand-in and measure throughput
+
+    Args:
+        pages: Number of search pages to crawl
+        page_size: Restaurants per search page
+        max_concurrency: Scraper fetch concurrency
+        requests_per_second: Rate limiter budget for the run
+        burst: Rate limiter burst size for the run
+        cache_mode: Scraper cache mode ("use", "refresh" or "bypass")
+        cache_dir: Response cache directory (a temporary one if not given)
+        fetch_details: Whether to fetch business details as well as reviews
+        prefetch_pages: Number of search pages to request ahead of processing
+        quiet: Suppress the scraper's per-request output
+        **standin_options: Extra options for SerpAPIStandIn (latency_ms, error_rate, ...)
+
+    Returns:
+        Dictionary with timings, throughput and stand-in request counts
+    """
+    os.environ.setdefault("SERPAPI_API_KEY", "standin")
+
+    standin = SerpAPIStandIn(page_size=page_size, **standin_options)
+    server, backend = standin.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = None
+        if cache_mode != "bypass":
+            cache = SerpAPIResponseCache(cache_dir=cache_dir or os.path.join(tmp, "cache"))
+
+        # Benchmarks never touch the real database or the real API
+        with database_disabled():
+            scraper = YelpSupabaseScraper(
+                max_concurrency=max_concurrency,
+                rate_limiter=TokenBucketRateLimiter(requests_per_second=requests_per_second, burst=burst),
+                cache=cache,
+                cache_mode=cache_mode,
+                frontier=CrawlFrontier(os.path.join(tmp, "crawl_frontier.sqlite"))
+            )
+        scraper.backend = backend
+
+        output = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with redirect_stdout(output) if quiet else nullcontext():
+                restaurants, metadata = scraper.search_and_save(
+                    "Seattle, WA",
+                    max_pages=pages,
+                    results_per_page=page_size,
+                    fetch_details=fetch_details,
+                    prefetch_pages=prefetch_pages,
+                    use_frontier=False
+                )
+        finally:
+            elapsed = time.perf_counter() - start
+            server.shutdown()
+            server.server_close()
+
+    pages_done = metadata.get("last_page", 0) + 1
+
+    return {
+        "status": metadata.get("status"),
+        "elapsed_seconds": round(elapsed, 3),
+        "pages": pages_done,
+        "restaurants": len(restaurants),
+        "pages_per_second": round(pages_done / elapsed, 2) if elapsed else 0,
+        "restaurants_per_second": round(len(restaurants) / elapsed, 2) if elapsed else 0,
+        "standin_requests": standin.stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Yelp scraper against a local SerpAPI stand-in")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--rps", type=float, default=1000.0, help="Rate limiter requests per second")
+    parser.add_argument("--burst", type=int, default=50, help="Rate limiter burst size")
+    parser.add_argument("--cache-mode", choices=["use", "refresh", "bypass"], default="bypass")
+    parser.add_argument("--cache-dir", help="Response cache directory (temporary if omitted)")
+    parser.add_argument("--details", action="store_true", help="Also fetch business details")
+    parser.add_argument("--prefetch", type=int, default=1, help="Search pages to request ahead (0 disables)")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of runs (useful with --cache-dir)")
+    parser.add_argument("--sample-csv", default=DEFAULT_SAMPLE_CSV)
+    parser.add_argument("--replay-dir", help="Response cache directory to replay recorded responses from")
+    parser.add_argument("--reviews-per-place", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="Show scraper output")
+    args = parser.parse_args()
+
+    for run in range(1, args.repeat + 1):
+        result = run_benchmark(
+            pages=args.pages,
+            page_size=args.page_size,
+            max_concurrency=args.concurrency,
+            requests_per_second=args.rps,
+            burst=args.burst,
+            cache_mode=args.cache_mode,
+            cache_dir=args.cache_dir,
+            fetch_details=args.details,
+            prefetch_pages=args.prefetch,
+            quiet=not args.verbose,
+            sample_csv=args.sample_csv,
+            replay_dir=args.replay_dir,
+            total_results=args.pages * args.page_size,
+            reviews_per_place=args.reviews_per_place,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed
+        )
+        print(f"Run {run}: {json.dumps(result, indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class ConcurrentFetcher:
+    """
+    Fan out per-restaurant SerpAPI calls (reviews and business details) for a
+    whole page of search results under a bounded worker pool.
+
+    The SerpAPI client is synchronous, so a thread pool is enough to overlap
+    the network latency of many requests without changing the scraper API.
+    """
+
+    def __init__(self, scraper, max_concurrency: int = 5):
+        """
+        Initialize the fetcher
+
+        Args:
+            scraper: Scraper instance exposing get_reviews and get_business_details
+            max_concurrency: Maximum number of requests in flight at once
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.scraper = scraper
+        self.max_concurrency = max_concurrency
+
+    def fetch_page(self,
+                   restaurants: List[Dict],
+                   location: str,
+                   fetch_reviews: bool = True,
+                   fetch_details: bool = False,
+                   max_reviews: int = 10,
+                   review_plans: Optional[List[Optional[Dict]]] = None,
+                   detail_plans: Optional[List[bool]] = None) -> List[Dict]:
+        """
+        Fetch reviews and/or business details for every restaurant on a page
+
+        Args:
+            restaurants: Restaurants on the page (each must have a place_id)
+            location: City and state, needed for business details lookups
+            fetch_reviews: Whether to fetch reviews
+            fetch_details: Whether to fetch business details
+            max_reviews: Maximum number of reviews to fetch per restaurant
+            review_plans: Optional per-restaurant review options, in page order.
+                None skips reviews for that restaurant; a dict is passed as
+                extra keyword arguments to get_reviews (e.g. {"since": date})
+            detail_plans: Optional per-restaurant flags, in page order, telling
+                whether to fetch business details for that restaurant
+
+        Returns:
+            One result per restaurant, in page order, with keys "reviews",
+            "details" and "errors" (a dict of error messages keyed by call type)
+        """
+        results = [{"reviews": [], "details": None, "errors": {}} for _ in restaurants]
+
+        if not restaurants or not (fetch_reviews or fetch_details):
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = []
+
+            for index, restaurant in enumerate(restaurants):
+                place_id = restaurant["place_id"]
+
+                review_options = {} if review_plans is None else review_plans[index]
+                if fetch_reviews and review_options is not None:
+                    future = executor.submit(self.scraper.get_reviews, place_id, max_reviews, **review_options)
+                    futures.append((index, "reviews", future))
+                if fetch_details and (detail_plans is None or detail_plans[index]):
+                    future = executor.submit(self.scraper.get_business_details, place_id, location)
+                    futures.append((index, "details", future))
+
+            # Gather in submission order so results line up with the page
+            for index, kind, future in futures:
+                try:
+                    results[index][kind] = future.result()
+                except Exception as e:
+                    results[index]["errors"][kind] = str(e)
+
+        return results
+
+
+class PagePrefetcher:
+    """
+    Fetch search pages in a background thread ahead of the consumer.
+
+    Pages are handed over through a bounded queue, so at most `lookahead`
+    fetched pages wait while the current page's reviews and database writes
+    are still running. Iterating yields (page_num, results) pairs in order;
+    an exception raised while fetching is re-raised in the consumer.
+    """
+
+    _DONE = object()
+
+    def __init__(self,
+                 fetch_page: Callable[[int], Dict],
+                 page_numbers: Iterable[int],
+                 is_last_page: Callable[[Dict], bool] = None,
+                 lookahead: int = 1):
+        """
+        Initialize and start the prefetcher
+
+        Args:
+            fetch_page: Function fetching one page given its page number
+            page_numbers: Page numbers to fetch, in order
+            is_last_page: Predicate telling whether a fetched page is the last one
+            lookahead: Maximum number of fetched pages waiting to be processed
+        """
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+
+        self.fetch_page = fetch_page
+        self.page_numbers = page_numbers
+        self.is_last_page = is_last_page or (lambda results: False)
+
+        self._queue = queue.Queue(maxsize=lookahead)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        # Wait for room in the queue, giving up if the consumer has stopped
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        for page_num in self.page_numbers:
+            if self._stopped.is_set():
+                return
+
+            try:
+                results = self.fetch_page(page_num)
+            except Exception as e:
+                self._put((page_num, None, e))
+                break
+
+            if not self._put((page_num, results, None)):
+                return
+            if self.is_last_page(results):
+                break
+
+        self._put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+
+            page_num, results, error = item
+            if error is not None:
+                raise error
+            yield page_num, results
+
+    def close(self):
+        """
+        Stop fetching further pages and wait for the background thread
+        """
+        self._stopped.set()
+        self._thread.join()
@@ -0,0 +1,181 @@
+import os
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set
+
+# How long a fetch stays fresh, in seconds, per kind of fetch
+DEFAULT_FRESHNESS = {
+    "restaurant": 24 * 3600,
+    "reviews": 24 * 3600,
+    "details": 7 * 24 * 3600
+}
+
+# SQLite limits the number of bound parameters per statement
+_CHUNK_SIZE = 500
+
+
+class CrawlFrontier:
+    """
+    Persistent seen-set of place_ids shared by every query of a crawl.
+
+    The same restaurant is returned by many searches (different queries,
+    categories, prices and sort orders). The frontier records when each
+    place's restaurant row, reviews and details were last fetched, so each
+    is fetched at most once per freshness window however many searches
+    surface the place.
+
+    Entries live in a SQLite table keyed by (place_id, kind) without a
+    rowid, i.e. a sorted on-disk set, which several worker processes can
+    share.
+    """
+
+    def __init__(self,
+                 path: str = os.path.join(".serpapi_cache", "crawl_frontier.sqlite"),
+                 freshness: Optional[Dict[str, int]] = None):
+        """
+        Initialize the frontier
+
+        Args:
+            path: SQLite file holding the seen-set
+            freshness: Freshness window in seconds per kind (overrides DEFAULT_FRESHNESS)
+        """
+        self.path = path
+        self.freshness = {**DEFAULT_FRESHNESS, **(freshness or {})}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seen (
+                    place_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    fetched_at INTEGER NOT NULL,
+                    PRIMARY KEY (place_id, kind)
+                ) WITHOUT ROWID
+            """)
+
+    @classmethod
+    def from_env(cls) -> "CrawlFrontier":
+        """
+        Build a frontier from environment variables
+
+        CRAWL_FRONTIER_PATH overrides the SQLite file and
+        CRAWL_FRESHNESS_HOURS the restaurant and review freshness window.
+        """
+        freshness = {}
+        if os.getenv("CRAWL_FRESHNESS_HOURS"):
+            hours = float(os.getenv("CRAWL_FRESHNESS_HOURS"))
+            freshness = {"restaurant": int(hours * 3600), "reviews": int(hours * 3600)}
+
+        return cls(
+            path=os.getenv("CRAWL_FRONTIER_PATH", os.path.join(".serpapi_cache", "crawl_frontier.sqlite")),
+            freshness=freshness
+        )
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connections keep the frontier safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _window(self, kind: str) -> int:
+        if kind not in self.freshness:
+            raise ValueError(f"Unknown fetch kind: {kind}")
+        return self.freshness[kind]
+
+    def claim(self, place_ids: Iterable[str], kind: str) -> Set[str]:
+        """
+        Claim the places whose fetch of this kind is due
+
+        Due places are marked as fetched in the same transaction, so when
+        several workers surface the same place only one of them fetches it.
+        Call release() for places whose fetch then fails.
+
+        Args:
+            place_ids: Places surfaced by a search
+            kind: "restaurant", "reviews" or "details"
+
+        Returns:
+            The place_ids the caller should fetch
+        """
+        place_ids = list(dict.fromkeys(place_ids))
+        now = int(time.time())
+        cutoff = now - self._window(kind)
+        claimed = set()
+
+        with self._connect() as conn:
+            # Take the write lock up front so the check and the mark are atomic
+            conn.execute("BEGIN IMMEDIATE")
+
+            for i in range(0, len(place_ids), _CHUNK_SIZE):
+                chunk = place_ids[i:i + _CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                fresh = {
+                    row[0] for row in conn.execute(
+                        f"SELECT place_id FROM seen WHERE kind = ? AND fetched_at > ? "
+                        f"AND place_id IN ({placeholders})",
+                        [kind, cutoff, *chunk]
+                    )
+                }
+                due = [place_id for place_id in chunk if place_id not in fresh]
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO seen (place_id, kind, fetched_at) VALUES (?, ?, ?)",
+                    [(place_id, kind, now) for place_id in due]
+                )
+                claimed.update(due)
+
+        return claimed
+
+    def release(self, place_ids: Iterable[str], kind: str):
+        """
+        Forget claimed fetches that failed so the next search retries them
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "DELETE FROM seen WHERE place_id = ? AND kind = ?",
+                [(place_id, kind) for place_id in place_ids]
+            )
+
+    def is_fresh(self, place_id: str, kind: str) -> bool:
+        """
+        Check whether a place's fetch of this kind is still fresh
+        """
+        cutoff = int(time.time()) - self._window(kind)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM seen WHERE place_id = ? AND kind = ? AND fetched_at > ?",
+                (place_id, kind, cutoff)
+            ).fetchone()
+        return row is not None
+
+    def prune(self) -> int:
+        """
+        Drop entries older than their freshness window
+
+        Returns:
+            Number of entries removed
+        """
+        now = int(time.time())
+        removed = 0
+        with self._connect() as conn:
+            for kind, window in self.freshness.items():
+                removed += conn.execute(
+                    "DELETE FROM seen WHERE kind = ? AND fetched_at <= ?", (kind, now - window)
+                ).rowcount
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of tracked places per kind
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT kind, COUNT(*) FROM seen GROUP BY kind").fetchall()
+        return dict(rows)
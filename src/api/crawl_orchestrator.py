@@ -0,0 +1,319 @@
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from src.api.response_cache import production_cache_mode
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+
+# Defaults for every spec dimension that isn't given
+SPEC_DEFAULTS = {
+    "queries": ["Restaurants"],
+    "categories": ["all"],
+    "prices": ["all"],
+    "sort_orders": ["recommended"],
+    "max_pages": 5,
+    "results_per_page": 20,
+    "max_reviews": 10,
+    "fetch_details": False
+}
+
+# Scraper owned by each worker process (created by _init_worker)
+_worker_scraper = None
+
+
+def load_crawl_spec(path: str) -> Dict:
+    """
+    Load a crawl spec from a JSON file
+
+    A spec lists the dimensions to crawl, e.g.
+        {"locations": ["Seattle, WA"], "categories": ["italian", "thai"],
+         "prices": ["$", "$$"], "sort_orders": ["rating"], "max_pages": 3}
+
+    Args:
+        path: Path to the JSON spec
+
+    Returns:
+        The spec with defaults filled in
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    if not spec.get("locations"):
+        raise ValueError("Crawl spec must list at least one location")
+
+    return {**SPEC_DEFAULTS, **spec}
+
+
+def unit_key(unit: Dict) -> str:
+    """
+    Key a work unit's checkpoint is stored under (the scrape_metadata query)
+    """
+    return f"{unit['query']} [category={unit['category']}, price={unit['price']}, sort={unit['sort_by']}]"
+
+
+def expand_work_units(spec: Dict) -> List[Dict]:
+    """
+    Expand a crawl spec into one work unit per
+    location x query x category x price x sort order
+
+    Args:
+        spec: Crawl spec (see load_crawl_spec)
+
+    Returns:
+        List of work unit dictionaries
+    """
+    spec = {**SPEC_DEFAULTS, **spec}
+    units = []
+
+    for location, query, category, price, sort_by in itertools.product(
+            spec["locations"], spec["queries"], spec["categories"], spec["prices"], spec["sort_orders"]):
+        unit = {
+            "location": location,
+            "query": query,
+            "category": category,
+            "price": price,
+            "sort_by": sort_by,
+            "max_pages": spec["max_pages"],
+            "results_per_page": spec["results_per_page"],
+            "max_reviews": spec["max_reviews"],
+            "fetch_details": spec["fetch_details"]
+        }
+        unit["key"] = unit_key(unit)
+        units.append(unit)
+
+    return units
+
+
+def resume_page(metadata: Optional[Dict], max_age_hours: Optional[float] = None) -> Optional[int]:
+    """
+    Work out where a unit should restart from its checkpoint
+
+    Args:
+        metadata: The unit's scrape_metadata row, if any
+        max_age_hours: Crawl a completed unit again once its checkpoint is
+            older than this (None skips completed units for good)
+
+    Returns:
+        The page to start from, or None if the unit already completed
+    """
+    if not metadata:
+        return 0
+
+    status = metadata.get("status")
+    last_page = metadata.get("last_page") or 0
+
+    if status == "completed":
+        if max_age_hours is not None and metadata.get("last_updated"):
+            completed_at = datetime.fromisoformat(metadata["last_updated"])
+            if datetime.now() - completed_at > timedelta(hours=max_age_hours):
+                return 0
+        return None
+    if status == "processing":
+        # The last page was fully saved
+        return last_page + 1
+    # Started, failed or interrupted part-way through last_page: redo it
+    return last_page
+
+
+def _init_worker(max_concurrency: int):
+    global _worker_scraper
+    # Each process has its own scraper; the rate limiter state file is shared
+    _worker_scraper = YelpSupabaseScraper(max_concurrency=max_concurrency, cache_mode=production_cache_mode())
+
+
+def run_unit(unit: Dict, restart: bool = False, max_age_hours: Optional[float] = None) -> Dict:
+    """
+    Crawl one work unit in a worker process, resuming from its checkpoint
+
+    Args:
+        unit: Work unit from expand_work_units
+        restart: Ignore the checkpoint and crawl from the first page
+        max_age_hours: Crawl the unit again if it completed longer ago than this
+
+    Returns:
+        Summary with the unit key, final status, restaurant count and error
+    """
+    scraper = _worker_scraper
+    start_page = 0
+
+    if scraper.supabase and not restart:
+        start_page = resume_page(scraper.get_scrape_metadata(unit["location"], unit["key"]), max_age_hours)
+        if start_page is None:
+            return {"key": unit["key"], "location": unit["location"], "status": "skipped",
+                    "restaurants": 0, "error": None}
+
+    started = time.time()
+    restaurants, metadata = scraper.search_and_save(
+        unit["location"],
+        unit["query"],
+        start_page=start_page,
+        max_pages=unit["max_pages"],
+        results_per_page=unit["results_per_page"],
+        fetch_details=unit["fetch_details"],
+        max_reviews=unit["max_reviews"],
+        checkpoint_key=unit["key"],
+        price=unit["price"],
+        category=unit["category"],
+        sort_by=unit["sort_by"]
+    )
+
+    # Pool workers exit without running atexit hooks, so drain journaled writes now
+    if scraper.journal:
+        scraper.journal.close()
+        scraper.journal.start()
+
+    return {
+        "key": unit["key"],
+        "location": unit["location"],
+        "status": metadata.get("status"),
+        "restaurants": len(restaurants),
+        "error": metadata.get("error"),
+        "elapsed": time.time() - started
+    }
+
+
+class CrawlOrchestrator:
+    """
+    Run a crawl spec's work units across a pool of worker processes.
+
+    Progress is checkpointed per unit in scrape_metadata, so an interrupted
+    crawl picks up where each unit stopped, and failed units are retried
+    once their retry delay has passed while the other units keep running.
+    Completed units are skipped unless their checkpoint is older than
+    max_age_hours, so a scheduled rerun of the same spec crawls them again.
+    All workers share the file-backed SerpAPI rate limiter, so throughput
+    grows with the worker count until that limit is reached.
+    """
+
+    def __init__(self,
+                 workers: int = 4,
+                 max_concurrency: int = 5,
+                 max_retries: int = 2,
+                 retry_delay: float = 30.0,
+                 max_age_hours: Optional[float] = None):
+        """
+        Initialize the orchestrator
+
+        Args:
+            workers: Number of worker processes
+            max_concurrency: Review/detail requests in flight per worker
+            max_retries: Times a failed unit is retried
+            retry_delay: Seconds to wait before retrying a failed unit
+            max_age_hours: Crawl completed units again once their checkpoint
+                is older than this (None skips them until --restart)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_age_hours = max_age_hours
+
+    def run(self, units: List[Dict], restart: bool = False) -> List[Dict]:
+        """
+        Crawl every work unit
+
+        Args:
+            units: Work units from expand_work_units
+            restart: Ignore existing checkpoints
+
+        Returns:
+            Final summary for each unit
+        """
+        summaries = {}
+        attempts = {unit["key"]: 0 for unit in units}
+        started = time.time()
+
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.max_concurrency,)) as executor:
+            pending = {executor.submit(run_unit, unit, restart, self.max_age_hours): unit for unit in units}
+            # Failed units waiting for their retry time, as (not_before, unit)
+            retries = []
+
+            while pending or retries:
+                # Retries resume from the checkpoint written by the failed attempt
+                now = time.time()
+                for not_before, unit in [retry for retry in retries if retry[0] <= now]:
+                    retries.remove((not_before, unit))
+                    pending[executor.submit(run_unit, unit, False, self.max_age_hours)] = unit
+
+                # Wake up for the next finished unit or the next retry, whichever comes first
+                timeout = max(0.0, min(not_before for not_before, _ in retries) - now) if retries else None
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    unit = pending.pop(future)
+                    attempts[unit["key"]] += 1
+
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        summary = {"key": unit["key"], "location": unit["location"], "status": "failed",
+                                   "restaurants": 0, "error": str(e)}
+
+                    summary["attempts"] = attempts[unit["key"]]
+                    summaries[unit["key"]] = summary
+                    print(f"[{len(summaries)}/{len(units)}] {unit['location']} - {unit['key']}: "
+                          f"{summary['status']} ({summary['restaurants']} restaurants)")
+
+                    if summary["status"] == "failed" and attempts[unit["key"]] <= self.max_retries:
+                        print(f"Retrying {unit['key']} in {self.retry_delay:.0f}s: {summary['error']}")
+                        retries.append((time.time() + self.retry_delay, unit))
+
+        elapsed = time.time() - started
+        total = sum(summary["restaurants"] for summary in summaries.values())
+        print(f"\nCrawled {total} restaurants in {elapsed:.1f}s "
+              f"({total / elapsed if elapsed else 0:.1f} restaurants/sec)")
+
+        return [summaries[unit["key"]] for unit in units]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl every combination in a crawl spec across worker processes")
+    parser.add_argument("spec", help="Path to a JSON crawl spec")
+    parser.add_argument("--workers", type=int, default=4, help="Number of worker processes")
+    parser.add_argument("--concurrency", type=int, default=5, help="Review/detail requests in flight per worker")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retries per failed unit")
+    parser.add_argument("--retry-delay", type=float, default=30.0, help="Seconds before retrying failed units")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and crawl every unit from page 0")
+    parser.add_argument("--max-age-hours", type=float, default=24.0,
+                        help="Crawl completed units again once they are older than this")
+    parser.add_argument("--dry-run", action="store_true", help="List the work units without crawling")
+    args = parser.parse_args()
+
+    units = expand_work_units(load_crawl_spec(args.spec))
+    print(f"{len(units)} work units")
+
+    if args.dry_run:
+        for unit in units:
+            print(f"- {unit['location']} - {unit['key']}")
+        return
+
+    orchestrator = CrawlOrchestrator(
+        workers=args.workers,
+        max_concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        retry_delay=args.retry_delay,
+        max_age_hours=args.max_age_hours
+    )
+    summaries = orchestrator.run(units, restart=args.restart)
+
+    failed = [summary for summary in summaries if summary["status"] == "failed"]
+    print(f"Completed: {sum(1 for s in summaries if s['status'] == 'completed')}, "
+          f"skipped: {sum(1 for s in summaries if s['status'] == 'skipped')}, failed: {len(failed)}")
+    for summary in failed:
+        print(f"- {summary['location']} - {summary['key']}: {summary['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import json
+import math
+import argparse
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.api.crawl_orchestrator import resume_page
+from src.api.response_cache import production_cache_mode
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+
+# (west, south, east, north) in degrees
+Tile = Tuple[float, float, float, float]
+
+# Yelp stops paginating a search after this many results
+RESULT_CAP = 240
+
+
+def format_bounds(tile: Tile) -> str:
+    """
+    Format a tile as a Yelp map-bounds location ("g:west,south,east,north")
+    """
+    return "g:" + ",".join(f"{value:.5f}" for value in tile)
+
+
+def parse_bounds(bounds: str) -> Tile:
+    """
+    Parse a map-bounds location produced by format_bounds
+    """
+    west, south, east, north = (float(value) for value in bounds[2:].split(","))
+    return west, south, east, north
+
+
+def split_tile(tile: Tile) -> List[Tile]:
+    """
+    Split a tile into four quadrants
+    """
+    west, south, east, north = tile
+    mid_lon = (west + east) / 2
+    mid_lat = (south + north) / 2
+    return [
+        (west, mid_lat, mid_lon, north),
+        (mid_lon, mid_lat, east, north),
+        (west, south, mid_lon, mid_lat),
+        (mid_lon, south, east, mid_lat)
+    ]
+
+
+def bounding_box_from_csv(csv_path: str = "Data/yelp_master_original.csv",
+                          city: Optional[str] = None,
+                          trim: float = 0.01) -> Tile:
+    """
+    Compute a crawl bounding box from previously geocoded restaurants
+
+    Args:
+        csv_path: CSV with latitude and longitude columns
+        city: Only use rows from this city
+        trim: Fraction of outliers dropped at each edge (mis-geocoded rows)
+
+    Returns:
+        Tile covering the restaurants
+    """
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    if city and "city" in df.columns:
+        df = df[df["city"].str.lower() == city.lower()]
+    df = df.dropna(subset=["latitude", "longitude"])
+
+    if df.empty:
+        raise ValueError(f"No geocoded restaurants found in {csv_path}")
+
+    return (
+        float(df["longitude"].quantile(trim)),
+        float(df["latitude"].quantile(trim)),
+        float(df["longitude"].quantile(1 - trim)),
+        float(df["latitude"].quantile(1 - trim))
+    )
+
+
+def reported_total(results: Dict) -> Optional[int]:
+    """
+    Total result count reported by a search response, if any
+    """
+    total = results.get("search_information", {}).get("total_results")
+    try:
+        return int(total) if total is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def has_next_page(results: Dict) -> bool:
+    """
+    Whether a search response links to a further page
+    """
+    return "next" in results.get("serpapi_pagination", {})
+
+
+class GeoTiler:
+    """
+    Cover a metro area beyond the per-search result cap.
+
+    The bounding box is searched tile by tile using map bounds. Tiles whose
+    results hit the cap are split into quadrants and searched again, so
+    dense areas get small tiles and sparse ones stay large. Results from all
+    tiles are merged by place_id.
+
+    Whether a tile needs splitting is decided before it is crawled, from
+    its first page: the reported total when there is one, and otherwise the
+    last page within the result cap, which is only full when the results
+    reach the cap. A dense tile therefore
+    costs one or two search pages, never a full crawl. The probed pages are
+    requested again when the tile is crawled, which is free unless the
+    response cache is bypassed.
+
+    Each tile is checkpointed under its own key, so an interrupted crawl
+    resumes every tile from its last saved page and skips finished ones.
+    """
+
+    def __init__(self,
+                 scraper: YelpSupabaseScraper,
+                 result_cap: int = RESULT_CAP,
+                 results_per_page: int = 10,
+                 min_tile_degrees: float = 0.005):
+        """
+        Initialize the tiler
+
+        Args:
+            scraper: Scraper used to search and save each tile
+            result_cap: Number of results at which a search is assumed truncated
+            results_per_page: Number of results per search page
+            min_tile_degrees: Tiles narrower than twice this are never split
+        """
+        self.scraper = scraper
+        self.result_cap = result_cap
+        self.results_per_page = results_per_page
+        self.min_tile_degrees = min_tile_degrees
+
+    def can_split(self, tile: Tile) -> bool:
+        west, south, east, north = tile
+        return min(east - west, north - south) >= 2 * self.min_tile_degrees
+
+    def needs_split(self, location: str, query: str, bounds: str, stats: Dict, **search_params) -> bool:
+        """
+        Whether a tile holds more results than the cap, judged from at most two search pages
+        """
+        first = self.scraper.fetch_search_page(
+            location, query, 0, self.results_per_page, bounds=bounds, **search_params
+        )
+        stats["search_pages"] += 1
+
+        total = reported_total(first)
+        if total is not None:
+            return total > self.result_cap
+        if len(first.get("organic_results", [])) < self.results_per_page or not has_next_page(first):
+            return False
+
+        # No total reported: a full page at the cap means the results were
+        # truncated there (Yelp stops paginating at the cap)
+        last_page = math.ceil(self.result_cap / self.results_per_page) - 1
+        last = self.scraper.fetch_search_page(
+            location, query, last_page, self.results_per_page, bounds=bounds, **search_params
+        )
+        stats["search_pages"] += 1
+        return len(last.get("organic_results", [])) >= self.results_per_page
+
+    def crawl(self,
+              location: str,
+              bbox: Tile,
+              query: str = "Restaurants",
+              restart: bool = False,
+              **search_params) -> Tuple[List[Dict], Dict]:
+        """
+        Crawl every restaurant in a bounding box
+
+        Args:
+            location: City and state the tiles belong to
+            bbox: Bounding box to cover (west, south, east, north)
+            query: Search query
+            restart: Ignore tile checkpoints and crawl every tile from page 0
+            **search_params: Extra search_and_save options (price, category,
+                sort_by, fetch_details, max_reviews, ...)
+
+        Returns:
+            Tuple of (restaurants merged by place_id, crawl statistics)
+        """
+        merged = {}
+        stats = {"tiles": 0, "split_tiles": 0, "truncated_tiles": 0, "failed_tiles": 0, "skipped_tiles": 0,
+                 "search_pages": 0}
+        max_pages = math.ceil(self.result_cap / self.results_per_page)
+        tiles = deque([bbox])
+
+        while tiles:
+            tile = tiles.popleft()
+            bounds = format_bounds(tile)
+            checkpoint_key = f"{query} [tile={bounds}]"
+            stats["tiles"] += 1
+
+            # Only tiles that weren't split are ever checkpointed, so a tile
+            # with a checkpoint is resumed without probing it again
+            start_page = 0
+            if self.scraper.supabase and not restart:
+                start_page = resume_page(self.scraper.get_scrape_metadata(location, checkpoint_key))
+                if start_page is None:
+                    stats["skipped_tiles"] += 1
+                    continue
+
+            if start_page == 0 and self.can_split(tile):
+                try:
+                    if self.needs_split(location, query, bounds, stats, **search_params):
+                        print(f"Tile {bounds} holds more than {self.result_cap} results, splitting")
+                        tiles.extend(split_tile(tile))
+                        stats["split_tiles"] += 1
+                        continue
+                except Exception as e:
+                    print(f"Error probing tile {bounds}: {str(e)}")
+
+            restaurants, metadata = self.scraper.search_and_save(
+                location,
+                query,
+                start_page=start_page,
+                max_pages=max_pages - start_page,
+                results_per_page=self.results_per_page,
+                checkpoint_key=checkpoint_key,
+                bounds=bounds,
+                **search_params
+            )
+            stats["search_pages"] += (metadata.get("last_page") or start_page) - start_page + 1
+
+            for restaurant in restaurants:
+                merged.setdefault(restaurant["place_id"], restaurant)
+
+            if metadata.get("status") == "failed":
+                stats["failed_tiles"] += 1
+            elif start_page * self.results_per_page + len(restaurants) >= self.result_cap:
+                # The probe failed, or the tile filled up since it was probed
+                if self.can_split(tile):
+                    print(f"Tile {bounds} hit the {self.result_cap} result cap, splitting")
+                    tiles.extend(split_tile(tile))
+                    stats["split_tiles"] += 1
+                else:
+                    stats["truncated_tiles"] += 1
+
+        stats["restaurants"] = len(merged)
+        return list(merged.values()), stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl a metro area tile by tile to get past the search result cap")
+    parser.add_argument("--location", default="Seattle, WA", help="City and state")
+    parser.add_argument("--query", default="Restaurants", help="Search query")
+    parser.add_argument("--bbox", help="Bounding box as west,south,east,north")
+    parser.add_argument("--bbox-from", default="Data/yelp_master_original.csv",
+                        help="CSV of geocoded restaurants to derive the bounding box from")
+    parser.add_argument("--city", default="Seattle", help="City used when deriving the bounding box")
+    parser.add_argument("--min-tile-degrees", type=float, default=0.005)
+    parser.add_argument("--max-reviews", type=int, default=10)
+    parser.add_argument("--output", help="Write the merged restaurants to this JSON file")
+    parser.add_argument("--restart", action="store_true", help="Ignore tile checkpoints and crawl every tile again")
+    args = parser.parse_args()
+
+    if args.bbox:
+        bbox = tuple(float(value) for value in args.bbox.split(","))
+    else:
+        bbox = bounding_box_from_csv(args.bbox_from, city=args.city)
+    print(f"Crawling {args.location} within {format_bounds(bbox)}")
+
+    tiler = GeoTiler(YelpSupabaseScraper(cache_mode=production_cache_mode()), min_tile_degrees=args.min_tile_degrees)
+    restaurants, stats = tiler.crawl(args.location, bbox, args.query, restart=args.restart,
+                                     max_reviews=args.max_reviews)
+
+    print("\n===== Geo-tiled crawl completed =====")
+    print(json.dumps(stats, indent=2))
+
+    if args.output:
+        tiler.scraper.save_to_json(restaurants, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import fcntl
+from serpapi import GoogleSearch
+
+# Substrings of SerpAPI "error" messages that mean we are being throttled
+RATE_LIMIT_MARKERS = ("rate limit", "too many requests", "throttl", "429")
+
+
+def is_rate_limit_error(message: str) -> bool:
+    """
+    Check whether a SerpAPI error message indicates throttling
+
+    Args:
+        message: Value of the "error" field in a SerpAPI response
+
+    Returns:
+        True if the error is a rate-limit error
+    """
+    message = str(message).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+class TokenBucketRateLimiter:
+    """
+    Adaptive token-bucket rate limiter for SerpAPI requests.
+
+    Tokens refill at the configured requests-per-second rate up to the burst
+    size. When a rate-limit error is reported the effective rate is cut and
+    requests are paused with exponential backoff; successful requests slowly
+    restore the configured rate.
+
+    If a state file is given, the bucket lives in that file and is guarded
+    with an exclusive file lock, so every scraper process on the machine
+    shares one budget.
+    """
+
+    def __init__(self,
+                 requests_per_second: float = 1.0,
+                 burst: int = 5,
+                 state_file: Optional[str] = None,
+                 min_rate: float = 0.05,
+                 backoff_factor: float = 0.5,
+                 recovery_step: float = 0.05,
+                 max_backoff: float = 60.0):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Sustained request budget
+            burst: Maximum number of requests that can be made back to back
+            state_file: Path of the shared state file (None keeps state in memory)
+            min_rate: Lowest rate the limiter will back off to
+            backoff_factor: Multiplier applied to the rate on a rate-limit error
+            recovery_step: Fraction of the configured rate restored per success
+            max_backoff: Maximum pause in seconds after repeated rate-limit errors
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.state_file = state_file
+        self.min_rate = min(min_rate, requests_per_second)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.max_backoff = max_backoff
+
+        self._thread_lock = threading.Lock()
+        self._memory_state = self._initial_state()
+
+    @classmethod
+    def from_env(cls) -> "TokenBucketRateLimiter":
+        """
+        Build a limiter from environment variables
+
+        SERPAPI_REQUESTS_PER_SECOND, SERPAPI_BURST and SERPAPI_RATE_LIMIT_FILE
+        override the defaults. The state file defaults to a shared file in the
+        system temp directory.
+        """
+        state_file = os.getenv(
+            "SERPAPI_RATE_LIMIT_FILE",
+            os.path.join(tempfile.gettempdir(), "serpapi_rate_limit.json")
+        )
+        return cls(
+            requests_per_second=float(os.getenv("SERPAPI_REQUESTS_PER_SECOND", "1.0")),
+            burst=int(os.getenv("SERPAPI_BURST", "5")),
+            state_file=state_file
+        )
+
+    def _initial_state(self) -> Dict:
+        return {
+            "tokens": float(self.burst),
+            "updated_at": time.time(),
+            "rate": self.requests_per_second,
+            "blocked_until": 0.0,
+            "consecutive_limits": 0
+        }
+
+    @contextmanager
+    def _locked_state(self):
+        """
+        Yield the bucket state under an exclusive lock and persist changes
+        """
+        with self._thread_lock:
+            if not self.state_file:
+                yield self._memory_state
+                return
+
+            with open(self.state_file, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read())
+                    except ValueError:
+                        state = self._initial_state()
+
+                    yield state
+
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict, now: float):
+        elapsed = max(0.0, now - state["updated_at"])
+        state["tokens"] = min(float(self.burst), state["tokens"] + elapsed * state["rate"])
+        state["updated_at"] = now
+
+    def acquire(self):
+        """
+        Block until a request may be made, then consume one token
+        """
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                self._refill(state, now)
+
+                if state["blocked_until"] > now:
+                    wait = state["blocked_until"] - now
+                elif state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    return
+                else:
+                    wait = (1 - state["tokens"]) / state["rate"]
+
+            # Sleep outside the lock, then re-check the shared state
+            time.sleep(min(wait, 1.0))
+
+    def report_rate_limited(self):
+        """
+        Back off after SerpAPI reported a rate-limit error
+        """
+        with self._locked_state() as state:
+            now = time.time()
+            self._refill(state, now)
+
+            state["consecutive_limits"] += 1
+            state["rate"] = max(self.min_rate, state["rate"] * self.backoff_factor)
+            state["tokens"] = 0.0
+
+            pause = min(self.max_backoff, 2 ** state["consecutive_limits"])
+            state["blocked_until"] = max(state["blocked_until"], now + pause)
+
+        print(f"Rate limited by SerpAPI, backing off for {pause:.0f}s "
+              f"(rate now {state['rate']:.2f} req/s)")
+
+    def report_success(self):
+        """
+        Gradually restore the configured rate after a successful request
+        """
+        with self._locked_state() as state:
+            state["consecutive_limits"] = 0
+            if state["rate"] < self.requests_per_second:
+                state["rate"] = min(
+                    self.requests_per_second,
+                    state["rate"] + self.recovery_step * self.requests_per_second
+                )
+
+
+def rate_limited_search(params: Dict,
+                        rate_limiter: TokenBucketRateLimiter,
+                        max_retries: int = 3,
+                        backend: Optional[str] = None) -> Dict:
+    """
+    Run a SerpAPI search through the rate limiter, retrying on rate-limit errors
+
+    Args:
+        params: SerpAPI request parameters
+        rate_limiter: Limiter shared by all SerpAPI calls
+        max_retries: Number of retries after a rate-limit error
+        backend: Base URL to send requests to instead of https://serpapi.com
+
+    Returns:
+        The SerpAPI response dictionary (may still contain an "error" field)
+    """
+    for attempt in range(max_retries + 1):
+        rate_limiter.acquire()
+
+        # GoogleSearch mutates its params, so give it a copy
+        search = GoogleSearch(dict(params))
+        if backend:
+            search.BACKEND = backend
+        results = search.get_dict()
+
+        if "error" in results and is_rate_limit_error(results["error"]):
+            rate_limiter.report_rate_limited()
+            continue
+
+        rate_limiter.report_success()
+        return results
+
+    return results
@@ -0,0 +1,314 @@
+import math
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.api.response_cache import production_cache_mode
+from src.api.review_utils import parse_review_date
+from src.api.review_writer import BulkReviewWriter
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+
+# Reviews returned per yelp_reviews request (the engine's maximum page size)
+REVIEWS_PER_PAGE = 49
+
+# Staleness assumed for restaurants that have never been refreshed
+NEVER_REFRESHED_DAYS = 365.0
+
+
+class RefreshScheduler:
+    """
+    Plan a day's review and business detail refreshes within a SerpAPI
+    credit budget.
+
+    Known restaurants are ranked by staleness, review velocity and
+    popularity, so busy restaurants are refreshed often and dormant ones
+    rarely. Each SerpAPI request costs one credit.
+    """
+
+    def __init__(self,
+                 scraper: YelpSupabaseScraper,
+                 daily_budget: int = 500,
+                 details_interval_days: float = 30.0,
+                 max_review_pages: int = 5,
+                 min_expected_reviews: float = 0.5,
+                 velocity_weight: float = 1.0,
+                 popularity_weight: float = 0.25):
+        """
+        Initialize the scheduler
+
+        Args:
+            scraper: Supabase-backed scraper used to read state and run refreshes
+            daily_budget: Number of SerpAPI credits available for the day
+            details_interval_days: Refresh business details after this many days
+            max_review_pages: Maximum yelp_reviews requests per restaurant
+            min_expected_reviews: Skip review refreshes expected to find fewer new reviews
+            velocity_weight: Weight of review velocity (reviews/day) in the priority
+            popularity_weight: Weight of log review count in the priority
+        """
+        self.scraper = scraper
+        self.daily_budget = daily_budget
+        self.details_interval_days = details_interval_days
+        self.max_review_pages = max_review_pages
+        self.min_expected_reviews = min_expected_reviews
+        self.velocity_weight = velocity_weight
+        self.popularity_weight = popularity_weight
+
+    # ---- Loading state ----
+
+    def load_known_restaurants(self, location: Optional[str] = None, page_size: int = 1000) -> List[Dict]:
+        """
+        Load every known restaurant from Supabase
+
+        Args:
+            location: Only load restaurants scraped for this location
+            page_size: Number of rows fetched per request
+
+        Returns:
+            List of restaurant rows
+        """
+        self.scraper.check_supabase_connection()
+
+        restaurants = []
+        start = 0
+        while True:
+            request = self.scraper.supabase.table("restaurants") \
+                .select("id, place_id, name, location, reviews_count, updated_at")
+            if location:
+                request = request.eq("location", location)
+
+            response = request.range(start, start + page_size - 1).execute()
+            rows = response.data or []
+            restaurants.extend(rows)
+
+            if len(rows) < page_size:
+                return restaurants
+            start += page_size
+
+    def load_watermarks(self, place_ids: List[str], chunk_size: int = 200) -> Dict[str, Dict]:
+        """
+        Load review high-water marks in chunks (keeps request URLs short)
+        """
+        watermarks = {}
+        for i in range(0, len(place_ids), chunk_size):
+            watermarks.update(self.scraper.get_review_watermarks(place_ids[i:i + chunk_size]))
+        return watermarks
+
+    # ---- Planning ----
+
+    def score(self, restaurant: Dict, watermark: Optional[Dict], now: datetime) -> Dict:
+        """
+        Score one restaurant and work out which refreshes it needs
+
+        Returns:
+            Candidate dictionary with priority, planned tasks and credit cost
+        """
+        reviews_count = restaurant.get("reviews_count") or 0
+
+        last_refresh = parse_review_date((watermark or {}).get("last_synced_at")) \
+            or parse_review_date(restaurant.get("updated_at"))
+        if last_refresh:
+            staleness_days = max(0.0, (now - last_refresh).total_seconds() / 86400)
+        else:
+            staleness_days = NEVER_REFRESHED_DAYS
+
+        if watermark:
+            # Reviews seen in search results since the last review sync
+            pending = max(0, reviews_count - (watermark.get("last_reviews_count") or 0))
+            velocity = max(watermark.get("reviews_per_day") or 0.0, pending / max(staleness_days, 1.0))
+            expected_new = pending + (watermark.get("reviews_per_day") or 0.0) * staleness_days
+        else:
+            velocity = reviews_count / NEVER_REFRESHED_DAYS
+            expected_new = float(reviews_count)
+
+        popularity = math.log1p(reviews_count)
+        priority = staleness_days \
+            * (1 + self.velocity_weight * velocity) \
+            * (1 + self.popularity_weight * popularity)
+
+        tasks = {}
+        if expected_new >= self.min_expected_reviews:
+            pages = math.ceil(expected_new / REVIEWS_PER_PAGE)
+            tasks["reviews"] = min(self.max_review_pages, max(1, pages))
+        if staleness_days >= self.details_interval_days:
+            tasks["details"] = 1
+
+        return {
+            "restaurant": restaurant,
+            "watermark": watermark,
+            "priority": round(priority, 3),
+            "staleness_days": round(staleness_days, 2),
+            "velocity": round(velocity, 3),
+            "expected_new_reviews": round(expected_new, 1),
+            "tasks": tasks,
+            "cost": sum(tasks.values())
+        }
+
+    def plan(self,
+             location: Optional[str] = None,
+             restaurants: Optional[List[Dict]] = None,
+             watermarks: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Plan the day's refreshes
+
+        Args:
+            location: Only plan restaurants scraped for this location
+            restaurants: Restaurant rows (loaded from Supabase if omitted)
+            watermarks: Review sync state keyed by place_id (loaded if omitted)
+
+        Returns:
+            Dictionary with the planned items (highest priority first),
+            their total credit cost and the budget
+        """
+        if restaurants is None:
+            restaurants = self.load_known_restaurants(location)
+        if watermarks is None:
+            watermarks = self.load_watermarks([r["place_id"] for r in restaurants])
+
+        now = parse_review_date(datetime.now())
+        candidates = [
+            self.score(restaurant, watermarks.get(restaurant["place_id"]), now)
+            for restaurant in restaurants
+        ]
+        candidates.sort(key=lambda candidate: candidate["priority"], reverse=True)
+
+        # Greedily take the highest-priority refreshes that still fit the budget
+        items = []
+        total_cost = 0
+        for candidate in candidates:
+            if total_cost >= self.daily_budget:
+                break
+            if candidate["cost"] == 0:
+                continue
+
+            remaining = self.daily_budget - total_cost
+            if candidate["cost"] > remaining and "reviews" in candidate["tasks"]:
+                # Trim review pages so a high-priority restaurant still fits
+                trimmed = candidate["tasks"]["reviews"] - (candidate["cost"] - remaining)
+                if trimmed >= 1:
+                    candidate["tasks"]["reviews"] = trimmed
+                    candidate["cost"] = sum(candidate["tasks"].values())
+
+            if candidate["cost"] <= remaining:
+                items.append(candidate)
+                total_cost += candidate["cost"]
+
+        return {
+            "items": items,
+            "total_cost": total_cost,
+            "budget": self.daily_budget,
+            "candidates": len(candidates)
+        }
+
+    def print_plan(self, plan: Dict):
+        """
+        Print a plan and its expected credit cost
+        """
+        print(f"\n===== Refresh plan: {len(plan['items'])} of {plan['candidates']} restaurants =====")
+        print(f"Expected credit cost: {plan['total_cost']} of {plan['budget']}\n")
+        print(f"{'Priority':>10}  {'Stale (d)':>9}  {'Rev/day':>7}  {'Cost':>4}  Tasks              Restaurant")
+
+        for item in plan["items"]:
+            tasks = ", ".join(f"{kind} x{count}" for kind, count in item["tasks"].items())
+            name = item["restaurant"].get("name") or item["restaurant"]["place_id"]
+            print(f"{item['priority']:>10.1f}  {item['staleness_days']:>9.1f}  {item['velocity']:>7.2f}  "
+                  f"{item['cost']:>4}  {tasks:<18} {name}")
+
+    # ---- Execution ----
+
+    def execute(self, plan: Dict, default_location: str = "Seattle, WA") -> Dict:
+        """
+        Run the planned refreshes and save the results to Supabase
+
+        Args:
+            plan: Plan returned by plan()
+            default_location: Location used for details lookups when a row has none
+
+        Returns:
+            Dictionary with counts of refreshed restaurants, saved reviews and errors
+        """
+        stats = {"restaurants": 0, "reviews_saved": 0, "details_saved": 0, "errors": 0}
+        review_writer = BulkReviewWriter(self.scraper.supabase, sync_index=self.scraper.sync_index)
+        watermark_updates = []
+
+        for item in plan["items"]:
+            restaurant = item["restaurant"]
+            watermark = item["watermark"]
+            place_id = restaurant["place_id"]
+
+            if "reviews" in item["tasks"]:
+                try:
+                    reviews = self.scraper.get_reviews(
+                        place_id,
+                        max_reviews=item["tasks"]["reviews"] * REVIEWS_PER_PAGE,
+                        since=(watermark or {}).get("last_review_date")
+                    )
+
+                    for review in reviews:
+                        review_data = self.scraper.build_review_row(review, restaurant["id"], place_id)
+                        if review_data["user_id"]:
+                            review_writer.add(review_data)
+
+                    watermark_updates.append((restaurant["id"], self.scraper.build_watermark(restaurant, reviews, watermark)))
+                except Exception as e:
+                    print(f"Error refreshing reviews for {restaurant.get('name', place_id)}: {str(e)}")
+                    stats["errors"] += 1
+
+            if "details" in item["tasks"]:
+                try:
+                    details = self.scraper.get_business_details(
+                        place_id, restaurant.get("location") or default_location
+                    )
+                    if self.scraper.save_business_details(place_id, details):
+                        stats["details_saved"] += 1
+                except Exception as e:
+                    print(f"Error refreshing details for {restaurant.get('name', place_id)}: {str(e)}")
+                    stats["errors"] += 1
+
+            stats["restaurants"] += 1
+
+        review_writer.flush()
+        stats["reviews_saved"] = review_writer.stats["rows"]
+        stats["errors"] += len(review_writer.failed_restaurant_ids)
+
+        # Restaurants whose reviews didn't save keep their old high-water mark
+        self.scraper.update_review_watermarks([
+            watermark for restaurant_id, watermark in watermark_updates
+            if restaurant_id not in review_writer.failed_restaurant_ids
+        ])
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh known restaurants within a daily SerpAPI credit budget")
+    parser.add_argument("--budget", type=int, default=500, help="SerpAPI credits available")
+    parser.add_argument("--location", help="Only refresh restaurants scraped for this location")
+    parser.add_argument("--details-interval-days", type=float, default=30.0)
+    parser.add_argument("--max-review-pages", type=int, default=5)
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan and its cost without refreshing")
+    args = parser.parse_args()
+
+    scraper = YelpSupabaseScraper(cache_mode=production_cache_mode())
+    scheduler = RefreshScheduler(
+        scraper,
+        daily_budget=args.budget,
+        details_interval_days=args.details_interval_days,
+        max_review_pages=args.max_review_pages
+    )
+
+    plan = scheduler.plan(location=args.location)
+    scheduler.print_plan(plan)
+
+    if args.dry_run:
+        print("\nDry run: no requests were made.")
+        return
+
+    stats = scheduler.execute(plan, default_location=args.location or "Seattle, WA")
+    print(f"\n===== Refresh completed =====")
+    print(f"Restaurants refreshed: {stats['restaurants']}")
+    print(f"Reviews saved: {stats['reviews_saved']}")
+    print(f"Details saved: {stats['details_saved']}")
+    print(f"Errors: {stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
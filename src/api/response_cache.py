@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Request parameters that never affect the response content
+IGNORED_PARAMS = {"api_key", "serp_api_key", "source", "output"}
+
+# Time-to-live per SerpAPI engine, in seconds
+DEFAULT_TTLS = {
+    "yelp": 7 * 24 * 3600,
+    "yelp_reviews": 24 * 3600
+}
+
+CACHE_MODES = ("use", "refresh", "bypass")
+
+# Mode for scheduled crawls and refreshes: cached responses from earlier runs
+# would hide new reviews and stale review counts, so only the current run's are reused
+PRODUCTION_CACHE_MODE = "refresh"
+
+
+def production_cache_mode() -> str:
+    """
+    Cache mode for production entry points: SERPAPI_CACHE_MODE, or "refresh"
+    """
+    return os.getenv("SERPAPI_CACHE_MODE", PRODUCTION_CACHE_MODE)
+
+
+def normalize_params(params: Dict) -> Dict:
+    """
+    Normalize SerpAPI request parameters for cache keying
+
+    Drops credentials and client-only parameters and empty values, and
+    converts the remaining values to stripped strings.
+    """
+    return {
+        key: str(value).strip()
+        for key, value in params.items()
+        if key not in IGNORED_PARAMS and value is not None
+    }
+
+
+def make_cache_key(params: Dict) -> str:
+    """
+    Build a content-addressed cache key from SerpAPI request parameters
+
+    Args:
+        params: SerpAPI request parameters
+
+    Returns:
+        Hex SHA-256 digest of the normalized parameters
+    """
+    payload = json.dumps(normalize_params(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SerpAPIResponseCache:
+    """
+    Persistent on-disk cache of SerpAPI responses.
+
+    Responses are stored as JSON files named by their cache key. A small
+    SQLite index tracks size and last access time so the cache can be kept
+    under a size budget with least-recently-used eviction.
+    """
+
+    def __init__(self,
+                 cache_dir: str = ".serpapi_cache",
+                 max_bytes: int = 500 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 24 * 3600):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding cached responses
+            max_bytes: Maximum total size of cached responses
+            ttls: Time-to-live in seconds per engine (overrides DEFAULT_TTLS)
+            default_ttl: Time-to-live for engines without an explicit TTL
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index_path = os.path.join(self.cache_dir, "index.sqlite")
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    engine TEXT,
+                    created_at REAL,
+                    last_access REAL,
+                    size INTEGER
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+
+    @classmethod
+    def from_env(cls) -> "SerpAPIResponseCache":
+        """
+        Build a cache from environment variables
+
+        SERPAPI_CACHE_DIR and SERPAPI_CACHE_MAX_MB override the defaults.
+        """
+        return cls(
+            cache_dir=os.getenv("SERPAPI_CACHE_DIR", ".serpapi_cache"),
+            max_bytes=int(float(os.getenv("SERPAPI_CACHE_MAX_MB", "500")) * 1024 * 1024)
+        )
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the cache safe to use
+        # from worker threads and from several processes at once
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _ttl(self, engine: str) -> int:
+        return self.ttls.get(engine, self.default_ttl)
+
+    def get(self, params: Dict, created_after: Optional[float] = None) -> Optional[Dict]:
+        """
+        Look up a cached response
+
+        Args:
+            params: SerpAPI request parameters
+            created_after: Only return a response cached at or after this time
+
+        Returns:
+            The cached response, or None if missing, expired or too old
+        """
+        key = make_cache_key(params)
+        now = time.time()
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT engine, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if not row:
+                return None
+
+            engine, created_at = row
+            if now - created_at > self._ttl(engine):
+                self._delete(conn, key)
+                return None
+            if created_after is not None and created_at < created_after:
+                return None
+
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    response = json.load(f)
+            except (OSError, ValueError):
+                self._delete(conn, key)
+                return None
+
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+
+        return response
+
+    def set(self, params: Dict, response: Dict):
+        """
+        Store a response and evict old entries if over the size budget
+
+        Args:
+            params: SerpAPI request parameters
+            response: SerpAPI response dictionary
+        """
+        key = make_cache_key(params)
+        path = self._path(key)
+        now = time.time()
+
+        payload = json.dumps(response, ensure_ascii=False).encode("utf-8")
+
+        # Write to a temporary file first so readers never see partial files
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, engine, created_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, params.get("engine", ""), now, now, len(payload))
+            )
+            self._evict(conn)
+
+    def _delete(self, conn: sqlite3.Connection, key: str):
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._delete(conn, key)
+            total -= size
+
+    def clear(self):
+        """
+        Remove every cached response
+        """
+        with self._connect() as conn:
+            for (key,) in conn.execute("SELECT key FROM entries").fetchall():
+                self._delete(conn, key)
+
+    def stats(self) -> Dict:
+        """
+        Return the number of entries and total size of the cache
+        """
+        with self._connect() as conn:
+            count, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": count, "bytes": size, "max_bytes": self.max_bytes}
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional, Union
+
+
+def normalize_review(review: Dict) -> Dict:
+    """
+    Convert a raw yelp_reviews result into the review shape used by the scrapers
+
+    Args:
+        review: Review as returned by the SerpAPI yelp_reviews engine
+
+    Returns:
+        Normalized review dictionary
+    """
+    # Extract user information
+    user = review.get("user", {})
+    user_data = {
+        "name": user.get("name", ""),
+        "user_id": user.get("user_id", ""),
+        "link": user.get("link", ""),
+        "thumbnail": user.get("thumbnail", ""),
+        "address": user.get("address", ""),
+        "friends": user.get("friends", 0),
+        "photos": user.get("photos", 0),
+        "reviews": user.get("reviews", 0),
+        "elite_year": user.get("elite_year", 0)
+    }
+
+    # Extract comment information
+    comment = review.get("comment", {})
+    comment_data = {
+        "text": comment.get("text", ""),
+        "language": comment.get("language", "")
+    }
+
+    # Extract feedback information
+    feedback = review.get("feedback", {})
+    feedback_data = {
+        "useful": feedback.get("useful", 0),
+        "funny": feedback.get("funny", 0),
+        "cool": feedback.get("cool", 0)
+    }
+
+    # Extract photos if available
+    photos = []
+    for photo in review.get("photos", []):
+        photos.append({
+            "link": photo.get("link", ""),
+            "caption": photo.get("caption", "")
+        })
+
+    return {
+        "position": review.get("position", 0),
+        "rating": review.get("rating", 0),
+        "date": review.get("date", ""),
+        "user": user_data,
+        "comment": comment_data,
+        "feedback": feedback_data,
+        "photos": photos,
+        "tags": review.get("tags", [])
+    }
+
+
+def parse_review_date(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """
+    Parse a review date into a timezone-aware datetime
+
+    Accepts ISO 8601 strings (e.g. "2025-04-08T14:20:19Z"), US-style dates
+    (e.g. "4/8/2025") and datetimes. Naive values are treated as UTC.
+
+    Returns:
+        The parsed datetime, or None if the value can't be parsed
+    """
+    if not value:
+        return None
+
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value).strip()
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            try:
+                parsed = datetime.strptime(text, "%m/%d/%Y")
+            except ValueError:
+                return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
@@ -0,0 +1,162 @@
+import time
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.data_processing.sync_index import SyncIndex
+
+# Reviews are upserted on this column by the scraper and the JSON loader alike,
+# so a review written by one is updated, not duplicated, by the other
+REVIEW_CONFLICT_KEY = "review_key"
+
+
+def review_key(place_id: str, review: Dict[str, Any]) -> str:
+    """
+    Deterministic key for a scraped review
+    
+    A reviewer leaves one review per restaurant, so the key is derived from
+    the place_id and user_id. Reviews without a user_id fall back to their
+    date and text.
+    
+    Args:
+        place_id: Restaurant place_id
+        review: Scraped review
+        
+    Returns:
+        Hex digest identifying the review
+    """
+    user_id = (review.get("user") or {}).get("user_id")
+    if user_id:
+        parts = [place_id, user_id]
+    else:
+        parts = [place_id, "", str(review.get("date", "")), (review.get("comment") or {}).get("text", "")]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class BulkReviewWriter:
+    """
+    Buffer review rows and write them with chunked multi-row upserts.
+
+    Rows are keyed on review_key, so a review seen again updates the
+    stored one instead of being duplicated. The buffer is
+    flushed automatically once it holds chunk_size rows; call flush() to
+    write the rest. Every flush records its latency and row counts. With a
+    sync index, reviews unchanged since they were last written are skipped.
+    """
+
+    def __init__(self, supabase, chunk_size: int = 500, verbose: bool = True,
+                 sync_index: Optional[SyncIndex] = None):
+        """
+        Initialize the writer
+
+        Args:
+            supabase: Supabase client
+            chunk_size: Maximum number of rows per upsert request
+            verbose: Print a line per flush
+            sync_index: Index of synced row hashes
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        self.supabase = supabase
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+        self.sync_index = sync_index
+
+        self._buffer = {}
+        self.flushes = []
+        # Restaurants with at least one review that failed to save
+        self.failed_restaurant_ids = set()
+        self.stats = {"flushes": 0, "requests": 0, "rows": 0, "unchanged_rows": 0, "failed_rows": 0,
+                      "seconds": 0.0}
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, review_data: Dict) -> Dict:
+        """
+        Queue a review row, flushing if the buffer is full
+
+        Args:
+            review_data: Row for the reviews table (see build_review_row)
+
+        Returns:
+            Stats of the flush this triggered, or an empty dict
+        """
+        # A review listed twice in one upsert would be rejected by Postgres
+        self._buffer[review_data[REVIEW_CONFLICT_KEY]] = review_data
+
+        if len(self._buffer) >= self.chunk_size:
+            return self.flush()
+        return {}
+
+    def add_many(self, rows: List[Dict]) -> Dict:
+        """
+        Queue several review rows
+        """
+        for row in rows:
+            self.add(row)
+        return self.stats
+
+    def flush(self) -> Dict:
+        """
+        Upsert every buffered review
+
+        Returns:
+            Stats for this flush: rows written, rows failed, requests made,
+            latency in seconds and the restaurant ids whose rows failed
+        """
+        rows = list(self._buffer.values())
+        self._buffer = {}
+
+        result = {"rows": 0, "unchanged_rows": 0, "failed_rows": 0, "requests": 0, "seconds": 0.0,
+                  "failed_restaurant_ids": set()}
+        if self.sync_index and rows:
+            rows, unchanged = self.sync_index.diff("reviews", rows, [REVIEW_CONFLICT_KEY])
+            result["unchanged_rows"] = len(unchanged)
+            self.stats["unchanged_rows"] += len(unchanged)
+        if not rows:
+            return result
+
+        now = datetime.now().isoformat()
+        start = time.perf_counter()
+
+        for i in range(0, len(rows), self.chunk_size):
+            chunk = rows[i:i + self.chunk_size]
+            for row in chunk:
+                row["updated_at"] = now
+
+            result["requests"] += 1
+            try:
+                self.supabase.table("reviews") \
+                    .upsert(chunk, on_conflict=REVIEW_CONFLICT_KEY, default_to_null=False, returning="minimal") \
+                    .execute()
+                result["rows"] += len(chunk)
+                if self.sync_index:
+                    self.sync_index.mark("reviews", chunk, [REVIEW_CONFLICT_KEY])
+            except Exception as e:
+                print(f"Error saving {len(chunk)} reviews: {str(e)}")
+                result["failed_rows"] += len(chunk)
+                result["failed_restaurant_ids"].update(row["restaurant_id"] for row in chunk)
+                self.failed_restaurant_ids.update(row["restaurant_id"] for row in chunk)
+
+        result["seconds"] = time.perf_counter() - start
+
+        self.flushes.append(result)
+        self.stats["flushes"] += 1
+        for key in ("requests", "rows", "failed_rows", "seconds"):
+            self.stats[key] += result[key]
+
+        if self.verbose:
+            print(f"Saved {result['rows']} reviews in {result['requests']} requests "
+                  f"({result['seconds'] * 1000:.0f} ms)"
+                  + (f", {result['unchanged_rows']} unchanged" if result["unchanged_rows"] else "")
+                  + (f", {result['failed_rows']} failed" if result["failed_rows"] else ""))
+
+        return result
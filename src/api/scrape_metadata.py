@@ -0,0 +1,137 @@
+import time
+import atexit
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, Optional
+
+# scrape_metadata rows are unique per location and query
+METADATA_CONFLICT_KEY = "location,query"
+
+# Statuses written immediately; others may be coalesced
+FINAL_STATUSES = ("completed", "failed")
+
+# Trackers with unwritten checkpoints, flushed when the interpreter exits
+_open_trackers = weakref.WeakSet()
+
+
+def _flush_open_trackers():
+    for tracker in list(_open_trackers):
+        tracker.flush()
+
+
+atexit.register(_flush_open_trackers)
+
+
+class ScrapeMetadataTracker:
+    """
+    Track one scraping run's progress in scrape_metadata with few writes.
+
+    The row id is cached after the first write, so every later state
+    transition is a single update. Intermediate transitions (such as
+    processing_page followed by processing) arriving within min_interval of
+    the last write are coalesced: only the newest state is kept and written
+    with the next write. Final states are written immediately, and any
+    pending state is flushed when the process exits.
+    """
+
+    def __init__(self, supabase, location: str, query: str, min_interval: float = 5.0):
+        """
+        Initialize the tracker
+
+        Args:
+            supabase: Supabase client (None keeps the metadata local only)
+            location: Location being scraped
+            query: Search query (or checkpoint key) the row is stored under
+            min_interval: Minimum seconds between writes of intermediate states
+        """
+        self.supabase = supabase
+        self.location = location
+        self.query = query
+        self.min_interval = min_interval
+
+        self.row_id = None
+        self.writes = 0
+        self._pending = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def update(self,
+               page: int = 0,
+               status: str = "completed",
+               total_count: int = 0,
+               error: str = None) -> Dict:
+        """
+        Record a state transition
+
+        Args:
+            page: Current page number
+            status: Status of the scraping process
+            total_count: Total number of restaurants scraped
+            error: Error message if any
+
+        Returns:
+            The metadata for the new state (including the row id once known)
+        """
+        metadata = {
+            "location": self.location,
+            "query": self.query,
+            "last_page": page,
+            "last_updated": datetime.now().isoformat(),
+            "status": status,
+            "total_count": total_count
+        }
+
+        if error:
+            metadata["error"] = error
+
+        if not self.supabase:
+            return metadata
+
+        with self._lock:
+            self._pending = metadata
+            due = time.monotonic() - self._last_write >= self.min_interval
+
+        if status in FINAL_STATUSES or due:
+            self.flush()
+        else:
+            _open_trackers.add(self)
+
+        if self.row_id is not None:
+            metadata = {"id": self.row_id, **metadata}
+        return metadata
+
+    def flush(self) -> bool:
+        """
+        Write the pending state, if any
+
+        Returns:
+            True if nothing was pending or the write succeeded
+        """
+        with self._lock:
+            metadata = self._pending
+            if metadata is None:
+                return True
+
+            try:
+                if self.row_id is None:
+                    result = self.supabase.table("scrape_metadata") \
+                        .upsert(metadata, on_conflict=METADATA_CONFLICT_KEY) \
+                        .execute()
+                    if result.data:
+                        self.row_id = result.data[0]["id"]
+                else:
+                    self.supabase.table("scrape_metadata") \
+                        .update(metadata) \
+                        .eq("id", self.row_id) \
+                        .execute()
+            except Exception as e:
+                print(f"Error updating scrape metadata: {str(e)}")
+                return False
+
+            self._pending = None
+            self._last_write = time.monotonic()
+            self.writes += 1
+
+        _open_trackers.discard(self)
+        return True
@@ -0,0 +1,158 @@
+import os
+import time
+from dotenv import load_dotenv
+from typing import Dict, Iterator, Optional, Union
+from datetime import datetime
+
+from src.api.rate_limiter import TokenBucketRateLimiter, rate_limited_search
+from src.api.response_cache import CACHE_MODES, SerpAPIResponseCache
+from src.api.review_utils import normalize_review, parse_review_date
+
+
+class SerpAPIClient:
+    """
+    SerpAPI access shared by the Yelp scrapers.
+
+    Every request goes through the on-disk response cache and the shared
+    token-bucket rate limiter, so the cache modes mean the same thing for
+    every scraper built on this class:
+
+    - "use" serves any cached response that hasn't expired
+    - "refresh" fetches and overwrites responses cached before this client
+      was created, but reuses those fetched since (a page requested twice
+      in one run is only paid for once)
+    - "bypass" never reads or writes the cache
+    """
+
+    def __init__(self,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 cache: Optional[SerpAPIResponseCache] = None,
+                 cache_mode: Optional[str] = None):
+        """
+        Initialize the client from environment variables
+
+        Args:
+            rate_limiter: Limiter shared by all SerpAPI calls (defaults to one
+                configured from environment variables)
+            cache: On-disk response cache (defaults to one configured from
+                environment variables)
+            cache_mode: "use", "refresh" or "bypass" (defaults to
+                SERPAPI_CACHE_MODE or "use")
+        """
+        # Load environment variables from .env file
+        load_dotenv()
+
+        self.api_key = os.getenv("SERPAPI_API_KEY")
+        if not self.api_key:
+            raise ValueError("SERPAPI_API_KEY not found in environment variables")
+
+        # Every SerpAPI request goes through this limiter
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter.from_env()
+
+        # Alternative SerpAPI-compatible server, e.g. the local stand-in used for benchmarks
+        self.backend = os.getenv("SERPAPI_BACKEND")
+
+        # Responses are cached on disk so reruns don't pay for the same requests
+        self.cache_mode = cache_mode or os.getenv("SERPAPI_CACHE_MODE", "use")
+        if self.cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}")
+        self.cache = None
+        if self.cache_mode != "bypass":
+            self.cache = cache or SerpAPIResponseCache.from_env()
+        # In refresh mode only responses cached since this point are reused
+        self.cache_started_at = time.time()
+
+    def _search(self, params: Dict) -> Dict:
+        """
+        Run a SerpAPI search through the response cache and shared rate limiter
+
+        Args:
+            params: SerpAPI request parameters
+        """
+        if self.cache:
+            # Refresh mode still reuses a page fetched earlier in the same run,
+            # like the geo tiler's probe of a tile's first page
+            created_after = self.cache_started_at if self.cache_mode == "refresh" else None
+            cached = self.cache.get(params, created_after=created_after)
+            if cached is not None:
+                return cached
+
+        results = rate_limited_search(params, self.rate_limiter, backend=self.backend)
+
+        # Never cache errors, so a failed request is retried next time
+        if self.cache and "error" not in results:
+            self.cache.set(params, results)
+
+        return results
+
+    def iter_reviews(self,
+                     place_id: str,
+                     max_reviews: Optional[int] = None,
+                     since: Union[str, datetime, None] = None,
+                     page_size: int = 49,
+                     sort_by: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream reviews for a restaurant, following the yelp_reviews engine's
+        start offsets lazily so only the pages that are consumed get fetched
+
+        Args:
+            place_id: Yelp place ID
+            max_reviews: Stop after this many reviews (None for all)
+            since: Stop at the first review older than this date; reviews are
+                requested newest first unless sort_by is given
+            page_size: Number of reviews to request per page (max 49)
+            sort_by: Review sort order (e.g. "date_desc", "relevance_desc")
+
+        Yields:
+            Normalized review dictionaries
+        """
+        cutoff = parse_review_date(since)
+        if cutoff and not sort_by:
+            sort_by = "date_desc"
+
+        start = 0
+        yielded = 0
+
+        while True:
+            num = page_size
+            if max_reviews is not None:
+                num = min(page_size, max_reviews - yielded)
+                if num <= 0:
+                    return
+
+            params = {
+                "engine": "yelp_reviews",
+                "place_id": place_id,
+                "start": start,
+                "num": num,
+                "api_key": self.api_key
+            }
+            if sort_by:
+                params["sortby"] = sort_by
+
+            results = self._search(params)
+
+            if "error" in results:
+                raise Exception(f"API Error: {results['error']}")
+
+            raw_reviews = results.get("reviews", [])
+
+            for review in raw_reviews:
+                review_data = normalize_review(review)
+
+                review_date = parse_review_date(review_data["date"])
+                if cutoff and review_date and review_date < cutoff:
+                    return
+
+                yield review_data
+                yielded += 1
+
+                if max_reviews is not None and yielded >= max_reviews:
+                    return
+
+            # Stop when the engine has no further pages
+            has_next = "next" in results.get("serpapi_pagination", {})
+            if not raw_reviews or len(raw_reviews) < num or not has_next:
+                return
+
+            start += len(raw_reviews)
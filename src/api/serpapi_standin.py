@@ -0,0 +1,319 @@
+import os
+import ast
+import csv
+import copy
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+from src.api.response_cache import SerpAPIResponseCache
+
+DEFAULT_SAMPLE_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data", "yelp_data_20250506_080923.csv"
+)
+
+# Columns of the sample CSV that hold Python-literal lists/dicts
+LITERAL_COLUMNS = ("categories", "service_options", "highlights", "reviews_data", "details")
+
+
+def load_sample_restaurants(csv_path: str = DEFAULT_SAMPLE_CSV) -> List[Dict]:
+    """
+    Load scraped restaurants from a CSV written by save_to_csv
+
+    Args:
+        csv_path: Path to the CSV file
+
+    Returns:
+        List of restaurant dictionaries with nested fields decoded
+    """
+    restaurants = []
+    with open(csv_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for column in LITERAL_COLUMNS:
+                try:
+                    row[column] = ast.literal_eval(row.get(column) or "None")
+                except (ValueError, SyntaxError):
+                    row[column] = None
+            row["rating"] = float(row.get("rating") or 0)
+            row["reviews"] = int(row.get("reviews") or 0)
+            restaurants.append(row)
+    return restaurants
+
+
+class SerpAPIStandIn:
+    """
+    Local stand-in for the SerpAPI yelp and yelp_reviews engines.
+
+    Responses are replayed from a response cache directory when one is given,
+    and otherwise synthesized from the shapes of a previous scrape. Latency,
+    error rates and pagination are configurable so the scraper can be
+    benchmarked without spending credits.
+    """
+
+    def __init__(self,
+                 sample_csv: str = DEFAULT_SAMPLE_CSV,
+                 replay_dir: Optional[str] = None,
+                 total_results: int = 240,
+                 page_size: int = 10,
+                 reviews_per_place: int = 50,
+                 latency_ms: float = 0,
+                 jitter_ms: float = 0,
+                 error_rate: float = 0,
+                 rate_limit_rate: float = 0,
+                 seed: Optional[int] = None):
+        """
+        Initialize the stand-in
+
+        Args:
+            sample_csv: CSV of scraped restaurants used as templates
+            replay_dir: Response cache directory to replay recorded responses from
+            total_results: Number of restaurants a search returns across all pages
+            page_size: Number of restaurants per search page when a request gives no num
+            reviews_per_place: Number of reviews available for every restaurant
+            latency_ms: Mean added latency per request
+            jitter_ms: Maximum random deviation from the mean latency
+            error_rate: Fraction of requests answered with a generic error
+            rate_limit_rate: Fraction of requests answered with a rate-limit error
+            seed: Random seed for reproducible latency and errors
+        """
+        self.templates = load_sample_restaurants(sample_csv)
+        if not self.templates:
+            raise ValueError(f"No restaurants found in {sample_csv}")
+
+        self.replay = None
+        if replay_dir:
+            # Recorded responses never expire during replay
+            forever = 100 * 365 * 24 * 3600
+            self.replay = SerpAPIResponseCache(cache_dir=replay_dir, default_ttl=forever,
+                                               ttls={"yelp": forever, "yelp_reviews": forever})
+
+        self.total_results = total_results
+        self.page_size = page_size
+        self.reviews_per_place = reviews_per_place
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "replayed": 0, "errors": 0, "yelp": 0, "yelp_reviews": 0}
+
+    # ---- Synthesized responses ----
+
+    def _restaurant(self, index: int) -> Dict:
+        template = self.templates[index % len(self.templates)]
+        suffix = index // len(self.templates)
+        place_id = template["place_id"] if suffix == 0 else f"{template['place_id']}-{suffix}"
+        name = template["name"] if suffix == 0 else f"{template['name']} #{suffix + 1}"
+        return {"template": template, "place_id": place_id, "name": name}
+
+    def _organic_result(self, index: int) -> Dict:
+        restaurant = self._restaurant(index)
+        template = restaurant["template"]
+        return {
+            "position": index + 1,
+            "title": restaurant["name"],
+            "link": template["url"],
+            "place_id": restaurant["place_id"],
+            "place_ids": [restaurant["place_id"]],
+            "rating": template["rating"],
+            "reviews": template["reviews"],
+            "price": template["price"],
+            "categories": [{"title": title} for title in template["categories"] or []],
+            "neighborhoods": template["neighborhood"],
+            "phone": template["phone"],
+            "service_options": template["service_options"] or {},
+            "highlights": template["highlights"] or []
+        }
+
+    def _find_place(self, place_id: str) -> Optional[int]:
+        for position, template in enumerate(self.templates):
+            if template["place_id"] == place_id:
+                return position
+
+        # Synthesized copies are named "<template place_id>-<copy number>"
+        base, _, suffix = place_id.rpartition("-")
+        if suffix.isdigit():
+            for position, template in enumerate(self.templates):
+                if template["place_id"] == base:
+                    return position + int(suffix) * len(self.templates)
+        return None
+
+    def search(self, params: Dict) -> Dict:
+        if params.get("place_id"):
+            index = self._find_place(params["place_id"])
+            if index is None:
+                return {"error": "Yelp hasn't returned any results for this query."}
+            business = self._organic_result(index)
+            details = self._restaurant(index)["template"]["details"] or {}
+            business.update({key: value for key, value in details.items() if key != "categories"})
+            return {"search_parameters": params, "organic_results": [business]}
+
+        start = int(params.get("start", 0))
+        num = int(params.get("num", self.page_size))
+        end = min(start + num, self.total_results)
+        results = [self._organic_result(index) for index in range(start, end)]
+
+        response = {"search_parameters": params, "organic_results": results}
+        if end < self.total_results:
+            response["serpapi_pagination"] = {"next": f"/search?start={end}"}
+        return response
+
+    def reviews(self, params: Dict) -> Dict:
+        index = self._find_place(params.get("place_id", ""))
+        if index is None:
+            return {"error": "Yelp hasn't returned any results for this query."}
+
+        template_reviews = self._restaurant(index)["template"]["reviews_data"] or []
+        if not template_reviews:
+            return {"search_parameters": params, "reviews": []}
+
+        start = int(params.get("start", 0))
+        num = int(params.get("num", 10))
+        end = min(start + num, self.reviews_per_place)
+
+        reviews = []
+        for position in range(start, end):
+            review = copy.deepcopy(template_reviews[position % len(template_reviews)])
+            review["position"] = position + 1
+            review.setdefault("user", {})["user_id"] = f"{review['user'].get('user_id', 'user')}-{position}"
+            reviews.append(review)
+
+        response = {"search_parameters": params, "reviews": reviews}
+        if end < self.reviews_per_place:
+            response["serpapi_pagination"] = {"next": f"/search?start={end}"}
+        return response
+
+    # ---- Request handling ----
+
+    def respond(self, params: Dict) -> Dict:
+        """
+        Build the response for one request, applying latency and error injection
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            engine = params.get("engine", "")
+            if engine in self.stats:
+                self.stats[engine] += 1
+            roll = self._random.random()
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if roll < self.rate_limit_rate:
+            error = "Too many requests. Please slow down."
+        elif roll < self.rate_limit_rate + self.error_rate:
+            error = "Internal server error (stand-in)."
+        else:
+            error = None
+
+        if error:
+            with self._lock:
+                self.stats["errors"] += 1
+            return {"error": error}
+
+        if self.replay:
+            recorded = self.replay.get(params)
+            if recorded is not None:
+                with self._lock:
+                    self.stats["replayed"] += 1
+                return recorded
+
+        if engine == "yelp":
+            return self.search(params)
+        if engine == "yelp_reviews":
+            return self.reviews(params)
+        return {"error": f"Unsupported engine: {engine}"}
+
+    def make_server(self, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+        """
+        Create an HTTP server answering SerpAPI-style /search requests
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path not in ("/search", "/search.json"):
+                    self.send_error(404)
+                    return
+
+                body = json.dumps(standin.respond(dict(parse_qsl(url.query)))).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return ThreadingHTTPServer((host, port), Handler)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Serve in a background thread
+
+        Returns:
+            Tuple of (server, base URL to use as the SerpAPI backend)
+        """
+        server = self.make_server(host, port)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local SerpAPI stand-in for the yelp engines")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sample-csv", default=DEFAULT_SAMPLE_CSV)
+    parser.add_argument("--replay-dir", help="Response cache directory to replay recorded responses from")
+    parser.add_argument("--total-results", type=int, default=240)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--reviews-per-place", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    standin = SerpAPIStandIn(
+        sample_csv=args.sample_csv,
+        replay_dir=args.replay_dir,
+        total_results=args.total_results,
+        page_size=args.page_size,
+        reviews_per_place=args.reviews_per_place,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed
+    )
+    server = standin.make_server(args.host, args.port)
+    print(f"SerpAPI stand-in listening on http://{args.host}:{server.server_address[1]}")
+    print(f"Point the scraper at it with SERPAPI_BACKEND=http://{args.host}:{server.server_address[1]}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {json.dumps(standin.stats)}")
+
+
+if __name__ == "__main__":
+    main()
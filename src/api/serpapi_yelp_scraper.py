@@ -1,23 +1,30 @@
-import os
 import json
-from serpapi import GoogleSearch
-from dotenv import load_dotenv
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 
-class YelpSerpAPIScraper:
-    def __init__(self):
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.response_cache import SerpAPIResponseCache
+from src.api.serpapi_client import SerpAPIClient
+
+class YelpSerpAPIScraper(SerpAPIClient):
+    def __init__(self,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 cache: Optional[SerpAPIResponseCache] = None,
+                 cache_mode: Optional[str] = None):
         """
         Initialize the Yelp scraper with SerpAPI
-        """
-        # Load environment variables from .env file
-        load_dotenv()
-        
-        self.api_key = os.getenv("SERPAPI_API_KEY")
-        if not self.api_key:
-            raise ValueError("SERPAPI_API_KEY not found in environment variables")
         
+        Args:
+            rate_limiter: Limiter shared by all SerpAPI calls (defaults to one
+                configured from environment variables)
+            cache: On-disk response cache (defaults to one configured from
+                environment variables)
+            cache_mode: "use", "refresh" or "bypass" (see SerpAPIClient;
+                defaults to SERPAPI_CACHE_MODE or "use")
+        """
+        super().__init__(rate_limiter, cache, cache_mode)
+
     def search_restaurants(self, 
                          location: str, 
                          query: str = "Restaurants",
@@ -50,8 +57,7 @@ class YelpSerpAPIScraper:
         if category and category != "all":
             params["cflt"] = category
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = self._search(params)
         
         if "error" in results:
             raise Exception(f"API Error: {results['error']}")
@@ -75,94 +81,23 @@ class YelpSerpAPIScraper:
             
         return restaurants
     
-    def get_reviews(self, place_id: str, max_reviews: int = 10) -> List[Dict]:
+    def get_reviews(self,
+                    place_id: str,
+                    max_reviews: int = 10,
+                    since: Union[str, datetime, None] = None) -> List[Dict]:
         """
         Get reviews for a specific restaurant using the yelp_reviews engine
         
         Args:
             place_id: Yelp place ID
             max_reviews: Maximum number of reviews to fetch
+            since: Only fetch reviews newer than this date
         """
         print(f"\nFetching reviews for place_id: {place_id}")
         
-        params = {
-            "engine": "yelp_reviews",
-            "place_id": place_id,
-            "api_key": self.api_key
-        }
-        
-        print("API Request Parameters:", json.dumps(params, indent=2))
-        
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        if "error" in results:
-            print(f"API Error: {results['error']}")
-            raise Exception(f"API Error: {results['error']}")
-            
-        print("\nAPI Response Structure:")
-        print(json.dumps({k: type(v).__name__ for k, v in results.items()}, indent=2))
-        
-        reviews = []
-        raw_reviews = results.get("reviews", [])
-        print(f"\nNumber of reviews found: {len(raw_reviews)}")
+        reviews = list(self.iter_reviews(place_id, max_reviews=max_reviews, since=since))
         
-        for i, review in enumerate(raw_reviews[:max_reviews], 1):
-            print(f"\nProcessing review {i}:")
-            print(f"Review data: {json.dumps(review, indent=2)}")
-            
-            # Extract user information
-            user = review.get("user", {})
-            user_data = {
-                "name": user.get("name", ""),
-                "user_id": user.get("user_id", ""),
-                "link": user.get("link", ""),
-                "thumbnail": user.get("thumbnail", ""),
-                "address": user.get("address", ""),
-                "friends": user.get("friends", 0),
-                "photos": user.get("photos", 0),
-                "reviews": user.get("reviews", 0),
-                "elite_year": user.get("elite_year", 0)
-            }
-            
-            # Extract comment information
-            comment = review.get("comment", {})
-            comment_data = {
-                "text": comment.get("text", ""),
-                "language": comment.get("language", "")
-            }
-            
-            # Extract feedback information
-            feedback = review.get("feedback", {})
-            feedback_data = {
-                "useful": feedback.get("useful", 0),
-                "funny": feedback.get("funny", 0),
-                "cool": feedback.get("cool", 0)
-            }
-            
-            # Extract photos if available
-            photos = []
-            for photo in review.get("photos", []):
-                photos.append({
-                    "link": photo.get("link", ""),
-                    "caption": photo.get("caption", "")
-                })
-            
-            review_data = {
-                "position": review.get("position", 0),
-                "rating": review.get("rating", 0),
-                "date": review.get("date", ""),
-                "user": user_data,
-                "comment": comment_data,
-                "feedback": feedback_data,
-                "photos": photos,
-                "tags": review.get("tags", [])
-            }
-            
-            print(f"Extracted review data: {json.dumps(review_data, indent=2)}")
-            reviews.append(review_data)
-            
-        print(f"\nTotal reviews processed: {len(reviews)}")
+        print(f"Total reviews processed: {len(reviews)}")
         return reviews
     
     def get_business_details(self, place_id: str, location: str) -> Dict:
@@ -180,8 +115,7 @@ class YelpSerpAPIScraper:
             "api_key": self.api_key
         }
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = self._search(params)
         
         if "error" in results:
             raise Exception(f"API Error: {results['error']}")
@@ -1,26 +1,39 @@
 import os
 import json
-from serpapi import GoogleSearch
 from dotenv import load_dotenv
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from supabase import create_client
-import time
 
-class YelpSerpAPIScraper:
-    def __init__(self):
+from src.api.concurrent_fetcher import ConcurrentFetcher, PagePrefetcher
+from src.api.crawl_frontier import CrawlFrontier
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.response_cache import SerpAPIResponseCache, production_cache_mode
+from src.api.review_utils import parse_review_date
+from src.api.review_writer import REVIEW_CONFLICT_KEY, BulkReviewWriter, review_key
+from src.api.scrape_metadata import ScrapeMetadataTracker
+from src.api.serpapi_client import SerpAPIClient
+from src.api.write_journal import WriteBehindJournal
+from src.data_processing.sync_index import SyncIndex
+
+class YelpSerpAPIScraper(SerpAPIClient):
+    def __init__(self,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 cache: Optional[SerpAPIResponseCache] = None,
+                 cache_mode: Optional[str] = None):
         """
         Initialize the Yelp scraper with SerpAPI
-        """
-        # Load environment variables from .env file
-        load_dotenv()
-        
-        # self.api_key = '640382298fbdfe97550a46c7742b36a52b313afca5cbe37fdc9567fab3cce86f'
-        self.api_key = os.getenv("SERPAPI_API_KEY")
-        if not self.api_key:
-            raise ValueError("SERPAPI_API_KEY not found in environment variables")
         
+        Args:
+            rate_limiter: Limiter shared by all SerpAPI calls (defaults to one
+                configured from environment variables)
+            cache: On-disk response cache (defaults to one configured from
+                environment variables)
+            cache_mode: "use", "refresh" or "bypass" (see SerpAPIClient;
+                defaults to SERPAPI_CACHE_MODE or "use")
+        """
+        super().__init__(rate_limiter, cache, cache_mode)
 
     def search_restaurants(self, 
                          location: str, 
@@ -54,8 +67,7 @@ class YelpSerpAPIScraper:
         if category and category != "all":
             params["cflt"] = category
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = self._search(params)
         
         if "error" in results:
             raise Exception(f"API Error: {results['error']}")
@@ -79,94 +91,23 @@ class YelpSerpAPIScraper:
             
         return restaurants
     
-    def get_reviews(self, place_id: str, max_reviews: int = 10) -> List[Dict]:
+    def get_reviews(self,
+                    place_id: str,
+                    max_reviews: int = 10,
+                    since: Union[str, datetime, None] = None) -> List[Dict]:
         """
         Get reviews for a specific restaurant using the yelp_reviews engine
         
         Args:
             place_id: Yelp place ID
             max_reviews: Maximum number of reviews to fetch
+            since: Only fetch reviews newer than this date
         """
         print(f"\nFetching reviews for place_id: {place_id}")
         
-        params = {
-            "engine": "yelp_reviews",
-            "place_id": place_id,
-            "api_key": self.api_key
-        }
-        
-        print("API Request Parameters:", json.dumps(params, indent=2))
-        
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        if "error" in results:
-            print(f"API Error: {results['error']}")
-            raise Exception(f"API Error: {results['error']}")
-            
-        print("\nAPI Response Structure:")
-        print(json.dumps({k: type(v).__name__ for k, v in results.items()}, indent=2))
-        
-        reviews = []
-        raw_reviews = results.get("reviews", [])
-        print(f"\nNumber of reviews found: {len(raw_reviews)}")
+        reviews = list(self.iter_reviews(place_id, max_reviews=max_reviews, since=since))
         
-        for i, review in enumerate(raw_reviews[:max_reviews], 1):
-            print(f"\nProcessing review {i}:")
-            print(f"Review data: {json.dumps(review, indent=2)}")
-            
-            # Extract user information
-            user = review.get("user", {})
-            user_data = {
-                "name": user.get("name", ""),
-                "user_id": user.get("user_id", ""),
-                "link": user.get("link", ""),
-                "thumbnail": user.get("thumbnail", ""),
-                "address": user.get("address", ""),
-                "friends": user.get("friends", 0),
-                "photos": user.get("photos", 0),
-                "reviews": user.get("reviews", 0),
-                "elite_year": user.get("elite_year", 0)
-            }
-            
-            # Extract comment information
-            comment = review.get("comment", {})
-            comment_data = {
-                "text": comment.get("text", ""),
-                "language": comment.get("language", "")
-            }
-            
-            # Extract feedback information
-            feedback = review.get("feedback", {})
-            feedback_data = {
-                "useful": feedback.get("useful", 0),
-                "funny": feedback.get("funny", 0),
-                "cool": feedback.get("cool", 0)
-            }
-            
-            # Extract photos if available
-            photos = []
-            for photo in review.get("photos", []):
-                photos.append({
-                    "link": photo.get("link", ""),
-                    "caption": photo.get("caption", "")
-                })
-            
-            review_data = {
-                "position": review.get("position", 0),
-                "rating": review.get("rating", 0),
-                "date": review.get("date", ""),
-                "user": user_data,
-                "comment": comment_data,
-                "feedback": feedback_data,
-                "photos": photos,
-                "tags": review.get("tags", [])
-            }
-            
-            print(f"Extracted review data: {json.dumps(review_data, indent=2)}")
-            reviews.append(review_data)
-            
-        print(f"\nTotal reviews processed: {len(reviews)}")
+        print(f"Total reviews processed: {len(reviews)}")
         return reviews
     
     def get_business_details(self, place_id: str, location: str) -> Dict:
@@ -184,8 +125,7 @@ class YelpSerpAPIScraper:
             "api_key": self.api_key
         }
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = self._search(params)
         
         if "error" in results:
             raise Exception(f"API Error: {results['error']}")
@@ -231,16 +171,39 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
     and incremental scraping capabilities.
     """
     
-    def __init__(self, supabase_url=None, supabase_key=None):
+    def __init__(self, supabase_url=None, supabase_key=None, max_concurrency: int = 5,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None,
+                 cache: Optional[SerpAPIResponseCache] = None,
+                 cache_mode: Optional[str] = None,
+                 frontier: Optional[CrawlFrontier] = None,
+                 journal: Optional[WriteBehindJournal] = None,
+                 sync_index: Optional[SyncIndex] = None):
         """
         Initialize the Yelp scraper with SerpAPI and Supabase integration
         
         Args:
             supabase_url: Your Supabase project URL
             supabase_key: Your Supabase API key
+            max_concurrency: Maximum number of review/detail requests in flight per page
+            rate_limiter: Limiter shared by all SerpAPI calls
+            cache: On-disk response cache
+            cache_mode: "use", "refresh" or "bypass" (see YelpSerpAPIScraper)
+            frontier: Seen-set of place_ids shared across queries (defaults to
+                one configured from environment variables)
+            journal: Write-behind journal for page writes (defaults to one
+                configured from environment variables when SUPABASE_WRITE_BEHIND is set)
+            sync_index: Index of synced row hashes, so only changed restaurants,
+                reviews and details are written (defaults to one configured from
+                environment variables when SUPABASE_DIFF_SYNC is set)
         """
         # Initialize the parent class
-        super().__init__()
+        super().__init__(rate_limiter=rate_limiter, cache=cache, cache_mode=cache_mode)
+        
+        # Worker pool used to fetch reviews and details for a page in parallel
+        self.fetcher = ConcurrentFetcher(self, max_concurrency=max_concurrency)
+        
+        # Places already fetched by other queries within the freshness window
+        self.frontier = frontier or CrawlFrontier.from_env()
         
         # Set up Supabase client if credentials are provided
         self.supabase = None
@@ -256,6 +219,24 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
                 self.supabase = create_client(supabase_url, supabase_key)
             else:
                 print("WARNING: Supabase credentials not provided. Database features will be disabled.")
+        
+        # Page writes can go through a local journal so a slow database doesn't stall fetching
+        self.journal = journal
+        if self.journal is None and self.supabase \
+                and os.getenv("SUPABASE_WRITE_BEHIND", "").lower() in ("1", "true", "yes"):
+            self.journal = WriteBehindJournal.from_env(self.supabase)
+        if self.journal:
+            self.journal.start()
+        
+        # Hashes of the rows last written, so unchanged rows aren't sent again
+        self.sync_index = sync_index
+        if self.sync_index is None and SyncIndex.enabled_by_env():
+            self.sync_index = SyncIndex.from_env()
+    
+    def close(self):
+        """Drain the write-behind journal, if any"""
+        if self.journal:
+            self.journal.close()
     
     def check_supabase_connection(self):
         """Verify Supabase connection is configured"""
@@ -310,42 +291,135 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
         Returns:
             The created or updated metadata record
         """
+        # A single upsert; search_and_save uses a longer-lived tracker that coalesces writes
+        tracker = ScrapeMetadataTracker(self.supabase, location, query, min_interval=0)
+        return tracker.update(page=page, status=status, total_count=total_count, error=error)
+    
+    # ---- Review sync state (high-water marks) ----
+    
+    def get_review_watermarks(self, place_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Retrieve review high-water marks for a batch of restaurants
+        
+        High-water marks live in the review_sync_state table next to
+        scrape_metadata, one row per place_id with the columns
+        last_review_date, last_reviews_count, reviews_per_day and
+        last_synced_at.
+        
+        Args:
+            place_ids: Yelp place IDs to look up
+        
+        Returns:
+            Dictionary mapping place_id to its sync state row
+        """
         self.check_supabase_connection()
         
-        now = datetime.now().isoformat()
-        metadata = {
-            "location": location,
-            "query": query,
-            "last_page": page,
-            "last_updated": now,
-            "status": status,
-            "total_count": total_count
-        }
+        if not place_ids:
+            return {}
         
-        if error:
-            metadata["error"] = error
+        try:
+            response = self.supabase.table("review_sync_state") \
+                .select("*") \
+                .in_("place_id", list(place_ids)) \
+                .execute()
+            
+            return {row["place_id"]: row for row in response.data or []}
+        except Exception as e:
+            print(f"Error retrieving review sync state: {str(e)}")
+            return {}
+    
+    def update_review_watermarks(self, watermarks: List[Dict]) -> bool:
+        """
+        Upsert review high-water marks in one request
+        
+        Args:
+            watermarks: Rows with place_id, last_review_date and last_reviews_count
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        self.check_supabase_connection()
+        
+        if not watermarks:
+            return True
+        
+        now = datetime.now().isoformat()
+        rows = [{**watermark, "last_synced_at": now} for watermark in watermarks]
         
         try:
-            # Check if entry exists
-            existing = self.get_scrape_metadata(location, query)
+            self.supabase.table("review_sync_state") \
+                .upsert(rows, on_conflict="place_id") \
+                .execute()
+            return True
+        except Exception as e:
+            print(f"Error updating review sync state: {str(e)}")
+            return False
+    
+    def plan_review_sync(self, restaurants: List[Dict], watermarks: Dict[str, Dict]) -> List[Optional[Dict]]:
+        """
+        Decide, per restaurant, whether and how far back to fetch reviews
+        
+        Restaurants whose review count hasn't moved since the last sync are
+        skipped; restaurants with new reviews only fetch reviews newer than
+        their high-water mark; unknown restaurants get a full fetch.
+        
+        Args:
+            restaurants: Restaurants on the page
+            watermarks: Sync state keyed by place_id (see get_review_watermarks)
+        
+        Returns:
+            Review plans for ConcurrentFetcher.fetch_page, in page order
+        """
+        plans = []
+        
+        for restaurant in restaurants:
+            watermark = watermarks.get(restaurant["place_id"])
             
-            if existing:
-                # Update existing record
-                result = self.supabase.table("scrape_metadata") \
-                    .update(metadata) \
-                    .eq("id", existing["id"]) \
-                    .execute()
+            if not watermark:
+                plans.append({})
+            elif watermark.get("last_reviews_count") == restaurant.get("reviews_count"):
+                plans.append(None)
             else:
-                # Create new record
-                result = self.supabase.table("scrape_metadata") \
-                    .insert(metadata) \
-                    .execute()
-            
-            return result.data[0] if result.data else metadata
+                plans.append({"since": watermark.get("last_review_date")})
         
-        except Exception as e:
-            print(f"Error updating scrape metadata: {str(e)}")
-            return metadata
+        return plans
+    
+    def build_watermark(self, restaurant: Dict, reviews: List[Dict], previous: Optional[Dict] = None) -> Dict:
+        """
+        Build the new high-water mark for a restaurant after syncing its reviews
+        
+        Args:
+            restaurant: Restaurant data from the search results
+            reviews: Reviews fetched in this sync
+            previous: Previous sync state, if any
+        
+        Returns:
+            Sync state row for update_review_watermarks
+        """
+        previous = previous or {}
+        newest = parse_review_date(previous.get("last_review_date"))
+        newest_text = previous.get("last_review_date")
+        
+        for review in reviews:
+            review_date = parse_review_date(review.get("date"))
+            if review_date and (newest is None or review_date > newest):
+                newest, newest_text = review_date, review.get("date")
+        
+        # Review velocity, smoothed across runs, used by the refresh scheduler
+        reviews_count = restaurant.get("reviews_count", 0)
+        reviews_per_day = previous.get("reviews_per_day")
+        last_synced = parse_review_date(previous.get("last_synced_at"))
+        if last_synced and previous.get("last_reviews_count") is not None:
+            days = max((parse_review_date(datetime.now()) - last_synced).total_seconds() / 86400, 1 / 24)
+            observed = max(0, reviews_count - previous["last_reviews_count"]) / days
+            reviews_per_day = observed if reviews_per_day is None else 0.5 * reviews_per_day + 0.5 * observed
+        
+        return {
+            "place_id": restaurant["place_id"],
+            "last_review_date": newest_text,
+            "last_reviews_count": reviews_count,
+            "reviews_per_day": reviews_per_day
+        }
     
     # ---- Restaurant data management methods ----
     
@@ -384,37 +458,135 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
         Returns:
             The saved restaurant data with ID
         """
+        ids = self.save_restaurants([restaurant_data])
+        
+        if restaurant_data["place_id"] not in ids:
+            return None
+        return {"id": ids[restaurant_data["place_id"]], **restaurant_data}
+    
+    def save_restaurants(self, restaurants: List[Dict], chunk_size: int = 500) -> Dict[str, int]:
+        """
+        Upsert many restaurants on place_id, one request per chunk
+        
+        Rows are keyed by place_id, so existing restaurants are updated and new
+        ones inserted without looking them up first. created_at is left to its
+        column default, so updates keep the original creation time. With a
+        sync index, restaurants unchanged since they were last saved are not
+        sent and their ids come from the index.
+        
+        Args:
+            restaurants: Restaurant data to save (fetched reviews_data and
+                details are not sent)
+            chunk_size: Maximum number of rows per request
+        
+        Returns:
+            Dictionary mapping place_id to restaurant id for the saved rows
+        """
         self.check_supabase_connection()
         
-        # Add timestamp
-        restaurant_data["updated_at"] = datetime.now().isoformat()
+        now = datetime.now().isoformat()
+        rows = {}
+        for restaurant in restaurants:
+            restaurant["updated_at"] = now
+            # A place listed twice in one upsert would be rejected by Postgres
+            rows[restaurant["place_id"]] = {
+                key: value for key, value in restaurant.items()
+                if key not in ("reviews_data", "details")
+            }
+        rows = list(rows.values())
         
-        try:
-            # Check if restaurant exists
-            existing = self.get_restaurant(restaurant_data["place_id"])
-            
-            if existing:
-                # Update existing record
-                result = self.supabase.table("restaurants") \
-                    .update(restaurant_data) \
-                    .eq("id", existing["id"]) \
-                    .execute()
-                
-                restaurant_id = existing["id"]
-            else:
-                # Create new record
-                restaurant_data["created_at"] = datetime.now().isoformat()
+        ids = {}
+        if self.sync_index:
+            changed, unchanged = self.sync_index.diff("restaurants", rows, ["place_id"])
+            # Rows synced without their id (the JSON loader doesn't record ids) are
+            # upserted anyway; their reviews can't be saved until the id comes back
+            without_id = {place_id for place_id, row_id in unchanged.items() if row_id is None}
+            changed.extend(row for row in rows if row["place_id"] in without_id)
+            unchanged = {place_id: row_id for place_id, row_id in unchanged.items() if row_id is not None}
+            rows = changed
+            ids.update(unchanged)
+            if unchanged:
+                print(f"Skipping {len(unchanged)} unchanged restaurants")
+        
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            try:
                 result = self.supabase.table("restaurants") \
-                    .insert(restaurant_data) \
+                    .upsert(chunk, on_conflict="place_id", default_to_null=False) \
                     .execute()
                 
-                restaurant_id = result.data[0]["id"] if result.data else None
-            
-            return {"id": restaurant_id, **restaurant_data}
+                chunk_ids = {row["place_id"]: row["id"] for row in result.data or []}
+                ids.update(chunk_ids)
+                if self.sync_index:
+                    self.sync_index.mark("restaurants", chunk, ["place_id"], ids=chunk_ids)
+            except Exception as e:
+                print(f"Error saving {len(chunk)} restaurants: {str(e)}")
+        
+        return ids
+    
+    def build_details_row(self, place_id: str, details: Dict) -> Dict:
+        """
+        Convert business details into a restaurant_details table row
+        
+        Args:
+            place_id: Yelp place ID
+            details: Business details as returned by get_business_details
         
+        Returns:
+            Details data ready to be saved to Supabase
+        """
+        return {
+            "place_id": place_id,
+            "hours": json.dumps(details.get("hours", {})),
+            "address": details.get("address", ""),
+            "website": details.get("website", ""),
+            "photos": json.dumps(details.get("photos", [])),
+            "menu": json.dumps(details.get("menu", {})),
+            "health_score": details.get("health_score", 0)
+        }
+    
+    def save_business_details(self, place_id: str, details: Dict) -> bool:
+        """
+        Save business details to the restaurant_details table
+        
+        Args:
+            place_id: Yelp place ID
+            details: Business details as returned by get_business_details
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.save_many_business_details({place_id: details})
+    
+    def save_many_business_details(self, details_by_place: Dict[str, Dict]) -> bool:
+        """
+        Upsert the business details of many restaurants in one request
+        
+        Args:
+            details_by_place: Business details keyed by place_id
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        self.check_supabase_connection()
+        
+        rows = [self.build_details_row(place_id, details) for place_id, details in details_by_place.items()]
+        
+        if self.sync_index:
+            rows, _ = self.sync_index.diff("restaurant_details", rows, ["place_id"])
+        if not rows:
+            return True
+        
+        try:
+            self.supabase.table("restaurant_details") \
+                .upsert(rows, on_conflict="place_id") \
+                .execute()
+            if self.sync_index:
+                self.sync_index.mark("restaurant_details", rows, ["place_id"])
+            return True
         except Exception as e:
-            print(f"Error saving restaurant {restaurant_data.get('name', 'Unknown')}: {str(e)}")
-            return None
+            print(f"Error saving details for {len(rows)} restaurants: {str(e)}")
+            return False
     
     # ---- Review data management methods ----
     
@@ -423,7 +595,7 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
         Save a review to Supabase
         
         Args:
-            review_data: Review data to save
+            review_data: Review data to save (see build_review_row)
         
         Returns:
             The saved review data
@@ -434,51 +606,187 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
         review_data["updated_at"] = datetime.now().isoformat()
         
         try:
-            # Check if review already exists using user_id and restaurant_id
-            response = self.supabase.table("reviews") \
-                .select("*") \
-                .eq("user_id", review_data["user_id"]) \
-                .eq("restaurant_id", review_data["restaurant_id"]) \
+            # Reviews are unique per review_key, so one upsert inserts or updates
+            result = self.supabase.table("reviews") \
+                .upsert(review_data, on_conflict=REVIEW_CONFLICT_KEY, default_to_null=False) \
                 .execute()
             
-            if response.data and len(response.data) > 0:
-                # Update existing review
-                existing = response.data[0]
-                result = self.supabase.table("reviews") \
-                    .update(review_data) \
-                    .eq("id", existing["id"]) \
-                    .execute()
-            else:
-                # Create new review
-                review_data["created_at"] = datetime.now().isoformat()
-                result = self.supabase.table("reviews") \
-                    .insert(review_data) \
-                    .execute()
-            
             return result.data[0] if result.data else review_data
         
         except Exception as e:
             print(f"Error saving review: {str(e)}")
             return None
-    
+
+    def journal_page(self,
+                     page_restaurants: List[Dict],
+                     fetched: List[Dict],
+                     to_save: List[Dict],
+                     review_plans: Optional[List[Optional[Dict]]],
+                     watermarks: Dict[str, Dict],
+                     incremental: bool):
+        """
+        Append a page's restaurants, reviews, details and high-water marks to the write-behind journal
+        
+        Args:
+            page_restaurants: Restaurants on the page
+            fetched: Per-restaurant results from ConcurrentFetcher.fetch_page
+            to_save: Restaurants whose rows should be written
+            review_plans: Per-restaurant review plans (None entries were not synced)
+            watermarks: Previous high-water marks keyed by place_id
+            incremental: Whether to advance high-water marks
+        """
+        now = datetime.now().isoformat()
+        saved = {restaurant["place_id"] for restaurant in to_save}
+        restaurant_rows, review_rows, watermark_rows, details_rows = [], [], [], []
+        
+        for restaurant in to_save:
+            restaurant["updated_at"] = now
+            restaurant_rows.append({
+                key: value for key, value in restaurant.items()
+                if key not in ("reviews_data", "details")
+            })
+        
+        for index, (restaurant, page_data) in enumerate(zip(page_restaurants, fetched)):
+            # Details are keyed by place_id, so they don't wait for the restaurant row
+            if page_data["details"] is not None:
+                details_rows.append(self.build_details_row(restaurant["place_id"], page_data["details"]))
+            
+            if restaurant["place_id"] not in saved:
+                continue
+            
+            # The flusher fills in restaurant_id from the place_id
+            for review in page_data["reviews"]:
+                review_data = self.build_review_row(review, None, restaurant["place_id"])
+                if review_data["user_id"]:
+                    review_rows.append({**review_data, "place_id": restaurant["place_id"]})
+            
+            reviews_synced = review_plans is None or review_plans[index] is not None
+            if incremental and reviews_synced and "reviews" not in page_data["errors"]:
+                watermark = self.build_watermark(restaurant, page_data["reviews"], watermarks.get(restaurant["place_id"]))
+                watermark_rows.append({**watermark, "last_synced_at": now})
+        
+        self.journal.append_many("restaurant", restaurant_rows)
+        self.journal.append_many("review", review_rows)
+        self.journal.append_many("review_sync_state", watermark_rows)
+        self.journal.append_many("restaurant_details", details_rows)
+
+    def build_review_row(self, review: Dict, restaurant_id, place_id: str) -> Dict:
+        """
+        Convert a review returned by get_reviews into a reviews table row
+
+        Args:
+            review: Review data as returned by get_reviews
+            restaurant_id: ID of the restaurant the review belongs to
+            place_id: Yelp place ID of that restaurant
+
+        Returns:
+            Review data ready to be saved to Supabase
+        """
+        user = review.get("user", {})
+
+        return {
+            "restaurant_id": restaurant_id,
+            REVIEW_CONFLICT_KEY: review_key(place_id, review),
+            "user_id": user.get("user_id", ""),
+            "user_name": user.get("name", ""),
+            "rating": review.get("rating", 0),
+            "date": review.get("date", ""),
+            "text": review.get("comment", {}).get("text", ""),
+            "useful": review.get("feedback", {}).get("useful", 0),
+            "funny": review.get("feedback", {}).get("funny", 0),
+            "cool": review.get("feedback", {}).get("cool", 0)
+        }
+
     # ---- Enhanced scraping methods with database integration ----
     
+    def fetch_search_page(self,
+                          location: str,
+                          query: str,
+                          page_num: int,
+                          results_per_page: int = 20,
+                          **search_params) -> Dict:
+        """
+        Fetch one page of search results
+        
+        Args:
+            location: City and state
+            query: Search query
+            page_num: Page number (0-based)
+            results_per_page: Number of results per page
+            **search_params: Additional search parameters (price, category, sort_by, bounds)
+        
+        Returns:
+            The SerpAPI response for the page
+        """
+        # Set up pagination parameters
+        params = {
+            "engine": "yelp",
+            "find_desc": query,
+            "find_loc": location,
+            "start": page_num * results_per_page,  # For pagination
+            "api_key": self.api_key
+        }
+        
+        # Add optional filters
+        if "price" in search_params and search_params["price"] != "all":
+            params["attrs"] = f"RestaurantsPriceRange2.{len(search_params['price'])}"
+        if "category" in search_params and search_params["category"] != "all":
+            params["cflt"] = search_params["category"]
+        if "sort_by" in search_params:
+            params["sortby"] = search_params["sort_by"]
+        if "bounds" in search_params:
+            # Map bounds such as "g:-122.44,47.58,-122.30,47.68" (see geo_tiler)
+            params["l"] = search_params["bounds"]
+        
+        # Make API request (throttled by the shared rate limiter)
+        results = self._search(params)
+        
+        if "error" in results:
+            raise Exception(f"API Error: {results['error']}")
+        
+        return results
+    
     def search_and_save(self, 
                       location: str, 
                       query: str = "Restaurants",
                       start_page: int = 0,
                       max_pages: int = 5,
                       results_per_page: int = 20,
+                      fetch_details: bool = False,
+                      max_reviews: int = 10,
+                      prefetch_pages: int = 1,
+                      incremental: bool = True,
+                      use_frontier: bool = True,
+                      checkpoint_key: Optional[str] = None,
                       **search_params) -> Tuple[List[Dict], Dict]:
         """
         Search for restaurants and save results to Supabase
-        
+
+        Reviews (and optionally business details) for every restaurant on a
+        page are fetched concurrently, then saved in page order. While a page
+        is being processed, the next search pages are requested in the
+        background. With incremental sync, restaurants whose review count
+        hasn't changed since the last run skip the review fetch, and others
+        only fetch reviews newer than their stored high-water mark. With the
+        crawl frontier, a place surfaced by several queries has its row,
+        reviews and details fetched at most once per freshness window.
+
         Args:
             location: City and state
             query: Search query
             start_page: Page to start scraping from
             max_pages: Maximum number of pages to scrape
             results_per_page: Number of results per page
+            fetch_details: Whether to also fetch business details for each restaurant
+            max_reviews: Maximum number of reviews to fetch per restaurant
+            prefetch_pages: Number of search pages to request ahead of processing
+                (0 fetches each page only when it is processed)
+            incremental: Use per-restaurant review high-water marks to skip or
+                narrow review fetches
+            use_frontier: Skip places already fetched within the crawl
+                frontier's freshness window
+            checkpoint_key: Key stored as the scrape_metadata query (defaults to
+                query); lets runs with different filters checkpoint separately
             **search_params: Additional search parameters
         
         Returns:
@@ -487,55 +795,51 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
         all_restaurants = []
         current_page = start_page
         total_count = 0
+        pages = None
+        metadata_query = checkpoint_key or query
+        
+        # Progress is checkpointed with coalesced writes to scrape_metadata
+        metadata_tracker = ScrapeMetadataTracker(self.supabase, location, metadata_query)
+        
+        # Reviews are buffered and written with chunked upserts once per page
+        review_writer = BulkReviewWriter(self.supabase, sync_index=self.sync_index) if self.supabase else None
         
         try:
             # Update metadata to indicate scraping has started
-            metadata = self.update_scrape_metadata(
-                location=location,
-                query=query,
+            metadata = metadata_tracker.update(
                 page=current_page,
                 status="in_progress",
                 total_count=total_count
             )
             
-            for page_num in range(start_page, start_page + max_pages):
+            # Search pages are requested ahead of processing when prefetching
+            page_numbers = range(start_page, start_page + max_pages)
+            fetch_page = lambda page_num: self.fetch_search_page(
+                location, query, page_num, results_per_page, **search_params
+            )
+            
+            if prefetch_pages > 0:
+                pages = PagePrefetcher(
+                    fetch_page,
+                    page_numbers,
+                    is_last_page=lambda results: len(results.get("organic_results", [])) < results_per_page,
+                    lookahead=prefetch_pages
+                )
+            else:
+                pages = ((page_num, fetch_page(page_num)) for page_num in page_numbers)
+            
+            for page_num, results in pages:
                 current_page = page_num
                 
                 print(f"Scraping page {page_num + 1} of {start_page + max_pages}...")
                 
                 # Update metadata for current page
-                metadata = self.update_scrape_metadata(
-                    location=location,
-                    query=query,
+                metadata = metadata_tracker.update(
                     page=current_page,
                     status="processing_page",
                     total_count=total_count
                 )
                 
-                # Set up pagination parameters
-                params = {
-                    "engine": "yelp",
-                    "find_desc": query,
-                    "find_loc": location,
-                    "start": page_num * results_per_page,  # For pagination
-                    "api_key": self.api_key
-                }
-                
-                # Add optional filters
-                if "price" in search_params and search_params["price"] != "all":
-                    params["attrs"] = f"RestaurantsPriceRange2.{len(search_params['price'])}"
-                if "category" in search_params and search_params["category"] != "all":
-                    params["cflt"] = search_params["category"]
-                if "sort_by" in search_params:
-                    params["sortby"] = search_params["sort_by"]
-                
-                # Make API request
-                search = GoogleSearch(params)
-                results = search.get_dict()
-                
-                if "error" in results:
-                    raise Exception(f"API Error: {results['error']}")
-                
                 # Process restaurants on this page
                 page_restaurants = []
                 
@@ -561,52 +865,152 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
                     if not restaurant["place_id"]:
                         print(f"Skipping restaurant without place_id: {restaurant['name']}")
                         continue
-                    
-                    # Save restaurant to database
+
+                    page_restaurants.append(restaurant)
+
+                # Claim the places whose row, reviews or details are due
+                place_ids = [r["place_id"] for r in page_restaurants]
+                rows_due = reviews_due = details_due = None
+                if use_frontier and self.frontier:
                     if self.supabase:
-                        saved_restaurant = self.save_restaurant(restaurant)
-                        
-                        if saved_restaurant and saved_restaurant.get("id"):
-                            restaurant_id = saved_restaurant["id"]
-                            
-                            # Get and save reviews
-                            try:
-                                reviews = self.get_reviews(restaurant["place_id"])
-                                
-                                for review in reviews:
-                                    # Extract user information
-                                    user = review.get("user", {})
-                                    
-                                    # Prepare review data for database
-                                    review_data = {
-                                        "restaurant_id": restaurant_id,
-                                        "user_id": user.get("user_id", ""),
-                                        "user_name": user.get("name", ""),
-                                        "rating": review.get("rating", 0),
-                                        "date": review.get("date", ""),
-                                        "text": review.get("comment", {}).get("text", ""),
-                                        "useful": review.get("feedback", {}).get("useful", 0),
-                                        "funny": review.get("feedback", {}).get("funny", 0),
-                                        "cool": review.get("feedback", {}).get("cool", 0)
-                                    }
-                                    
-                                    # Save review
-                                    if review_data["user_id"]:
-                                        self.save_review(review_data)
-                            
-                            except Exception as e:
-                                print(f"Error processing reviews for {restaurant['name']}: {str(e)}")
+                        rows_due = self.frontier.claim(place_ids, "restaurant")
+                        reviews_due = self.frontier.claim(place_ids, "reviews")
+                        details_due = self.frontier.claim(place_ids, "details") if fetch_details else set()
+                    else:
+                        # Nothing is saved without a database, so nothing is claimed:
+                        # a later database run must still fetch and save these places
+                        rows_due = set()
+                        reviews_due = set(place_ids)
+                        details_due = set(place_ids) if fetch_details else set()
                     
-                    page_restaurants.append(restaurant)
+                    fresh_count = sum(
+                        1 for place_id in place_ids
+                        if place_id not in rows_due and place_id not in reviews_due and place_id not in details_due
+                    )
+                    if fresh_count:
+                        print(f"Skipping {fresh_count} restaurants already fetched within the freshness window")
+                
+                review_plans = None
+                if reviews_due is not None:
+                    review_plans = [{} if place_id in reviews_due else None for place_id in place_ids]
+                
+                # Skip or narrow review fetches using the stored high-water marks
+                watermarks = {}
+                if self.supabase and incremental:
+                    due_ids = [place_id for place_id in place_ids if reviews_due is None or place_id in reviews_due]
+                    watermarks = self.get_review_watermarks(due_ids)
+                    incremental_plans = self.plan_review_sync(page_restaurants, watermarks)
+                    review_plans = [
+                        plan if review_plans is None or review_plans[index] is not None else None
+                        for index, plan in enumerate(incremental_plans)
+                    ]
+                
+                detail_plans = None
+                if details_due is not None:
+                    detail_plans = [place_id in details_due for place_id in place_ids]
+                
+                # Fetch reviews (and details) for the whole page concurrently
+                fetched = self.fetcher.fetch_page(
+                    page_restaurants,
+                    location,
+                    fetch_details=fetch_details,
+                    max_reviews=max_reviews,
+                    review_plans=review_plans,
+                    detail_plans=detail_plans
+                )
+                
+                synced_watermarks = []
+                failed_claims = {"restaurant": [], "reviews": [], "details": []}
+                
+                # Upsert the page's restaurant rows in one request. Reviews need
+                # the restaurant id, so a row is saved whenever they were fetched
+                restaurant_ids = {}
+                to_save = []
+                if self.supabase:
+                    to_save = [
+                        restaurant for index, restaurant in enumerate(page_restaurants)
+                        if rows_due is None or restaurant["place_id"] in rows_due
+                        or review_plans is None or review_plans[index] is not None
+                    ]
+                
+                if self.journal:
+                    # Hand the page to the background flusher and move on
+                    self.journal_page(page_restaurants, fetched, to_save, review_plans, watermarks, incremental)
+                elif to_save:
+                    restaurant_ids = self.save_restaurants(to_save)
+                    
+                    for restaurant in to_save:
+                        if restaurant["place_id"] not in restaurant_ids:
+                            failed_claims["restaurant"].append(restaurant["place_id"])
+                            failed_claims["reviews"].append(restaurant["place_id"])
+                
+                # Fetched details are saved with one upsert per page, like reviews
+                if self.supabase and not self.journal:
+                    page_details = {
+                        restaurant["place_id"]: page_data["details"]
+                        for restaurant, page_data in zip(page_restaurants, fetched)
+                        if page_data["details"] is not None
+                    }
+                    if page_details and not self.save_many_business_details(page_details):
+                        failed_claims["details"].extend(page_details)
+
+                # Save results in page order
+                for index, (restaurant, page_data) in enumerate(zip(page_restaurants, fetched)):
+                    for kind, error in page_data["errors"].items():
+                        print(f"Error fetching {kind} for {restaurant['name']}: {error}")
+                        failed_claims[kind].append(restaurant["place_id"])
+
+                    reviews_synced = review_plans is None or review_plans[index] is not None
+                    restaurant_id = restaurant_ids.get(restaurant["place_id"])
+
+                    if restaurant_id:
+                        for review in page_data["reviews"]:
+                            review_data = self.build_review_row(review, restaurant_id, restaurant["place_id"])
+
+                            # Queue review
+                            if review_data["user_id"]:
+                                review_writer.add(review_data)
+
+                        # Advance the high-water mark for restaurants whose reviews were synced
+                        if incremental and reviews_synced and "reviews" not in page_data["errors"]:
+                            synced_watermarks.append((restaurant_id, self.build_watermark(
+                                restaurant,
+                                page_data["reviews"],
+                                watermarks.get(restaurant["place_id"])
+                            )))
+
+                    # Attach fetched data after saving so it is not sent to the restaurants table
+                    restaurant["reviews_data"] = page_data["reviews"]
+                    if page_data["details"] is not None:
+                        restaurant["details"] = page_data["details"]
+
+                if review_writer:
+                    review_writer.flush()
+                    
+                    # Restaurants whose reviews didn't save keep their old high-water mark
+                    for restaurant in page_restaurants:
+                        if restaurant_ids.get(restaurant["place_id"]) in review_writer.failed_restaurant_ids:
+                            failed_claims["reviews"].append(restaurant["place_id"])
+                    synced_watermarks = [
+                        watermark for restaurant_id, watermark in synced_watermarks
+                        if restaurant_id not in review_writer.failed_restaurant_ids
+                    ]
+                
+                if synced_watermarks:
+                    self.update_review_watermarks(synced_watermarks)
+                
+                # Let the next query retry places whose fetch or save failed
+                if use_frontier and self.frontier:
+                    for kind, failed_ids in failed_claims.items():
+                        if failed_ids:
+                            self.frontier.release(failed_ids, kind)
                 
                 # Add page results to overall results
                 all_restaurants.extend(page_restaurants)
                 total_count = len(all_restaurants)
                 
                 # Update metadata for completed page
-                metadata = self.update_scrape_metadata(
-                    location=location,
-                    query=query,
+                metadata = metadata_tracker.update(
                     page=current_page,
                     status="processing",
                     total_count=total_count
@@ -615,14 +1019,9 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
                 # If we got fewer than expected results, we've reached the end
                 if len(page_restaurants) < results_per_page:
                     break
-                
-                # Delay between requests to avoid rate limiting
-                time.sleep(2)
             
             # Update metadata to indicate scraping has completed
-            metadata = self.update_scrape_metadata(
-                location=location,
-                query=query,
+            metadata = metadata_tracker.update(
                 page=current_page,
                 status="completed",
                 total_count=total_count
@@ -635,9 +1034,7 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
             print(f"Error during scraping: {error_message}")
             
             # Update metadata to indicate error
-            metadata = self.update_scrape_metadata(
-                location=location,
-                query=query,
+            metadata = metadata_tracker.update(
                 page=current_page,
                 status="failed",
                 total_count=total_count,
@@ -645,6 +1042,11 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
             )
             
             return all_restaurants, metadata
+        
+        finally:
+            # Stop the background page fetcher if we finished early
+            if isinstance(pages, PagePrefetcher):
+                pages.close()
     
     def resume_scraping(self, location: str, query: str, **search_params) -> Tuple[List[Dict], Dict]:
         """
@@ -659,7 +1061,7 @@ class YelpSupabaseScraper(YelpSerpAPIScraper):
             Tuple of (list of restaurants scraped, metadata about the scrape)
         """
         # Get the last run metadata
-        metadata = self.get_scrape_metadata(location, query)
+        metadata = self.get_scrape_metadata(location, search_params.get("checkpoint_key") or query)
         
         if not metadata:
             print(f"No previous scraping data found for {location} - {query}. Starting from page 0.")
@@ -688,8 +1090,8 @@ def main_supabase():
     """Main function for Yelp scraper with Supabase integration"""
     print("\n===== Yelp Data Scraper with Supabase Integration =====\n")
     
-    # Initialize scraper
-    scraper = YelpSupabaseScraper()
+    # Initialize scraper; a crawl always fetches fresh pages unless SERPAPI_CACHE_MODE says otherwise
+    scraper = YelpSupabaseScraper(cache_mode=production_cache_mode())
     
     # Get search parameters
     location = get_user_input("Enter location (city and state)", "Seattle, WA")
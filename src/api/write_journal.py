@@ -0,0 +1,362 @@
+import os
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.api.review_writer import REVIEW_CONFLICT_KEY
+
+# Record kinds in the order they are written within a batch: reviews need
+# the ids of the restaurants written before them
+JOURNAL_KINDS = ("restaurant", "review", "review_sync_state", "restaurant_details")
+
+# Target table and conflict key per record kind
+JOURNAL_TABLES = {
+    "restaurant": ("restaurants", "place_id"),
+    "review": ("reviews", REVIEW_CONFLICT_KEY),
+    "review_sync_state": ("review_sync_state", "place_id"),
+    "restaurant_details": ("restaurant_details", "place_id")
+}
+
+
+class WriteBehindJournal:
+    """
+    Local write-behind journal between the scraper and Supabase.
+
+    Records are appended to a SQLite journal in WAL mode and the caller
+    returns at once. A background thread drains the journal to Supabase in
+    batched upserts, retrying failed batches with backoff. Records stay in
+    the journal until they are written, so after a crash they are replayed
+    the next time a journal is started on the same file.
+
+    Reviews are journaled with their restaurant's place_id and get the
+    restaurant id when they are flushed. A review high-water mark is held
+    until every review of its place journaled before it has been written,
+    and dropped if one of them is dead-lettered.
+
+    Every write is an idempotent upsert, so worker processes may share one
+    journal file: a record flushed by two of them is simply written twice.
+    """
+
+    def __init__(self,
+                 supabase,
+                 path: str = os.path.join(".serpapi_cache", "write_journal.sqlite"),
+                 batch_size: int = 500,
+                 flush_interval: float = 1.0,
+                 max_attempts: int = 5,
+                 retry_backoff: float = 2.0):
+        """
+        Initialize the journal
+
+        Args:
+            supabase: Supabase client records are written to
+            path: SQLite journal file
+            batch_size: Maximum number of records written per flush
+            flush_interval: Seconds the flusher waits when the journal is empty
+            max_attempts: Attempts before a record is moved to the dead-letter table
+            retry_backoff: Base of the exponential backoff between failed flushes, in seconds
+        """
+        self.supabase = supabase
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS dead_letters (
+                    seq INTEGER PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    error TEXT,
+                    failed_at REAL NOT NULL
+                )
+            """)
+
+        self.stats = {"appended": 0, "written": 0, "flushes": 0, "failed_flushes": 0, "dead_letters": 0}
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_env(cls, supabase) -> "WriteBehindJournal":
+        """
+        Build a journal from environment variables
+
+        SUPABASE_JOURNAL_PATH overrides the journal file.
+        """
+        return cls(
+            supabase,
+            path=os.getenv("SUPABASE_JOURNAL_PATH", os.path.join(".serpapi_cache", "write_journal.sqlite"))
+        )
+
+    @contextmanager
+    def _connect(self):
+        # WAL lets the scraper append while the flusher reads and deletes
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ---- Appending ----
+
+    def append_many(self, kind: str, records: List[Dict]):
+        """
+        Journal records for a table and return without waiting for Supabase
+
+        Args:
+            kind: One of JOURNAL_KINDS
+            records: Rows to upsert (reviews also carry their restaurant's place_id)
+        """
+        if kind not in JOURNAL_TABLES:
+            raise ValueError(f"Unknown journal record kind: {kind}")
+        if not records:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO entries (kind, payload, created_at) VALUES (?, ?, ?)",
+                [(kind, json.dumps(record, default=str), now) for record in records]
+            )
+
+        self.stats["appended"] += len(records)
+        self._wakeup.set()
+
+    def append(self, kind: str, record: Dict):
+        self.append_many(kind, [record])
+
+    def pending(self) -> int:
+        """
+        Number of journaled records not yet written
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ---- Flushing ----
+
+    def _resolve_restaurant_ids(self, place_ids: List[str], known: Dict[str, int]) -> Dict[str, int]:
+        missing = [place_id for place_id in set(place_ids) if place_id not in known]
+        for i in range(0, len(missing), 200):
+            response = self.supabase.table("restaurants") \
+                .select("id, place_id") \
+                .in_("place_id", missing[i:i + 200]) \
+                .execute()
+            for row in response.data or []:
+                known[row["place_id"]] = row["id"]
+        return known
+
+    def _write(self, kind: str, records: List[Dict], restaurant_ids: Dict[str, int]) -> List[int]:
+        """
+        Upsert one kind of record; returns the indexes of records to keep for later
+        """
+        table, conflict_key = JOURNAL_TABLES[kind]
+        now = datetime.now().isoformat()
+        rows = {}
+        deferred = []
+
+        for index, record in enumerate(records):
+            record = dict(record)
+
+            if kind == "review":
+                place_id = record.pop("place_id")
+                if place_id not in restaurant_ids:
+                    # The restaurant row hasn't been written yet
+                    deferred.append(index)
+                    continue
+                record["restaurant_id"] = restaurant_ids[place_id]
+            if kind in ("restaurant", "review"):
+                record["updated_at"] = now
+
+            # The same row twice in one upsert would be rejected by Postgres
+            key = tuple(record.get(column) for column in conflict_key.split(","))
+            rows[key] = record
+
+        if rows:
+            result = self.supabase.table(table) \
+                .upsert(list(rows.values()), on_conflict=conflict_key, default_to_null=False) \
+                .execute()
+
+            if kind == "restaurant":
+                for row in result.data or []:
+                    restaurant_ids[row["place_id"]] = row["id"]
+
+        return deferred
+
+    def _dead_letter(self, conn, seq: int, error: str):
+        conn.execute(
+            "INSERT OR REPLACE INTO dead_letters (seq, kind, payload, error, failed_at) "
+            "SELECT seq, kind, payload, ?, ? FROM entries WHERE seq = ?",
+            (error, time.time(), seq)
+        )
+        if conn.execute("DELETE FROM entries WHERE seq = ?", (seq,)).rowcount:
+            self.stats["dead_letters"] += 1
+
+    def flush_once(self) -> int:
+        """
+        Write the oldest batch of journaled records
+
+        Returns:
+            Number of records written
+        """
+        with self._connect() as conn:
+            entries = conn.execute(
+                "SELECT seq, kind, payload, attempts FROM entries ORDER BY seq LIMIT ?",
+                (self.batch_size,)
+            ).fetchall()
+
+        if not entries:
+            return 0
+
+        by_kind = {kind: [] for kind in JOURNAL_KINDS}
+        for seq, kind, payload, attempts in entries:
+            by_kind[kind].append((seq, json.loads(payload), attempts))
+
+        restaurant_ids = {}
+        done = []
+        deferred = []
+        errors = {}
+        # Places with reviews in this batch that weren't written
+        unsaved_reviews = set()
+
+        for kind in JOURNAL_KINDS:
+            batch = by_kind[kind]
+            if not batch:
+                continue
+
+            if kind == "review_sync_state":
+                # A high-water mark waits for its place's reviews, or the next
+                # incremental sync would start after reviews never stored. Held
+                # entries stay in the journal without using up an attempt
+                batch = [entry for entry in batch if entry[1]["place_id"] not in unsaved_reviews]
+                if not batch:
+                    continue
+
+            try:
+                if kind == "review":
+                    self._resolve_restaurant_ids([record["place_id"] for _, record, _ in batch], restaurant_ids)
+                keep = set(self._write(kind, [record for _, record, _ in batch], restaurant_ids))
+            except Exception as e:
+                errors[kind] = str(e)
+                print(f"Error flushing {len(batch)} {kind} records: {errors[kind]}")
+                keep = set(range(len(batch)))
+            else:
+                if keep:
+                    errors[kind] = "restaurant not found"
+
+            for index, (seq, record, attempts) in enumerate(batch):
+                if index in keep:
+                    deferred.append((seq, kind, attempts))
+                    if kind == "review":
+                        unsaved_reviews.add(record["place_id"])
+                else:
+                    done.append(seq)
+
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM entries WHERE seq = ?", [(seq,) for seq in done])
+
+            for seq, kind, attempts in deferred:
+                if attempts + 1 >= self.max_attempts:
+                    self._dead_letter(conn, seq, errors[kind])
+                    if kind == "review":
+                        # Its place's later high-water marks must not be written either
+                        place_id = json.loads(conn.execute(
+                            "SELECT payload FROM dead_letters WHERE seq = ?", (seq,)
+                        ).fetchone()[0])["place_id"]
+                        for (watermark_seq,) in conn.execute(
+                            "SELECT seq FROM entries WHERE kind = 'review_sync_state' AND seq > ? "
+                            "AND json_extract(payload, '$.place_id') = ?",
+                            (seq, place_id)
+                        ).fetchall():
+                            self._dead_letter(conn, watermark_seq, "reviews not saved")
+                else:
+                    conn.execute("UPDATE entries SET attempts = attempts + 1 WHERE seq = ?", (seq,))
+
+        self.stats["flushes"] += 1
+        self.stats["written"] += len(done)
+        if deferred:
+            self.stats["failed_flushes"] += 1
+        return len(done)
+
+    def _run(self):
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                written = self.flush_once()
+                progressed = written > 0
+                failures = 0 if progressed or not self.pending() else failures + 1
+            except Exception as e:
+                print(f"Error in journal flusher: {str(e)}")
+                failures += 1
+
+            if failures:
+                # Back off while Supabase is failing
+                self._stopped.wait(min(60.0, self.retry_backoff ** failures))
+            elif not self.pending():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+
+    def start(self):
+        """
+        Start the background flusher; records left by an earlier run are replayed first
+        """
+        if self._thread and self._thread.is_alive():
+            return self
+
+        replay = self.pending()
+        if replay:
+            print(f"Replaying {replay} journaled records from a previous run")
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def close(self, timeout: Optional[float] = 30.0) -> int:
+        """
+        Stop the flusher after draining the journal
+
+        Args:
+            timeout: Maximum seconds to spend draining
+
+        Returns:
+            Number of records still in the journal (replayed on the next start)
+        """
+        if self._thread:
+            self._stopped.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+        deadline = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        while time.monotonic() < deadline and self.pending():
+            if not self.flush_once():
+                break
+
+        remaining = self.pending()
+        if remaining:
+            print(f"{remaining} journaled records will be written on the next run")
+        return remaining
@@ -0,0 +1,116 @@
+import os
+import time
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoadCheckpoint:
+    """
+    Per-file progress of JSON loads into Supabase.
+
+    For each input file the loader records how many records have been
+    committed, so a load that dies part-way through can continue from that
+    record instead of from the start. Files are identified by their real
+    path; the size and modification time are stored alongside, and a file
+    that changed since its checkpoint is loaded again from the start.
+    """
+
+    def __init__(self, path: str = os.path.join(".serpapi_cache", "load_checkpoints.sqlite")):
+        """
+        Initialize the checkpoint store
+
+        Args:
+            path: SQLite file holding the checkpoints
+        """
+        self.path = path
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    file TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    records INTEGER NOT NULL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    @classmethod
+    def from_env(cls) -> "LoadCheckpoint":
+        """
+        Build a checkpoint store from environment variables
+
+        LOAD_CHECKPOINT_PATH overrides the SQLite file.
+        """
+        return cls(path=os.getenv("LOAD_CHECKPOINT_PATH", os.path.join(".serpapi_cache", "load_checkpoints.sqlite")))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _fingerprint(file_path: str):
+        stat = os.stat(file_path)
+        return os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path: str) -> Optional[Dict]:
+        """
+        Look up a file's checkpoint
+
+        Args:
+            file_path: Input file
+
+        Returns:
+            Dictionary with records (committed so far) and completed, or None
+            if the file has no checkpoint or changed since it was written
+        """
+        file, size, mtime_ns = self._fingerprint(file_path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT size, mtime_ns, records, completed FROM checkpoints WHERE file = ?", (file,)
+            ).fetchone()
+
+        if not row:
+            return None
+        if (row[0], row[1]) != (size, mtime_ns):
+            logger.info(f"{file_path} changed since its checkpoint; loading it from the start")
+            return None
+        return {"records": row[2], "completed": bool(row[3])}
+
+    def save(self, file_path: str, records: int, completed: bool = False):
+        """
+        Record that the first `records` records of a file are committed
+
+        Args:
+            file_path: Input file
+            records: Number of records committed
+            completed: Whether the whole file is loaded
+        """
+        file, size, mtime_ns = self._fingerprint(file_path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (file, size, mtime_ns, records, completed, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (file, size, mtime_ns, records, int(completed), time.time())
+            )
+
+    def reset(self, file_path: str):
+        """
+        Forget a file's checkpoint
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM checkpoints WHERE file = ?", (os.path.realpath(file_path),))
@@ -1,7 +1,12 @@
 import os
+import csv
+import time
+import argparse
 import pandas as pd
-from sqlalchemy import create_engine
-from dotenv import postgresql, load_dotenv
+import psycopg2
+from psycopg2 import sql
+from dotenv import load_dotenv
+from typing import Dict, List, Optional
 
 load_dotenv()
 
@@ -13,16 +18,295 @@ host = 'localhost'
 port = '5432'
 db = 'yelp_project_db'
 
-# Define file path
-file_path = '/Users/isaac/Documents/Python/Restaurant Recommendation Project/Data/yelp_master_original.csv'
+# Schema the CSV tables are loaded into
+SCHEMA = 'project_schema'
 
-# Create SQLAlchemy engine
-engine = create_engine(f'postgresql://{user}:{password}@{host}:{port}/{db}')
+# Folder holding the CSV exports
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Data")
 
-# Load your csv into a pandas DataFrame
-df = pd.read_csv(file_path)
+# Tables loaded from Data/, their source file and the indexes built after loading
+CSV_TABLES = {
+    "yelp_master_original": {
+        "file": "yelp_master_original.csv",
+        "indexes": [["id"], ["alias"]]
+    },
+    "yelp_categories": {
+        "file": "yelp_categories.csv",
+        "indexes": [["id"], ["alias"]]
+    },
+    "yelp_transactions": {
+        "file": "yelp_transactions.csv",
+        "indexes": [["id"], ["transaction_type"]]
+    },
+    "google_file_comparison": {
+        "file": "google_file_comparison.csv",
+        "indexes": [["id"]]
+    }
+}
 
-# Send data to PostgreSQL
-df.to_sql('yelp_master_original', engine, schema='project_schema',if_exists='fail',index=False)
+# Columns whose type shouldn't be inferred (phone numbers and zip codes look
+# numeric; date_run mixes "8/16/22 0:00" and ISO formats between exports)
+COLUMN_TYPES = {
+    "phone": "TEXT",
+    "zip_code": "TEXT",
+    "date_run": "TEXT"
+}
 
-print("Data imported successfully.")
\ No newline at end of file
+# Order in which inferred types widen when chunks disagree
+_TYPE_ORDER = ["BOOLEAN", "BIGINT", "DOUBLE PRECISION", "TEXT"]
+
+LOAD_MODES = ("append", "replace")
+
+
+def connect_from_env():
+    """
+    Open a connection to the project database
+
+    POSTGRES_DSN overrides the default local connection parameters.
+    """
+    dsn = os.getenv("POSTGRES_DSN") or f"postgresql://{user}:{password}@{host}:{port}/{db}"
+    return psycopg2.connect(dsn)
+
+
+def read_header(path: str) -> List[str]:
+    """
+    Column names from a CSV file's header row (the exports start with a byte-order mark)
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f))
+
+
+def infer_column_types(path: str, chunk_size: int = 100000) -> Dict[str, str]:
+    """
+    Infer a Postgres type for every column of a CSV file
+
+    The file is scanned in chunks with pandas and each column keeps the
+    widest type seen in any chunk, so a value late in the file can't break
+    the COPY.
+
+    Args:
+        path: CSV file
+        chunk_size: Rows per pandas chunk
+
+    Returns:
+        Dictionary mapping column name to Postgres type
+    """
+    types = {}
+
+    for chunk in pd.read_csv(path, encoding="utf-8-sig", chunksize=chunk_size):
+        for column, dtype in chunk.dtypes.items():
+            if chunk[column].isna().all():
+                continue
+            if pd.api.types.is_bool_dtype(dtype):
+                inferred = "BOOLEAN"
+            elif pd.api.types.is_integer_dtype(dtype):
+                inferred = "BIGINT"
+            elif pd.api.types.is_float_dtype(dtype):
+                inferred = "DOUBLE PRECISION"
+            else:
+                inferred = "TEXT"
+
+            previous = types.get(column, inferred)
+            if "BOOLEAN" in (previous, inferred) and previous != inferred:
+                # Booleans don't widen into numbers
+                types[column] = "TEXT"
+            else:
+                types[column] = max(previous, inferred, key=_TYPE_ORDER.index)
+
+    return {
+        column: COLUMN_TYPES.get(column, types.get(column, "TEXT"))
+        for column in read_header(path)
+    }
+
+
+class _ProgressReader:
+    """
+    File wrapper that reports how much of the file COPY has consumed
+    """
+
+    def __init__(self, f, total_bytes: int, label: str, interval: float = 5.0):
+        self.f = f
+        self.total_bytes = total_bytes
+        self.label = label
+        self.interval = interval
+        self.bytes_read = 0
+        self.start = time.perf_counter()
+        self.last_report = self.start
+
+    def read(self, size: int = -1):
+        data = self.f.read(size)
+        self.bytes_read += len(data)
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval and self.total_bytes:
+            print(f"  {self.label}: {self.bytes_read / self.total_bytes:.0%} "
+                  f"({self.bytes_read / (now - self.start) / 1e6:.1f} MB/s)")
+            self.last_report = now
+        return data
+
+
+class CSVBulkLoader:
+    """
+    Load the Data/ CSV exports into Postgres with COPY FROM STDIN.
+
+    Each file is streamed to the server in chunks of chunk_size bytes
+    without being parsed in Python, so memory stays flat and the server
+    parses rows in bulk instead of running one INSERT per row.
+
+    In replace mode a table is dropped, recreated, loaded and indexed in a
+    single transaction, so a failed load leaves the old table in place.
+    DROP TABLE takes an ACCESS EXCLUSIVE lock that is held until the
+    transaction commits, so queries on the table wait for the whole load
+    and then see all of the new rows. In append mode rows are added to the existing table (created
+    if missing). Indexes are built after the rows are in, which is much
+    faster than maintaining them row by row.
+    """
+
+    def __init__(self, conn, schema: str = SCHEMA, chunk_size: int = 1 << 20):
+        """
+        Initialize the loader
+
+        Args:
+            conn: psycopg2 connection
+            schema: Schema the tables are created in
+            chunk_size: Bytes sent to the server per COPY chunk
+        """
+        self.conn = conn
+        self.schema = schema
+        self.chunk_size = chunk_size
+
+    def _table(self, table: str):
+        return sql.Identifier(self.schema, table)
+
+    def _create_table(self, cur, table: str, column_types: Dict[str, str], if_not_exists: bool):
+        columns = sql.SQL(", ").join(
+            sql.SQL("{} {}").format(sql.Identifier(column), sql.SQL(column_type))
+            for column, column_type in column_types.items()
+        )
+        statement = "CREATE TABLE IF NOT EXISTS {} ({})" if if_not_exists else "CREATE TABLE {} ({})"
+        cur.execute(sql.SQL(statement).format(self._table(table), columns))
+
+    def _create_indexes(self, cur, table: str, indexes: List[List[str]]):
+        for columns in indexes:
+            name = f"{table}_{'_'.join(columns)}_idx"
+            cur.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                sql.Identifier(name),
+                self._table(table),
+                sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+            ))
+
+    def load_table(self,
+                   table: str,
+                   path: str,
+                   mode: str = "replace",
+                   indexes: Optional[List[List[str]]] = None) -> Dict:
+        """
+        Load one CSV file into a table
+
+        Args:
+            table: Table name in the loader's schema
+            path: CSV file with a header row
+            mode: "replace" to rebuild the table, "append" to add rows to it
+            indexes: Column lists to index after loading
+
+        Returns:
+            Dictionary with the table, rows loaded, seconds taken and rows_per_sec
+        """
+        if mode not in LOAD_MODES:
+            raise ValueError(f"mode must be one of {', '.join(LOAD_MODES)}")
+
+        start = time.perf_counter()
+        header = read_header(path)
+        # Inferred before the table is dropped so the lock isn't held during the scan
+        column_types = infer_column_types(path) if mode == "replace" else None
+
+        with self.conn:
+            with self.conn.cursor() as cur:
+                cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(self.schema)))
+
+                if mode == "replace":
+                    cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(self._table(table)))
+                    self._create_table(cur, table, column_types, if_not_exists=False)
+                else:
+                    cur.execute("SELECT to_regclass(%s)", (f"{self.schema}.{table}",))
+                    if cur.fetchone()[0] is None:
+                        self._create_table(cur, table, infer_column_types(path), if_not_exists=True)
+
+                copy = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                    self._table(table),
+                    sql.SQL(", ").join(sql.Identifier(column) for column in header)
+                )
+
+                with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                    # The header was read above; COPY gets the rows only
+                    next(csv.reader(f))
+                    reader = _ProgressReader(f, os.path.getsize(path), table)
+                    cur.copy_expert(copy.as_string(cur), reader, size=self.chunk_size)
+                # psycopg2 reports the rows copied in rowcount
+                rows = cur.rowcount
+
+                self._create_indexes(cur, table, indexes or [])
+                cur.execute(sql.SQL("ANALYZE {}").format(self._table(table)))
+
+        elapsed = time.perf_counter() - start
+        return {
+            "table": table,
+            "rows": rows,
+            "seconds": elapsed,
+            "rows_per_sec": rows / elapsed if elapsed else 0.0
+        }
+
+    def load_all(self,
+                 data_dir: str = DATA_DIR,
+                 mode: str = "replace",
+                 tables: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Load every CSV table (or the ones listed) from the data folder
+
+        Args:
+            data_dir: Folder holding the CSV files
+            mode: "replace" or "append"
+            tables: Tables to load (defaults to all of CSV_TABLES)
+
+        Returns:
+            Load summary for each table
+        """
+        summaries = []
+
+        for table in tables or list(CSV_TABLES):
+            if table not in CSV_TABLES:
+                raise ValueError(f"Unknown CSV table: {table}")
+
+            spec = CSV_TABLES[table]
+            summary = self.load_table(table, os.path.join(data_dir, spec["file"]), mode=mode,
+                                      indexes=spec["indexes"])
+            print(f"{table}: {summary['rows']} rows in {summary['seconds']:.2f}s "
+                  f"({summary['rows_per_sec']:.0f} rows/sec)")
+            summaries.append(summary)
+
+        return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load the Data/ CSV files into Postgres with COPY")
+    parser.add_argument("--mode", choices=LOAD_MODES, default="replace",
+                        help="Rebuild each table or append rows to it")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Folder holding the CSV files")
+    parser.add_argument("--tables", nargs="+", choices=list(CSV_TABLES), help="Tables to load (default: all)")
+    parser.add_argument("--schema", default=SCHEMA, help="Schema to load into")
+    args = parser.parse_args()
+
+    conn = connect_from_env()
+    try:
+        started = time.perf_counter()
+        summaries = CSVBulkLoader(conn, schema=args.schema).load_all(args.data_dir, args.mode, args.tables)
+        elapsed = time.perf_counter() - started
+        total = sum(summary["rows"] for summary in summaries)
+        print(f"Data imported successfully: {total} rows in {elapsed:.2f}s "
+              f"({total / elapsed if elapsed else 0:.0f} rows/sec)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
 import os
 import json
+import argparse
+import time
+import ijson
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from supabase import create_client
 from dotenv import load_dotenv
 import pandas as pd
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 import logging
 
+from src.api.review_writer import REVIEW_CONFLICT_KEY, review_key
+from src.data_processing.load_checkpoint import LoadCheckpoint
+from src.data_processing.sync_index import SyncIndex
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,16 +27,335 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class TableBatchWriter:
+    """
+    Buffer rows for one table and write them in multi-row requests.
+    
+    The buffer is written once it holds batch_size rows, or when a row is
+    added more than max_wait seconds after the oldest buffered row, so slow
+    producers don't leave rows waiting indefinitely. Writers listed in
+    depends_on are flushed first, so child rows (reviews, details) are never
+    written before the restaurants they refer to. With a sync index, rows
+    whose content hasn't changed since they were last written are dropped
+    before each request.
+    """
+    
+    def __init__(self, supabase, table: str, batch_size: int = 500,
+                 on_conflict: Optional[str] = None,
+                 depends_on: Optional[List["TableBatchWriter"]] = None,
+                 max_wait: Optional[float] = None,
+                 sync_index: Optional[SyncIndex] = None):
+        """
+        Initialize the writer
+        
+        Args:
+            supabase: Supabase client
+            table: Table in the public schema
+            batch_size: Number of rows per request
+            on_conflict: Upsert conflict columns (plain inserts if None)
+            depends_on: Writers to flush before this one
+            max_wait: Seconds a buffered row may wait before the buffer is written
+                (None flushes on size only)
+            sync_index: Index of synced row hashes (needs on_conflict to key rows)
+        """
+        self.supabase = supabase
+        self.table = table
+        self.batch_size = batch_size
+        self.on_conflict = on_conflict
+        self.depends_on = depends_on or []
+        self.max_wait = max_wait
+        self.sync_index = sync_index if on_conflict else None
+        
+        self.rows = []
+        self._oldest = None
+        self.stats = {"rows_written": 0, "rows_failed": 0, "rows_unchanged": 0, "batches": 0, "seconds": 0.0}
+    
+    def add(self, row: Dict[str, Any]):
+        """
+        Queue a row, writing the batch once it is full or has waited too long
+        """
+        if not self.rows:
+            self._oldest = time.monotonic()
+        self.rows.append(row)
+        
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+        elif self.max_wait is not None and time.monotonic() - self._oldest >= self.max_wait:
+            self.flush()
+    
+    def add_many(self, rows: List[Dict[str, Any]]):
+        """
+        Queue several rows
+        """
+        for row in rows:
+            self.add(row)
+    
+    def _dedupe(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Postgres rejects an upsert that touches the same row twice
+        if not self.on_conflict:
+            return rows
+        columns = self.on_conflict.split(",")
+        unique = {tuple(row.get(column) for column in columns): row for row in rows}
+        return list(unique.values())
+    
+    def flush(self) -> int:
+        """
+        Write every queued row
+        
+        Returns:
+            Number of rows written
+        """
+        for writer in self.depends_on:
+            writer.flush()
+        
+        if not self.rows:
+            return 0
+        
+        rows = self._dedupe(self.rows)
+        self.rows = []
+        written = 0
+        start = time.perf_counter()
+        
+        if self.sync_index:
+            key_columns = self.on_conflict.split(",")
+            rows, unchanged = self.sync_index.diff(self.table, rows, key_columns)
+            self.stats["rows_unchanged"] += len(unchanged)
+        
+        for i in range(0, len(rows), self.batch_size):
+            chunk = rows[i:i + self.batch_size]
+            try:
+                table = self.supabase.postgrest.schema("public").table(self.table)
+                if self.on_conflict:
+                    table.upsert(chunk, on_conflict=self.on_conflict, returning="minimal").execute()
+                else:
+                    table.insert(chunk, returning="minimal").execute()
+                
+                if self.sync_index:
+                    self.sync_index.mark(self.table, chunk, key_columns)
+                written += len(chunk)
+                self.stats["batches"] += 1
+            except Exception as e:
+                logger.error(f"Error writing {len(chunk)} rows to {self.table}: {str(e)}")
+                self.stats["rows_failed"] += len(chunk)
+        
+        self.stats["rows_written"] += written
+        self.stats["seconds"] += time.perf_counter() - start
+        return written
+
+
+class ParallelTableLoader:
+    """
+    Write restaurants, reviews and restaurant_details from separate worker pools.
+    
+    Restaurant rows are upserted in batches by their own pool. A batch's
+    reviews and details are held back until that upsert has committed and
+    are then handed to the child tables' pools, so throughput grows with the
+    worker count while children never reach Supabase before their restaurant.
+    If a restaurant batch fails, its children are counted as failed rather
+    than written.
+    
+    Batches finish out of order, so on_commit is called with the number of
+    records in the longest run of batches that has been fully written,
+    which is where a resumed load can safely start.
+    """
+    
+    # Conflict columns per table (plain inserts if None)
+    ON_CONFLICT = {"restaurants": "place_id", "reviews": REVIEW_CONFLICT_KEY, "restaurant_details": "place_id"}
+    CHILD_TABLES = ("reviews", "restaurant_details")
+    
+    def __init__(self, supabase, workers: int = 4, batch_size: int = 500,
+                 max_pending: Optional[int] = None,
+                 on_commit: Optional[Callable[[int], None]] = None,
+                 offset: int = 0,
+                 sync_index: Optional[SyncIndex] = None):
+        """
+        Initialize the loader
+        
+        Args:
+            supabase: Supabase client (shared by every worker thread)
+            workers: Worker threads per table
+            batch_size: Rows per request
+            max_pending: Batches parsed ahead of their writes; a batch holds
+                its slot until its reviews and details are written too
+                (defaults to twice the worker count)
+            on_commit: Called with the number of records fully written, counting
+                from the start of the file; stops being called after a failure
+            offset: Records already loaded before the first add()
+            sync_index: Index of synced row hashes; unchanged rows are not sent
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        
+        self.supabase = supabase
+        self.batch_size = batch_size
+        self.sync_index = sync_index
+        self.pools = {
+            table: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=table)
+            for table in self.ON_CONFLICT
+        }
+        
+        # Bounds the rows held in memory while batches and their children are in flight
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        self._lock = threading.Lock()
+        self._restaurants = []
+        self._children = {table: [] for table in self.CHILD_TABLES}
+        
+        # Commit tracking: writes outstanding per batch and record count at each batch's end
+        self.on_commit = on_commit
+        self._records = offset
+        self._next_batch = 0
+        self._lowest_open = 0
+        self._outstanding = {}
+        self._batch_end = {}
+        self._failed = False
+        
+        self.stats = {
+            table: {"rows_written": 0, "rows_failed": 0, "rows_unchanged": 0, "batches": 0,
+                    "started": None, "finished": None}
+            for table in self.ON_CONFLICT
+        }
+    
+    def add(self, restaurant_row: Dict[str, Any], review_rows: List[Dict[str, Any]],
+            details_row: Optional[Dict[str, Any]] = None):
+        """
+        Queue one restaurant with its child rows
+        """
+        self._restaurants.append(restaurant_row)
+        self._records += 1
+        self._children["reviews"].extend(review_rows)
+        if details_row:
+            self._children["restaurant_details"].append(details_row)
+        
+        if len(self._restaurants) >= self.batch_size:
+            self._submit_restaurants()
+    
+    def _submit_restaurants(self):
+        if not self._restaurants:
+            return
+        
+        rows, children = self._restaurants, self._children
+        self._restaurants = []
+        self._children = {table: [] for table in self.CHILD_TABLES}
+        
+        batch = self._next_batch
+        self._next_batch += 1
+        with self._lock:
+            self._outstanding[batch] = 1
+            self._batch_end[batch] = self._records
+        
+        # Wait here when the writers have fallen behind the parser
+        self._slots.acquire()
+        future = self.pools["restaurants"].submit(self._write, "restaurants", rows)
+        future.add_done_callback(lambda done: self._release_children(done, batch, children))
+    
+    def _release_children(self, future, batch: int, children: Dict[str, List[Dict[str, Any]]]):
+        # Runs in the restaurant worker once the batch has committed (or failed)
+        committed = False
+        try:
+            committed = not future.exception() and future.result()
+            for table, rows in children.items():
+                if not rows:
+                    continue
+                if not committed:
+                    logger.error(f"Skipping {len(rows)} {table} rows: their restaurant batch failed")
+                    with self._lock:
+                        self.stats[table]["rows_failed"] += len(rows)
+                    continue
+                for i in range(0, len(rows), self.batch_size):
+                    with self._lock:
+                        self._outstanding[batch] += 1
+                    child = self.pools[table].submit(self._write, table, rows[i:i + self.batch_size])
+                    child.add_done_callback(
+                        lambda done: self._task_done(batch, not done.exception() and done.result()))
+        finally:
+            self._task_done(batch, committed)
+    
+    def _task_done(self, batch: int, ok: bool):
+        with self._lock:
+            if not ok:
+                self._failed = True
+            self._outstanding[batch] -= 1
+            if self._outstanding[batch] == 0:
+                # Every write for this batch has finished, so its rows can go
+                self._slots.release()
+            
+            committed = None
+            while self._outstanding.get(self._lowest_open) == 0:
+                del self._outstanding[self._lowest_open]
+                committed = self._batch_end.pop(self._lowest_open)
+                self._lowest_open += 1
+            
+            # Held under the lock so checkpoints are saved in order
+            if committed is not None and not self._failed and self.on_commit:
+                self.on_commit(committed)
+    
+    def _write(self, table: str, rows: List[Dict[str, Any]]) -> bool:
+        writer = TableBatchWriter(self.supabase, table, self.batch_size, on_conflict=self.ON_CONFLICT[table],
+                                  sync_index=self.sync_index)
+        
+        with self._lock:
+            stats = self.stats[table]
+            if stats["started"] is None:
+                stats["started"] = time.perf_counter()
+        
+        writer.add_many(rows)
+        writer.flush()
+        
+        with self._lock:
+            for key in ("rows_written", "rows_failed", "rows_unchanged", "batches"):
+                stats[key] += writer.stats[key]
+            stats["finished"] = time.perf_counter()
+        
+        return writer.stats["rows_failed"] == 0
+    
+    def close(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Write everything still queued and stop the worker pools
+        
+        Returns:
+            Per-table stats, including rows_per_sec over the table's active time
+        """
+        self._submit_restaurants()
+        
+        # Restaurant batches release their children as they finish, so the
+        # child pools may only shut down once the restaurant pool has
+        self.pools["restaurants"].shutdown(wait=True)
+        for table in self.CHILD_TABLES:
+            self.pools[table].shutdown(wait=True)
+        
+        for stats in self.stats.values():
+            elapsed = (stats["finished"] - stats["started"]) if stats["started"] is not None else 0.0
+            stats["seconds"] = elapsed
+            stats["rows_per_sec"] = stats["rows_written"] / elapsed if elapsed else 0.0
+        return self.stats
+
 
 class YelpToSupabase:
     """
     Class to handle loading Yelp data from JSON file to Supabase database.
     """
     
-    def __init__(self):
+    def __init__(self, supabase=None, sync_index: Optional[SyncIndex] = None):
         """ 
         Initialize with Supabase credentials from environment variables.
+        
+        Args:
+            supabase: Existing Supabase client to use instead of creating one
+            sync_index: Index of synced row hashes, so batched loads only send
+                changed rows (defaults to one configured from environment
+                variables when SUPABASE_DIFF_SYNC is set)
         """
+        # Writers that buffer inserts while a batch() block is open
+        self._writers = None
+        
+        self.sync_index = sync_index
+        if self.sync_index is None and SyncIndex.enabled_by_env():
+            self.sync_index = SyncIndex.from_env()
+        
+        if supabase is not None:
+            self.supabase = supabase
+            return
+        
         # Load environment variables
         load_dotenv()
 
@@ -44,6 +373,115 @@ class YelpToSupabase:
 
 
     
+    # ---- Batching ----
+    
+    def _make_writers(self, batch_size: int = 500,
+                      max_wait: Optional[float] = None) -> Dict[str, TableBatchWriter]:
+        """
+        Build one batched writer per table; reviews and details flush their restaurants first
+        """
+        restaurants = TableBatchWriter(self.supabase, "restaurants", batch_size,
+                                       on_conflict="place_id", max_wait=max_wait, sync_index=self.sync_index)
+        return {
+            "restaurants": restaurants,
+            "reviews": TableBatchWriter(self.supabase, "reviews", batch_size, on_conflict=REVIEW_CONFLICT_KEY,
+                                        depends_on=[restaurants], max_wait=max_wait,
+                                        sync_index=self.sync_index),
+            "restaurant_details": TableBatchWriter(self.supabase, "restaurant_details", batch_size,
+                                                   on_conflict="place_id", depends_on=[restaurants],
+                                                   max_wait=max_wait, sync_index=self.sync_index)
+        }
+    
+    @contextmanager
+    def batch(self, batch_size: int = 500, max_wait: Optional[float] = 2.0):
+        """
+        Buffer insert_* calls and write them as multi-row requests
+        
+        Inside the block, insert_restaurant, insert_reviews and
+        insert_restaurant_details queue their rows per table. A table's rows
+        are sent once batch_size of them are queued or the oldest has waited
+        max_wait seconds, and whatever is left is sent when the block exits.
+        
+        Args:
+            batch_size: Rows per request
+            max_wait: Seconds a queued row may wait (None flushes on size only)
+            
+        Returns:
+            Dictionary of the per-table writers, for their stats
+        """
+        if self._writers is not None:
+            # Already batching: join the outer block
+            yield self._writers
+            return
+        
+        self._writers = self._make_writers(batch_size, max_wait)
+        try:
+            yield self._writers
+        finally:
+            writers, self._writers = self._writers, None
+            for writer in writers.values():
+                writer.flush()
+    
+    # ---- Row builders ----
+    
+    def build_restaurant_row(self, restaurant: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a scraped restaurant into a public.restaurants row
+        """
+        return {
+            "place_id": restaurant.get("place_id", ""),
+            "name": restaurant.get("name", ""),
+            "rating": restaurant.get("rating", 0),
+            "reviews_count": restaurant.get("reviews", 0),
+            "price": restaurant.get("price", ""),
+            "categories": json.dumps(restaurant.get("categories", [])),
+            "neighborhood": restaurant.get("neighborhood", ""),
+            "phone": restaurant.get("phone", ""),
+            "url": restaurant.get("url", ""),
+            "service_options": json.dumps(restaurant.get("service_options", {})),
+            "highlights": json.dumps(restaurant.get("highlights", []))
+        }
+    
+    def build_review_rows(self, place_id: str, reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convert a restaurant's scraped reviews into public.reviews rows
+        """
+        rows = []
+        for review in reviews or []:
+            user_data = review.get("user", {})
+            
+            rows.append({
+                "place_id": place_id,
+                REVIEW_CONFLICT_KEY: review_key(place_id, review),
+                "position": review.get("position", 0),
+                "rating": review.get("rating", 0),
+                "date": review.get("date", ""),
+                "user_id": user_data.get("user_id", ""),
+                "user_name": user_data.get("name", ""),
+                "user_data": json.dumps(user_data),
+                "comment": review.get("comment", {}).get("text", ""),
+                "photos": json.dumps(review.get("photos", [])),
+                "tags": json.dumps(review.get("tags", [])),
+                "feedback": json.dumps(review.get("feedback", {}))
+            })
+        return rows
+    
+    def build_details_row(self, place_id: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert scraped business details into a public.restaurant_details row
+        """
+        return {
+            "place_id": place_id,
+            "hours": json.dumps(details.get("hours", {})),
+            "address": details.get("address", ""),
+            "website": details.get("website", ""),
+            "photos": json.dumps(details.get("photos", [])),
+            "menu": json.dumps(details.get("menu", {})),
+            "health_score": details.get("health_score", 0)
+        }
+    
+    # ---- Single-record inserts ----
+    
     def insert_restaurant(self, restaurant: Dict[str, Any]) -> bool:
         """
         Insert a restaurant into the public.restaurants table
@@ -56,19 +494,11 @@ class YelpToSupabase:
         """
         try:
             # Extract restaurant data
-            restaurant_data = {
-                "place_id": restaurant.get("place_id", ""),
-                "name": restaurant.get("name", ""),
-                "rating": restaurant.get("rating", 0),
-                "reviews_count": restaurant.get("reviews", 0),
-                "price": restaurant.get("price", ""),
-                "categories": json.dumps(restaurant.get("categories", [])),
-                "neighborhood": restaurant.get("neighborhood", ""),
-                "phone": restaurant.get("phone", ""),
-                "url": restaurant.get("url", ""),
-                "service_options": json.dumps(restaurant.get("service_options", {})),
-                "highlights": json.dumps(restaurant.get("highlights", []))
-            }
+            restaurant_data = self.build_restaurant_row(restaurant)
+            
+            if self._writers is not None:
+                self._writers["restaurants"].add(restaurant_data)
+                return True
             
             # Insert restaurant data into public.restaurants
             result = self.supabase.postgrest.schema("public").table("restaurants").upsert(
@@ -82,13 +512,18 @@ class YelpToSupabase:
             logger.error(f"Error inserting restaurant {restaurant.get('name', 'unknown')}: {str(e)}")
             return False
     
-    def insert_reviews(self, place_id: str, reviews: List[Dict[str, Any]]) -> bool:
+    def insert_reviews(self, place_id: str, reviews: List[Dict[str, Any]], batch_size: int = 500) -> bool:
         """
         Insert reviews for a restaurant into the public.reviews table
         
+        Reviews are sent as multi-row upserts of up to batch_size rows, keyed
+        on review_key so that reloading a file doesn't duplicate them. Inside
+        a batch() block they are queued with the other tables' rows instead.
+        
         Args:
             place_id: Restaurant place_id
             reviews: List of review dictionaries
+            batch_size: Rows per insert request
             
         Returns:
             bool: True if successful, False otherwise
@@ -97,27 +532,18 @@ class YelpToSupabase:
             if not reviews:
                 logger.warning(f"No reviews to insert for place_id: {place_id}")
                 return True
-                
-            # Process and insert reviews
-            for review in reviews:
-                user_data = review.get("user", {})
-                
-                review_data = {
-                    "place_id": place_id,
-                    "position": review.get("position", 0),
-                    "rating": review.get("rating", 0),
-                    "date": review.get("date", ""),
-                    "user_id": user_data.get("user_id", ""),
-                    "user_name": user_data.get("name", ""),
-                    "user_data": json.dumps(user_data),
-                    "comment": review.get("comment", {}).get("text", ""),
-                    "photos": json.dumps(review.get("photos", [])),
-                    "tags": json.dumps(review.get("tags", [])),
-                    "feedback": json.dumps(review.get("feedback", {}))
-                }
-                
-                # Insert review data into public.reviews
-                self.supabase.postgrest.schema("public").table("reviews").insert(review_data).execute()
+            
+            review_rows = self.build_review_rows(place_id, reviews)
+            
+            if self._writers is not None:
+                self._writers["reviews"].add_many(review_rows)
+                return True
+            
+            # Upsert review data into public.reviews, one request per chunk
+            for i in range(0, len(review_rows), batch_size):
+                self.supabase.postgrest.schema("public").table("reviews") \
+                    .upsert(review_rows[i:i + batch_size], on_conflict=REVIEW_CONFLICT_KEY, returning="minimal") \
+                    .execute()
             
             logger.info(f"Inserted {len(reviews)} reviews for place_id: {place_id}")
             return True
@@ -142,15 +568,11 @@ class YelpToSupabase:
                 return True
                 
             # Extract details data
-            details_data = {
-                "place_id": place_id,
-                "hours": json.dumps(details.get("hours", {})),
-                "address": details.get("address", ""),
-                "website": details.get("website", ""),
-                "photos": json.dumps(details.get("photos", [])),
-                "menu": json.dumps(details.get("menu", {})),
-                "health_score": details.get("health_score", 0)
-            }
+            details_data = self.build_details_row(place_id, details)
+            
+            if self._writers is not None:
+                self._writers["restaurant_details"].add(details_data)
+                return True
             
             # Insert details data into public.restaurant_details
             result = self.supabase.postgrest.schema("public").table("restaurant_details").upsert(
@@ -164,16 +586,36 @@ class YelpToSupabase:
             logger.error(f"Error inserting details for place_id {place_id}: {str(e)}")
             return False
     
-    def load_json_to_supabase(self, json_file_path: str) -> bool:
+    def load_json_to_supabase(self, json_file_path: str, stream: bool = False, batch_size: int = 500,
+                              max_wait: Optional[float] = 2.0, workers: int = 1,
+                              resume: bool = False, restart: bool = False) -> bool:
         """
         Load Yelp data from JSON file into Supabase PUBLIC schema
         
         Args:
             json_file_path: Path to JSON file
+            stream: Parse the file incrementally and write in batches
+                (see load_json_streaming) instead of loading it whole
+            batch_size: Rows per request
+            max_wait: Seconds a queued row may wait before its batch is sent
+            workers: Worker threads per table; above 1 the tables are loaded
+                in parallel (see load_json_parallel)
+            resume: Checkpoint progress per input file and continue from the
+                last committed record; implies stream
+            restart: With resume, discard the file's checkpoint and load it from the start
             
         Returns:
             bool: True if successful, False otherwise
         """
+        checkpoint = LoadCheckpoint.from_env() if resume else None
+        
+        if workers > 1:
+            return self.load_json_parallel(json_file_path, workers=workers, batch_size=batch_size,
+                                           checkpoint=checkpoint, restart=restart)
+        if stream or resume:
+            return self.load_json_streaming(json_file_path, batch_size=batch_size, max_wait=max_wait,
+                                            checkpoint=checkpoint, restart=restart)
+        
         try:
             # Read JSON file
             with open(json_file_path, 'r', encoding='utf-8') as f:
@@ -181,16 +623,21 @@ class YelpToSupabase:
             
             logger.info(f"Loaded JSON data from {json_file_path}")
             
-            # Load data into Supabase
-            for restaurant in data:
-                # Insert restaurant
-                self.insert_restaurant(restaurant)
-                
-                # Insert reviews
-                self.insert_reviews(restaurant.get("place_id", ""), restaurant.get("reviews_data", []))
-                
-                # Insert details
-                self.insert_restaurant_details(restaurant.get("place_id", ""), restaurant.get("details", {}))
+            # Load data into Supabase, batching rows per table
+            with self.batch(batch_size, max_wait) as writers:
+                for restaurant in data:
+                    # Insert restaurant
+                    self.insert_restaurant(restaurant)
+                    
+                    # Insert reviews
+                    self.insert_reviews(restaurant.get("place_id", ""), restaurant.get("reviews_data", []))
+                    
+                    # Insert details
+                    self.insert_restaurant_details(restaurant.get("place_id", ""), restaurant.get("details", {}))
+            
+            if any(writer.stats["rows_failed"] for writer in writers.values()):
+                logger.error(f"Some rows from {json_file_path} could not be written")
+                return False
             
             logger.info(f"Successfully loaded {len(data)} restaurants into Supabase")
             return True
@@ -198,22 +645,217 @@ class YelpToSupabase:
             logger.error(f"Error loading JSON data to Supabase: {str(e)}")
             return False
 
+    def _resume_point(self, json_file_path: str, checkpoint: Optional[LoadCheckpoint],
+                      restart: bool) -> Optional[int]:
+        """
+        Number of records to skip when loading a file, or None if it is already loaded
+        """
+        if checkpoint is None:
+            return 0
+        if restart:
+            checkpoint.reset(json_file_path)
+            return 0
+        
+        saved = checkpoint.get(json_file_path)
+        if not saved:
+            return 0
+        if saved["completed"]:
+            logger.warning(f"Skipping {json_file_path}: its checkpoint says it is already loaded "
+                           f"(pass restart=True, or --restart, to load it again)")
+            return None
+        
+        logger.info(f"Resuming {json_file_path} after {saved['records']} committed restaurants")
+        return saved["records"]
+    
+    def _checkpoint(self, checkpoint: LoadCheckpoint, json_file_path: str,
+                    writers: List[TableBatchWriter], records: int) -> bool:
+        """
+        Write everything buffered, then record that the first `records` records are committed
+        """
+        for writer in writers:
+            writer.flush()
+        
+        # Never move the checkpoint past rows that failed; the rerun redoes them
+        if any(writer.stats["rows_failed"] for writer in writers):
+            return False
+        
+        checkpoint.save(json_file_path, records)
+        return True
+    
+    def load_json_streaming(self, json_file_path: str, batch_size: int = 500,
+                            progress_interval: float = 5.0, max_wait: Optional[float] = None,
+                            checkpoint: Optional[LoadCheckpoint] = None, restart: bool = False) -> bool:
+        """
+        Stream Yelp data from a JSON array file into Supabase in batches
+        
+        Restaurants are parsed one at a time with ijson and their rows handed
+        to batched writers, so memory use stays flat however large the file is.
+        
+        With a checkpoint, every batch_size restaurants the writers are
+        flushed and the number of committed records is saved for the file. A
+        rerun skips that many records, and since every write is an upsert,
+        records written after the last checkpoint are simply written again.
+        
+        Args:
+            json_file_path: Path to a JSON file whose top level is an array of restaurants
+            batch_size: Rows per request
+            progress_interval: Seconds between progress reports
+            max_wait: Seconds a queued row may wait before its batch is sent
+            checkpoint: Store to resume from and save progress to
+            restart: Discard the file's checkpoint and load it from the start
+            
+        Returns:
+            bool: True if every row was written, False otherwise
+        """
+        skip = self._resume_point(json_file_path, checkpoint, restart)
+        if skip is None:
+            return True
+        
+        writers = self._make_writers(batch_size, max_wait)
+        restaurants, reviews, details = writers["restaurants"], writers["reviews"], writers["restaurant_details"]
+        writers = tuple(writers.values())
+        
+        position = 0
+        restaurant_count = 0
+        record_count = 0
+        start = time.perf_counter()
+        last_report = start
+        
+        try:
+            with open(json_file_path, 'rb') as f:
+                # use_float keeps numbers JSON-serializable (ijson yields Decimals otherwise)
+                for position, restaurant in enumerate(ijson.items(f, "item", use_float=True), start=1):
+                    if position <= skip:
+                        continue
+                    place_id = restaurant.get("place_id", "")
+                    
+                    restaurants.add(self.build_restaurant_row(restaurant))
+                    record_count += 1
+                    
+                    for review_data in self.build_review_rows(place_id, restaurant.get("reviews_data", [])):
+                        reviews.add(review_data)
+                        record_count += 1
+                    
+                    if restaurant.get("details"):
+                        details.add(self.build_details_row(place_id, restaurant["details"]))
+                        record_count += 1
+                    
+                    restaurant_count += 1
+                    
+                    if checkpoint and restaurant_count % batch_size == 0:
+                        self._checkpoint(checkpoint, json_file_path, writers, position)
+                    
+                    now = time.perf_counter()
+                    if now - last_report >= progress_interval:
+                        logger.info(f"Processed {restaurant_count} restaurants, {record_count} records "
+                                    f"({record_count / (now - start):.0f} records/sec)")
+                        last_report = now
+            
+            for writer in writers:
+                writer.flush()
+            
+            if checkpoint and self._checkpoint(checkpoint, json_file_path, writers, position):
+                checkpoint.save(json_file_path, position, completed=True)
+        except Exception as e:
+            logger.error(f"Error streaming JSON data to Supabase: {str(e)}")
+            return False
+        
+        elapsed = time.perf_counter() - start
+        failed = sum(writer.stats["rows_failed"] for writer in writers)
+        logger.info(f"Loaded {restaurant_count} restaurants ({record_count} records) in {elapsed:.1f}s "
+                    f"({record_count / elapsed if elapsed else 0:.0f} records/sec)")
+        for writer in writers:
+            logger.info(f"  {writer.table}: {writer.stats['rows_written']} written, "
+                        f"{writer.stats['rows_unchanged']} unchanged, "
+                        f"{writer.stats['rows_failed']} failed in {writer.stats['batches']} batches")
+        
+        return failed == 0
+
+    def load_json_parallel(self, json_file_path: str, workers: int = 4, batch_size: int = 500,
+                           checkpoint: Optional[LoadCheckpoint] = None, restart: bool = False) -> bool:
+        """
+        Stream Yelp data from a JSON array file into Supabase with one worker pool per table
+        
+        Restaurants are parsed with ijson and handed to a ParallelTableLoader,
+        which releases each batch's reviews and details only after the
+        restaurants they refer to are committed. With a checkpoint, progress is
+        saved whenever a run of batches has been fully written.
+        
+        Args:
+            json_file_path: Path to a JSON file whose top level is an array of restaurants
+            workers: Worker threads per table
+            batch_size: Rows per request
+            checkpoint: Store to resume from and save progress to
+            restart: Discard the file's checkpoint and load it from the start
+            
+        Returns:
+            bool: True if every row was written, False otherwise
+        """
+        skip = self._resume_point(json_file_path, checkpoint, restart)
+        if skip is None:
+            return True
+        
+        on_commit = (lambda records: checkpoint.save(json_file_path, records)) if checkpoint else None
+        loader = ParallelTableLoader(self.supabase, workers=workers, batch_size=batch_size,
+                                     on_commit=on_commit, offset=skip, sync_index=self.sync_index)
+        restaurant_count = 0
+        start = time.perf_counter()
+        
+        try:
+            with open(json_file_path, 'rb') as f:
+                for position, restaurant in enumerate(ijson.items(f, "item", use_float=True), start=1):
+                    if position <= skip:
+                        continue
+                    place_id = restaurant.get("place_id", "")
+                    details = restaurant.get("details")
+                    
+                    loader.add(
+                        self.build_restaurant_row(restaurant),
+                        self.build_review_rows(place_id, restaurant.get("reviews_data", [])),
+                        self.build_details_row(place_id, details) if details else None
+                    )
+                    restaurant_count += 1
+        except Exception as e:
+            logger.error(f"Error loading JSON data to Supabase in parallel: {str(e)}")
+            return False
+        finally:
+            stats = loader.close()
+        
+        elapsed = time.perf_counter() - start
+        logger.info(f"Loaded {restaurant_count} restaurants in {elapsed:.1f}s with {workers} workers per table")
+        for table, table_stats in stats.items():
+            logger.info(f"  {table}: {table_stats['rows_written']} written, {table_stats['rows_unchanged']} unchanged, "
+                        f"{table_stats['rows_failed']} failed in {table_stats['batches']} batches "
+                        f"({table_stats['rows_per_sec']:.0f} rows/sec)")
+        
+        succeeded = all(table_stats["rows_failed"] == 0 for table_stats in stats.values())
+        if checkpoint and succeeded:
+            checkpoint.save(json_file_path, skip + restaurant_count, completed=True)
+        return succeeded
+
 def main():
+    parser = argparse.ArgumentParser(description="Load a Yelp JSON export into Supabase")
+    parser.add_argument("json_file", nargs="?", help="Path to the Yelp JSON file (prompted for if omitted)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Checkpoint progress and continue from the file's last checkpoint")
+    parser.add_argument("--restart", action="store_true", help="With --resume, load the file again from the start")
+    args = parser.parse_args()
+
     # Create loader instance
     loader = YelpToSupabase()
 
     
     # Load JSON data to Supabase
-    json_file_path = input("Enter the path to the Yelp JSON file: ")
+    json_file_path = args.json_file or input("Enter the path to the Yelp JSON file: ")
     if not os.path.exists(json_file_path):
         logger.error(f"File not found: {json_file_path}")
         return
     
-    result = loader.load_json_to_supabase(json_file_path)
+    result = loader.load_json_to_supabase(json_file_path, stream=True, resume=args.resume, restart=args.restart)
     if result:
         logger.info("Data successfully loaded to Supabase PUBLIC schema")
     else:
         logger.error("Failed to load data to Supabase PUBLIC schema")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,34 +2,54 @@ import pandas as pd
 import json
 import os
 from openai import OpenAI
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+
+from src.data_processing.restaurant_index import RestaurantIndex
+from src.data_processing.restaurant_table import SORT_COLUMNS, RestaurantTable
+from src.data_processing.snapshot_cache import SnapshotCache
+from src.data_processing.top_k import sort_keys, top_records
 
 json_path = '/Users/isaac/Documents/Python/restaurant_recommendation_project/yelp_data_20250506_080923.json'
 
+# Parsed exports are kept in memory and as binary snapshots, so each analysis doesn't re-parse the JSON
+snapshot_cache = SnapshotCache.from_env()
+
+
+def parse_json(json_path):
+    """
+    Parse a Yelp JSON export into a list of restaurant dictionaries.
+    """
+    # First opens the the json file in read mode. It then loads the data into a variable called data.
+    with open(json_path, 'r') as file:
+        data = json.load(file)
+
+    # if the data instance is a list, it returns the data as is.
+    if isinstance(data, list):
+        return data
+    # if the data instance is a dictionary, it returns the data with the key 'restaurants'.
+    if isinstance(data, dict) and "restaurants" in data:
+        return data['restaurants']
+    # if the data is neither a list or dictionary, it raises a ValueError.
+    raise ValueError(f"Unexcpected JSON structure in {json_path}.")
 
-def load_json(json_path):
+
+def load_json(json_path, use_snapshot: bool = True):
     """
     Load Yelp data from a JSON file.
 
     Args:
         json_path: Path to the JSON file.
+        use_snapshot: Load from the in-memory copy or binary snapshot of the
+            file when it hasn't changed since it was last parsed.
 
     Returns:
-        List of restaurant data dictionaries.
+        List of restaurant data dictionaries. With use_snapshot the list is
+        shared with later loads of the same file, so don't modify it in place.
     """
-    # First opens the the json file in read mode. It then loads the data into a variable called data.
     try:
-        with open(json_path, 'r') as file:
-            data = json.load(file)
-
-        # if the data instance is a list, it returns the data as is.
-        if isinstance(data, list):
-            return data
-        # if the data instance is a dictionary, it returns the data with the key 'restaurants'.
-        if isinstance(data, dict) and "restaurants" in data:
-            return data['restaurants']
-        # if the data is neither a list or dictionary, it raises a ValueError.
-        raise ValueError(f"Unexcpected JSON structure in {json_path}.")
+        if use_snapshot:
+            return snapshot_cache.load(json_path, parse_json)
+        return parse_json(json_path)
     
     # If there is an error in opening the file, it prints the error message and returns an empty list.
     except Exception as e:
@@ -117,23 +137,48 @@ def convert_json_to_dataframe(restaurants: List[Dict[str, Any]]):
 
     return pd.DataFrame(flattened_data)
 
-def filter_restaurants(restaurants: List[Dict[str, Any]],
+def filter_restaurants(restaurants: Union[List[Dict[str, Any]], RestaurantTable, RestaurantIndex],
                        min_rating: float = 0,
                        categories: List[str] = None,
-                       neighborhood: str = None):
+                       neighborhood: str = None,
+                       prices: List[Union[str, int]] = None,
+                       transactions: List[str] = None):
      
     """"
     Filter restaurants based on rating, categories, and neighborhood.
     
     Args:
-        restaurants: List of restaurant data disctionaries.
+        restaurants: List of restaurant data disctionaries, a RestaurantTable
+            to filter with vectorized array operations, or a RestaurantIndex to
+            answer from its category and neighborhood postings.
         min_rating: Minimum rating to include
         categories: List of categories to filter by (any match)
         neighborhood: Specific neighborhood to filter by.
+        prices: Price strings ("$$") or tiers (2) to filter by (any match)
+        transactions: Transaction types ("delivery", "pickup", ...) to filter by (any match)
         
     Returns:
-        Filtered list of restaurant dictionaries.
+        Filtered list of restaurant dictionaries
     """
+    if isinstance(restaurants, RestaurantTable):
+        filtered = restaurants.filter(min_rating, categories, neighborhood).to_records()
+        if prices or transactions:
+            # The table has no transactions column, so these are checked on the matching records
+            return filter_restaurants(filtered, prices=prices, transactions=transactions)
+        return filtered
+
+    if isinstance(restaurants, RestaurantIndex):
+        matches = restaurants.search(categories=categories or None,
+                                     neighborhoods=[neighborhood] if neighborhood else None,
+                                     prices=prices or None,
+                                     transactions=transactions or None)
+        # Ratings aren't indexed; only the rows that matched are checked
+        return [restaurant for restaurant in matches if restaurant.get("rating", 0) >= min_rating]
+
+    # Prices compare by tier, so "$$" and 2 match the same restaurants
+    price_tiers = {len(price) if isinstance(price, str) else price for price in prices or ()}
+    transaction_types = {str(kind).lower() for kind in transactions or ()}
+
     filtered = []
 
     for restaurant in restaurants:
@@ -159,58 +204,68 @@ def filter_restaurants(restaurants: List[Dict[str, Any]],
         if neighborhood and restaurant.get("neighborhood") != neighborhood:
             continue
 
+        # Check price
+        if price_tiers:
+            price = restaurant.get("price")
+            if (len(price) if isinstance(price, str) else price) not in price_tiers:
+                continue
+
+        # Check transactions
+        if transaction_types:
+            if not transaction_types & {str(kind).lower() for kind in restaurant.get("transactions") or ()}:
+                continue
+
         filtered.append(restaurant)
 
     return filtered
 
-def get_top_restaurants(restaurants: List[Dict[str, Any]], 
+def get_top_restaurants(restaurants: Union[List[Dict[str, Any]], RestaurantTable], 
                        count: int = 5, 
-                       sort_by: str = "rating") -> List[Dict[str, Any]]:
+                       sort_by: Union[str, List[str]] = "rating",
+                       ascending: Union[bool, List[bool]] = False) -> List[Dict[str, Any]]:
     """
     Get top restaurants sorted by specified criteria
+
+    Only the top count restaurants are selected and sorted, so this stays
+    cheap on large lists. Restaurants that tie keep their original order.
     
     Args:
-        restaurants: List of restaurant data dictionaries
+        restaurants: List of restaurant data dictionaries, or a RestaurantTable
         count: Number of top restaurants to return
-        sort_by: Field to sort by ('rating', 'reviews', etc.)
+        sort_by: Field to sort by ('rating', 'reviews', etc.), or a list of fields in priority order
+        ascending: Sort lowest first instead of highest first, for all fields or per field
         
     Returns:
         List of top restaurant dictionaries
     """
-    # Convert to DataFrame for easier sorting
-    df = convert_json_to_dataframe(restaurants)
-    
-    # Sort by the specified column
-    if sort_by in df.columns:
-        df_sorted = df.sort_values(by=sort_by, ascending=False)
-        
-        # Convert back to list of dictionaries
-        top_restaurants = df_sorted.head(count).to_dict('records')
-        
-        # Convert string representations back to objects
-        for restaurant in top_restaurants:
-            for key, value in restaurant.items():
-                if isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
-                    try:
-                        restaurant[key] = json.loads(value)
-                    except:
-                        pass  # Keep as string if can't be parsed
-        
-        return top_restaurants
+    keys, _ = sort_keys(sort_by, ascending)
+
+    if isinstance(restaurants, RestaurantTable):
+        if all(key in SORT_COLUMNS for key in keys):
+            return restaurants.to_records(restaurants.top(count, sort_by, ascending))
+        print(f"Warning: Sort field '{sort_by}' not found. Returning unsorted restaurants.")
+        return restaurants.to_records()[:count]
+
+    # Sort on the records directly; only fields that at least one restaurant has can be sorted on
+    if all(any(key in restaurant for restaurant in restaurants) for key in keys):
+        return top_records(restaurants, count, sort_by, ascending)
     else:
         print(f"Warning: Sort field '{sort_by}' not found. Returning unsorted restaurants.")
         return restaurants[:count]
 
-def analyze_reviews_distribution(restaurants: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_reviews_distribution(restaurants: Union[List[Dict[str, Any]], RestaurantTable]) -> Dict[str, Any]:
     """
     Analyze the distribution of reviews across restaurants
     
     Args:   
-        restaurants: List of restaurant data dictionaries
+        restaurants: List of restaurant data dictionaries, or a RestaurantTable
         
     Returns:
         Dictionary with analysis of reviews distribution
     """
+    if isinstance(restaurants, RestaurantTable):
+        return restaurants.reviews_distribution()
+
     # Extract ratings and review counts
     ratings = [restaurant.get("rating", 0) for restaurant in restaurants]
     review_counts = [restaurant.get("reviews", 0) for restaurant in restaurants]
@@ -318,28 +373,31 @@ def main_data_processing(json_path: str,
     
     if not restaurants:
         return {"error": f"No valid data found in {json_path}"}
+
+    # Columnar copy of the fields used for filtering, sorting and statistics
+    table = RestaurantTable.from_records(restaurants)
     
     # Process based on analysis focus
     if analysis_focus == "top_rated":
-        selected_restaurants = get_top_restaurants(restaurants, count=max_restaurants, sort_by="rating")
+        selected_restaurants = get_top_restaurants(table, count=max_restaurants, sort_by="rating")
         processed_data = preprocess_for_llm(selected_restaurants, max_restaurants=max_restaurants)
         analysis_context = "Top-rated restaurants analysis"
         
     elif analysis_focus == "most_reviewed":
-        selected_restaurants = get_top_restaurants(restaurants, count=max_restaurants, sort_by="reviews")
+        selected_restaurants = get_top_restaurants(table, count=max_restaurants, sort_by="reviews")
         processed_data = preprocess_for_llm(selected_restaurants, max_restaurants=max_restaurants)
         analysis_context = "Most reviewed restaurants analysis"
         
     elif analysis_focus == "specific_category":
         # Example: Focus on Italian restaurants
-        filtered = filter_restaurants(restaurants, categories=["Italian"])
+        filtered = filter_restaurants(table, categories=["Italian"])
         selected_restaurants = filtered[:max_restaurants]
         processed_data = preprocess_for_llm(selected_restaurants, max_restaurants=max_restaurants)
         analysis_context = "Italian restaurants analysis"
         
     elif analysis_focus == "neighborhood":
         # Example: Focus on Downtown restaurants
-        filtered = filter_restaurants(restaurants, neighborhood="Downtown")
+        filtered = filter_restaurants(table, neighborhood="Downtown")
         selected_restaurants = filtered[:max_restaurants]
         processed_data = preprocess_for_llm(selected_restaurants, max_restaurants=max_restaurants)
         analysis_context = "Downtown restaurants analysis"
@@ -357,7 +415,7 @@ def main_data_processing(json_path: str,
         analysis_context = "General restaurant analysis"
     
     # Include overall statistics
-    stats = analyze_reviews_distribution(restaurants)
+    stats = analyze_reviews_distribution(table)
     
     return {
         "processed_restaurants": processed_data,
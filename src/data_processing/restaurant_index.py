@@ -0,0 +1,322 @@
+import os
+import csv
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Union
+
+from src.data_processing.restaurant_table import category_names
+
+# Transaction types per Yelp business id (delivery, pickup, restaurant_reservation)
+TRANSACTIONS_CSV = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Data", "yelp_transactions.csv"
+)
+
+# Fields the index holds postings for
+FIELDS = ("category", "neighborhood", "price", "transaction")
+
+
+def load_transactions(path: str = TRANSACTIONS_CSV) -> Dict[str, Set[str]]:
+    """
+    Transaction types of every business in a transactions export
+
+    Args:
+        path: CSV with id and transaction_type columns
+
+    Returns:
+        Dictionary mapping business id to its set of transaction types
+    """
+    transactions = {}
+    # The exports start with a byte-order mark
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("id") and row.get("transaction_type"):
+                transactions.setdefault(row["id"], set()).add(row["transaction_type"].strip().lower())
+    return transactions
+
+
+def restaurant_key(record: Dict[str, Any]) -> Optional[str]:
+    """
+    Identifier of a restaurant record: the Yelp business id, or the SerpAPI place_id
+    """
+    return record.get("id") or record.get("place_id") or None
+
+
+def _bitmap(rows: Iterable[int], size: int) -> int:
+    """
+    Bitmap with the given rows set, for rows below size
+    """
+    bits = bytearray((size + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _price_tier(price: Union[str, int, None]) -> Optional[int]:
+    if isinstance(price, int):
+        return price or None
+    if isinstance(price, str) and price:
+        return len(price)
+    return None
+
+
+class RestaurantIndex:
+    """
+    In-memory inverted index over restaurant records.
+
+    Every category, neighborhood, price tier and transaction type maps to a
+    bitmap of the rows that have it, held as a Python int where bit i is
+    row i. A query ORs the bitmaps of the values asked for within a field
+    and ANDs the fields together, so combining criteria costs a handful of
+    big-integer operations instead of a scan over every record.
+
+    Rows are assigned in the order records are added. add() replaces the
+    record already indexed under the same id or place_id, and update() and
+    remove() adjust only the postings of the row they touch, so the index
+    can follow a live dataset without being rebuilt. Removed rows keep
+    their number; their bits are simply cleared.
+    """
+
+    def __init__(self, transactions: Optional[Dict[str, Set[str]]] = None):
+        """
+        Initialize an empty index
+
+        Args:
+            transactions: Transaction types per restaurant id (see load_transactions).
+                Types listed in a record's own transactions field are indexed too.
+        """
+        self.transactions = transactions if transactions is not None else {}
+        self.records = []
+        self._postings = {field: {} for field in FIELDS}
+        # (field, value) pairs each row is posted under, so a row can be unposted
+        self._terms = []
+        self._rows_by_key = {}
+        self._live = 0
+
+    @classmethod
+    def from_records(cls,
+                     records: Iterable[Dict[str, Any]],
+                     transactions: Optional[Dict[str, Set[str]]] = None) -> "RestaurantIndex":
+        """
+        Build an index over restaurant records
+
+        Args:
+            records: Restaurant data dictionaries
+            transactions: Transaction types per restaurant id
+
+        Returns:
+            RestaurantIndex with one row per record, in order
+        """
+        index = cls(transactions)
+
+        # Collect each term's rows first and build its bitmap once; ORing rows
+        # in one at a time would copy the growing bitmap on every record
+        rows_by_term = {}
+        for record in records:
+            key = restaurant_key(record)
+            if key is not None and key in index._rows_by_key:
+                # A later record for the same restaurant replaces the earlier one
+                row = index._rows_by_key[key]
+                for term in index._terms[row]:
+                    rows_by_term[term].discard(row)
+            else:
+                row = len(index.records)
+                index.records.append(None)
+                index._terms.append(None)
+                if key is not None:
+                    index._rows_by_key[key] = row
+
+            terms = index._record_terms(record)
+            index.records[row] = record
+            index._terms[row] = terms
+            for term in terms:
+                rows_by_term.setdefault(term, set()).add(row)
+
+        size = len(index.records)
+        for (field, value), rows in rows_by_term.items():
+            if rows:
+                index._postings[field][value] = _bitmap(rows, size)
+        index._live = _bitmap(range(size), size)
+        return index
+
+    def __len__(self) -> int:
+        return self._live.bit_count()
+
+    def _record_terms(self, record: Dict[str, Any]) -> List[tuple]:
+        terms = {("category", name) for name in category_names(record.get("categories"))}
+
+        neighborhood = record.get("neighborhood")
+        if isinstance(neighborhood, str) and neighborhood:
+            terms.add(("neighborhood", neighborhood))
+
+        tier = _price_tier(record.get("price"))
+        if tier:
+            terms.add(("price", tier))
+
+        types = set(self.transactions.get(restaurant_key(record), ()))
+        types.update(str(kind).lower() for kind in record.get("transactions") or ())
+        terms.update(("transaction", kind) for kind in types)
+
+        return sorted(terms, key=str)
+
+    def _post(self, row: int, terms: List[tuple]):
+        bit = 1 << row
+        for field, value in terms:
+            postings = self._postings[field]
+            postings[value] = postings.get(value, 0) | bit
+
+    def _unpost(self, row: int):
+        bit = 1 << row
+        for field, value in self._terms[row]:
+            postings = self._postings[field]
+            remaining = postings[value] & ~bit
+            if remaining:
+                postings[value] = remaining
+            else:
+                del postings[value]
+        self._terms[row] = []
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """
+        Index a record, replacing the one indexed under the same id if there is one
+
+        Returns:
+            The record's row number
+        """
+        key = restaurant_key(record)
+        if key is not None and key in self._rows_by_key:
+            row = self._rows_by_key[key]
+            self.update(row, record)
+            return row
+
+        row = len(self.records)
+        terms = self._record_terms(record)
+        self.records.append(record)
+        self._terms.append(terms)
+        self._post(row, terms)
+        self._live |= 1 << row
+        if key is not None:
+            self._rows_by_key[key] = row
+        return row
+
+    def update(self, row: int, record: Dict[str, Any]):
+        """
+        Replace the record in a row and re-post it under its new values
+        """
+        if not self._live >> row & 1:
+            raise KeyError(row)
+
+        old_key = restaurant_key(self.records[row])
+        if old_key is not None and self._rows_by_key.get(old_key) == row:
+            del self._rows_by_key[old_key]
+        key = restaurant_key(record)
+        if key is not None:
+            self._rows_by_key[key] = row
+
+        self._unpost(row)
+        terms = self._record_terms(record)
+        self.records[row] = record
+        self._terms[row] = terms
+        self._post(row, terms)
+
+    def remove(self, row: int):
+        """
+        Drop a row from the index
+        """
+        if not self._live >> row & 1:
+            raise KeyError(row)
+
+        key = restaurant_key(self.records[row])
+        if key is not None and self._rows_by_key.get(key) == row:
+            del self._rows_by_key[key]
+        self._unpost(row)
+        self.records[row] = None
+        self._live &= ~(1 << row)
+
+    def row_of(self, key: str) -> Optional[int]:
+        """
+        Row number of the record with an id or place_id, if it is indexed
+        """
+        return self._rows_by_key.get(key)
+
+    def set_transactions(self, key: str, types: Iterable[str]):
+        """
+        Replace the transaction types known for a restaurant id and re-post its row
+        """
+        self.transactions[key] = {kind.lower() for kind in types}
+        row = self._rows_by_key.get(key)
+        if row is not None:
+            self.update(row, self.records[row])
+
+    def values(self, field: str) -> List:
+        """
+        Distinct values indexed for a field
+        """
+        return sorted(self._postings[field], key=str)
+
+    def bitmap(self, field: str, values: Sequence) -> int:
+        """
+        Rows having any of the values in a field
+        """
+        if isinstance(values, (str, int)):
+            values = [values]
+        if field == "price":
+            values = [_price_tier(value) for value in values]
+        elif field == "transaction":
+            values = [str(value).lower() for value in values]
+
+        postings = self._postings[field]
+        bits = 0
+        for value in values:
+            bits |= postings.get(value, 0)
+        return bits
+
+    def query(self,
+              categories: Optional[Sequence[str]] = None,
+              neighborhoods: Optional[Sequence[str]] = None,
+              prices: Optional[Sequence[Union[str, int]]] = None,
+              transactions: Optional[Sequence[str]] = None) -> int:
+        """
+        Bitmap of the rows matching every given criterion
+
+        A row matches a criterion if it has any of the values listed for it;
+        criteria left as None don't restrict the result.
+
+        Args:
+            categories: Category names
+            neighborhoods: Neighborhood names
+            prices: Price strings ("$$") or tiers (2)
+            transactions: Transaction types ("delivery", "pickup", ...)
+
+        Returns:
+            Bitmap with bit i set for every matching row i
+        """
+        bits = self._live
+        for field, values in (("category", categories), ("neighborhood", neighborhoods),
+                              ("price", prices), ("transaction", transactions)):
+            if values is not None:
+                bits &= self.bitmap(field, values)
+                if not bits:
+                    break
+        return bits
+
+    @staticmethod
+    def rows(bits: int) -> List[int]:
+        """
+        Row numbers set in a bitmap, in ascending order
+        """
+        # bin() lists the bits most significant first, so read it backwards
+        digits = bin(bits)[:1:-1]
+        rows = []
+        row = digits.find("1")
+        while row != -1:
+            rows.append(row)
+            row = digits.find("1", row + 1)
+        return rows
+
+    def search(self,
+               categories: Optional[Sequence[str]] = None,
+               neighborhoods: Optional[Sequence[str]] = None,
+               prices: Optional[Sequence[Union[str, int]]] = None,
+               transactions: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Records matching every given criterion, in row order; see query()
+        """
+        return [self.records[row] for row in self.rows(self.query(categories, neighborhoods, prices, transactions))]
@@ -0,0 +1,360 @@
+import json
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.data_processing.top_k import sort_keys, top_indices
+
+# Columns that can be sorted on, and the record fields they hold
+SORT_COLUMNS = {
+    "rating": "rating",
+    "reviews": "reviews",
+    "reviews_count": "reviews",
+    "price": "price"
+}
+
+# Rating bands reported by reviews_distribution(), highest first; each runs
+# from its lower bound up to the next band's
+RATING_RANGES = [
+    ("5-star", 4.75),
+    ("4.5-5", 4.5),
+    ("4-4.5", 4.0),
+    ("3.5-4", 3.5),
+    ("3-3.5", 3.0),
+    ("below-3", -np.inf)
+]
+
+
+def category_names(value: Any) -> List[str]:
+    """
+    Category names from a record's categories field
+
+    Exports hold categories as a list of names, a list of {"title": ...}
+    objects (raw SerpAPI results) or a JSON string of either.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+        if isinstance(value, str):
+            return [value]
+    if isinstance(value, dict):
+        value = [value]
+
+    names = []
+    for category in value:
+        if isinstance(category, dict):
+            category = category.get("title")
+        if category:
+            names.append(str(category))
+    return names
+
+
+def _coordinates(record: Dict[str, Any]) -> Tuple[float, float]:
+    """
+    (latitude, longitude) of a record, or NaN for whatever is missing
+    """
+    point = record.get("coordinates") or record.get("gps_coordinates") or record
+    if not isinstance(point, dict):
+        return np.nan, np.nan
+
+    latitude = point.get("latitude")
+    longitude = point.get("longitude")
+    return (float(latitude) if latitude is not None else np.nan,
+            float(longitude) if longitude is not None else np.nan)
+
+
+class _Dictionary:
+    """
+    Builds the code table for a dictionary-encoded string column
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class RestaurantTable:
+    """
+    Columnar, read-only view of a list of restaurant dictionaries.
+
+    The fields used for filtering, sorting and statistics are held as typed
+    NumPy arrays, one entry per restaurant, so those operations run as
+    vectorized array expressions instead of Python loops over dicts:
+
+        rating                float64
+        reviews               int64 (reviews, or reviews_count for exports
+                              that use that name)
+        price                 int8 tier, the number of "$" (0 when unknown)
+        neighborhood          int32 code into neighborhoods (-1 when missing)
+        latitude, longitude   float64 (NaN when missing)
+
+    Strings are dictionary-encoded: neighborhoods and categories hold each
+    distinct value once and the columns hold integer codes. Categories are
+    stored as one flat array of codes with category_offsets marking where
+    each restaurant's codes start, so a restaurant can have any number of
+    them.
+
+    The original dictionaries are kept, so rows selected on the arrays are
+    handed back as the same dictionaries they were built from.
+    """
+
+    def __init__(self,
+                 records: List[Dict[str, Any]],
+                 rating: np.ndarray,
+                 reviews: np.ndarray,
+                 price: np.ndarray,
+                 neighborhood: np.ndarray,
+                 neighborhoods: List[str],
+                 category_codes: np.ndarray,
+                 category_offsets: np.ndarray,
+                 categories: List[str],
+                 latitude: np.ndarray,
+                 longitude: np.ndarray):
+        """
+        Initialize the table from its columns; use from_records() to build one from restaurant dictionaries
+        """
+        self.records = records
+        self.rating = rating
+        self.reviews = reviews
+        self.price = price
+        self.neighborhood = neighborhood
+        self.neighborhoods = neighborhoods
+        self.category_codes = category_codes
+        self.category_offsets = category_offsets
+        self.categories = categories
+        self.latitude = latitude
+        self.longitude = longitude
+
+        self._neighborhood_codes = {name: code for code, name in enumerate(neighborhoods)}
+        self._category_codes = {name: code for code, name in enumerate(categories)}
+        self._category_row_cache = None
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "RestaurantTable":
+        """
+        Build a table from restaurant dictionaries
+
+        Args:
+            records: List of restaurant data dictionaries
+
+        Returns:
+            RestaurantTable with one row per restaurant, in the same order
+        """
+        records = list(records)
+        count = len(records)
+
+        rating = np.fromiter((float(r.get("rating") or 0) for r in records), dtype=np.float64, count=count)
+        reviews = np.fromiter((int(r.get("reviews", r.get("reviews_count")) or 0) for r in records),
+                              dtype=np.int64, count=count)
+        price = np.fromiter((len(r["price"]) if isinstance(r.get("price"), str) else 0 for r in records),
+                            dtype=np.int8, count=count)
+
+        neighborhoods = _Dictionary()
+        neighborhood = np.fromiter(
+            (neighborhoods.encode(r["neighborhood"]) if isinstance(r.get("neighborhood"), str) else -1
+             for r in records),
+            dtype=np.int32, count=count
+        )
+
+        categories = _Dictionary()
+        lengths = np.empty(count, dtype=np.int64)
+        codes = []
+        for i, record in enumerate(records):
+            names = category_names(record.get("categories"))
+            lengths[i] = len(names)
+            codes.extend(categories.encode(name) for name in names)
+        category_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=category_offsets[1:])
+
+        coordinates = np.array([_coordinates(r) for r in records], dtype=np.float64).reshape(count, 2)
+
+        return cls(
+            records=records,
+            rating=rating,
+            reviews=reviews,
+            price=price,
+            neighborhood=neighborhood,
+            neighborhoods=neighborhoods.values,
+            category_codes=np.array(codes, dtype=np.int32),
+            category_offsets=category_offsets,
+            categories=categories.values,
+            latitude=coordinates[:, 0].copy(),
+            longitude=coordinates[:, 1].copy()
+        )
+
+    def to_records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Restaurant dictionaries for the table, or for the given row indices in that order
+        """
+        if rows is None:
+            return list(self.records)
+        return [self.records[i] for i in rows.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def restaurant_categories(self, row: int) -> List[str]:
+        """
+        Category names of one row
+        """
+        start, end = self.category_offsets[row], self.category_offsets[row + 1]
+        return [self.categories[code] for code in self.category_codes[start:end].tolist()]
+
+    def category_mask(self, categories: Sequence[str]) -> np.ndarray:
+        """
+        Boolean mask of the rows having any of the given categories
+        """
+        wanted = [self._category_codes[name] for name in categories if name in self._category_codes]
+        mask = np.zeros(len(self), dtype=bool)
+        if not wanted:
+            return mask
+
+        # A lookup table indexed by code is much cheaper than np.isin
+        lookup = np.zeros(len(self.categories), dtype=bool)
+        lookup[wanted] = True
+        mask[self._category_rows()[lookup[self.category_codes]]] = True
+        return mask
+
+    def _category_rows(self) -> np.ndarray:
+        """
+        Row of every entry in category_codes, built on first use
+        """
+        if self._category_row_cache is None:
+            self._category_row_cache = np.repeat(np.arange(len(self), dtype=np.int32),
+                                                 np.diff(self.category_offsets))
+        return self._category_row_cache
+
+    def mask(self,
+             min_rating: float = 0,
+             categories: Optional[Sequence[str]] = None,
+             neighborhood: Optional[str] = None) -> np.ndarray:
+        """
+        Boolean mask of the rows matching the same criteria as filter_restaurants
+
+        Args:
+            min_rating: Minimum rating to include
+            categories: Categories to filter by (any match)
+            neighborhood: Specific neighborhood to filter by
+
+        Returns:
+            Boolean array with one entry per row
+        """
+        mask = self.rating >= min_rating
+
+        if categories:
+            mask &= self.category_mask(categories)
+
+        if neighborhood:
+            code = self._neighborhood_codes.get(neighborhood)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.neighborhood == code
+
+        return mask
+
+    def take(self, rows: np.ndarray) -> "RestaurantTable":
+        """
+        New table holding the given row indices in that order
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.category_offsets[rows]
+        lengths = self.category_offsets[rows + 1] - starts
+
+        category_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=category_offsets[1:])
+        # Position in category_codes of every code kept, one run per row
+        positions = np.repeat(starts - category_offsets[:-1], lengths) + np.arange(category_offsets[-1])
+
+        return RestaurantTable(
+            records=[self.records[i] for i in rows.tolist()],
+            rating=self.rating[rows],
+            reviews=self.reviews[rows],
+            price=self.price[rows],
+            neighborhood=self.neighborhood[rows],
+            neighborhoods=self.neighborhoods,
+            category_codes=self.category_codes[positions],
+            category_offsets=category_offsets,
+            categories=self.categories,
+            latitude=self.latitude[rows],
+            longitude=self.longitude[rows]
+        )
+
+    def filter(self,
+               min_rating: float = 0,
+               categories: Optional[Sequence[str]] = None,
+               neighborhood: Optional[str] = None) -> "RestaurantTable":
+        """
+        New table holding the rows that match; see mask() for the criteria
+        """
+        return self.take(np.flatnonzero(self.mask(min_rating, categories, neighborhood)))
+
+    def top(self,
+            count: int = 5,
+            sort_by: Union[str, Sequence[str]] = "rating",
+            ascending: Union[bool, Sequence[bool]] = False) -> np.ndarray:
+        """
+        Row indices of the first count rows sorted by one or more columns
+
+        Ties keep table order.
+
+        Args:
+            count: Number of rows to return
+            sort_by: Column, or columns in priority order (see SORT_COLUMNS)
+            ascending: Sort direction, for all columns or per column
+
+        Returns:
+            Array of row indices, best first
+        """
+        keys, directions = sort_keys(sort_by, ascending)
+        for key in keys:
+            if key not in SORT_COLUMNS:
+                raise KeyError(key)
+
+        return top_indices([getattr(self, SORT_COLUMNS[key]) for key in keys], count, directions)
+
+    def reviews_distribution(self) -> Dict[str, Any]:
+        """
+        Summary statistics of ratings and review counts
+
+        Returns:
+            Dictionary in the shape returned by analyze_reviews_distribution
+        """
+        total = len(self)
+        if not total:
+            return {
+                "total_restaurants": 0,
+                "average_rating": 0,
+                "average_reviews": 0,
+                "max_reviews": 0,
+                "min_reviews": 0,
+                "rating_distribution": {label: 0 for label, _ in RATING_RANGES}
+            }
+
+        # Band boundaries in ascending order; digitize finds each rating's band in one pass
+        edges = np.array([lower for _, lower in RATING_RANGES[-2::-1]])
+        band_counts = np.bincount(np.digitize(self.rating, edges), minlength=len(RATING_RANGES))
+
+        return {
+            "total_restaurants": total,
+            # Summed sequentially like analyze_reviews_distribution; NumPy's pairwise
+            # sum can differ in the last bit and flip the rounding
+            "average_rating": round(sum(self.rating.tolist()) / total, 2),
+            "average_reviews": round(sum(self.reviews.tolist()) / total, 2),
+            "max_reviews": int(self.reviews.max()),
+            "min_reviews": int(self.reviews.min()),
+            "rating_distribution": {
+                label: int(band_counts[len(RATING_RANGES) - 1 - i])
+                for i, (label, _) in enumerate(RATING_RANGES)
+            }
+        }
@@ -0,0 +1,156 @@
+import gc
+import os
+import glob
+import mmap
+import pickle
+import hashlib
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class SnapshotCache:
+    """
+    Binary snapshots of parsed JSON exports.
+
+    Parsing a large scrape export with json.load dominates the start-up of
+    every analysis. The first time a file is loaded its parsed form is
+    written next to the other caches as a pickle (protocol 5); later loads
+    memory-map that snapshot and unpickle it with the garbage collector
+    paused, which is two to three times faster than parsing the JSON again.
+    Parsed data is also kept in memory, so repeated loads in one process
+    cost nothing.
+
+    Snapshots are keyed by the source file's real path, size and
+    modification time, so editing or replacing the export invalidates its
+    snapshot. Older snapshots of the same file are deleted when a new one is
+    written.
+    """
+
+    def __init__(self, directory: str = os.path.join(".serpapi_cache", "snapshots"), memoize: bool = True):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Folder holding the snapshot files
+            memoize: Also keep parsed data in memory for this process
+        """
+        self.directory = directory
+        self.memoize = memoize
+        self._memo = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "snapshot_hits": 0, "misses": 0}
+
+    @classmethod
+    def from_env(cls) -> "SnapshotCache":
+        """
+        Build a cache from environment variables
+
+        YELP_SNAPSHOT_DIR overrides the snapshot folder.
+        """
+        return cls(directory=os.getenv("YELP_SNAPSHOT_DIR", os.path.join(".serpapi_cache", "snapshots")))
+
+    @staticmethod
+    def source_key(path: str) -> Tuple[str, int, int]:
+        """
+        Identity of a source file's current contents: (real path, size, mtime in ns)
+        """
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+    def _prefix(self, real_path: str) -> str:
+        return hashlib.sha1(real_path.encode("utf-8")).hexdigest()
+
+    def snapshot_path(self, path: str) -> str:
+        """
+        Snapshot file for the current contents of a source file
+        """
+        real_path, size, mtime_ns = self.source_key(path)
+        return os.path.join(self.directory, f"{self._prefix(real_path)}-{size}-{mtime_ns}.pkl")
+
+    def _read_snapshot(self, snapshot: str) -> Any:
+        # Unpickling allocates millions of small objects; collection passes
+        # over them while they're being built are wasted work
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(snapshot, "rb") as f:
+                # Unpickle straight from the page cache instead of copying the file into memory first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return pickle.loads(mapped)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _write_snapshot(self, snapshot: str, data: Any):
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Snapshots of earlier versions of the file are never valid again
+        prefix = os.path.basename(snapshot).split("-", 1)[0]
+        for stale in glob.glob(os.path.join(self.directory, f"{prefix}-*.pkl")):
+            if stale != snapshot:
+                os.remove(stale)
+
+        temp = f"{snapshot}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            pickle.dump(data, f, protocol=5)
+        os.replace(temp, snapshot)
+
+    def load(self, path: str, parse: Callable[[str], Any]) -> Any:
+        """
+        Load a file's parsed data from memory or its snapshot, parsing it only if neither is valid
+
+        Args:
+            path: Source file
+            parse: Function that parses the source file
+
+        Returns:
+            The parsed data; it is shared with later loads, so don't modify it in place
+        """
+        key = self.source_key(path)
+
+        if self.memoize:
+            with self._lock:
+                if key in self._memo:
+                    self.stats["memory_hits"] += 1
+                    return self._memo[key]
+
+        snapshot = self.snapshot_path(path)
+        data = None
+        if os.path.exists(snapshot):
+            try:
+                data = self._read_snapshot(snapshot)
+                self.stats["snapshot_hits"] += 1
+            except Exception as e:
+                print(f"Ignoring unreadable snapshot {snapshot}: {e}")
+                data = None
+
+        if data is None:
+            self.stats["misses"] += 1
+            data = parse(path)
+            try:
+                self._write_snapshot(snapshot, data)
+            except OSError as e:
+                print(f"Could not write snapshot for {path}: {e}")
+
+        if self.memoize:
+            with self._lock:
+                # Only the current contents of a file are kept in memory
+                self._memo = {other: value for other, value in self._memo.items() if other[0] != key[0]}
+                self._memo[key] = data
+        return data
+
+    def clear(self, path: Optional[str] = None):
+        """
+        Drop the snapshots and in-memory copies of one source file, or of every file
+        """
+        with self._lock:
+            if path is None:
+                self._memo.clear()
+                pattern = "*.pkl"
+            else:
+                real_path = os.path.realpath(path)
+                self._memo = {key: value for key, value in self._memo.items() if key[0] != real_path}
+                pattern = f"{self._prefix(real_path)}-*.pkl"
+
+        for snapshot in glob.glob(os.path.join(self.directory, pattern)):
+            os.remove(snapshot)
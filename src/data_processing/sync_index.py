@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Columns that change on every write without the row's content changing
+VOLATILE_COLUMNS = ("id", "created_at", "updated_at", "last_synced_at")
+
+# SQLite limits the number of bound parameters per statement
+_CHUNK_SIZE = 500
+
+
+class SyncIndex:
+    """
+    Local index of the content last synced to each Supabase row.
+
+    Every row written is recorded as a hash of its content, keyed by table
+    and conflict key (place_id for restaurants and details, the review key
+    for reviews). Before a write, diff() drops the rows whose hash matches
+    the recorded one, so a rerun only sends what changed since the last
+    sync. Hashes are recorded with mark() only after a write succeeds.
+
+    The index can also hold each row's database id, so callers that need
+    ids of unchanged rows (reviews reference their restaurant's id) don't
+    have to write the row to learn it.
+
+    The index describes what this machine last wrote. If the database is
+    changed or reset by something else, clear() the index so every row is
+    sent again.
+    """
+
+    def __init__(self, path: str = os.path.join(".serpapi_cache", "sync_index.sqlite")):
+        """
+        Initialize the index
+
+        Args:
+            path: SQLite file holding the hashes
+        """
+        self.path = path
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS synced (
+                    tbl TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    row_id INTEGER,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (tbl, key)
+                ) WITHOUT ROWID
+            """)
+
+        self.stats = {"checked": 0, "unchanged": 0}
+
+    @classmethod
+    def from_env(cls) -> "SyncIndex":
+        """
+        Build an index from environment variables
+
+        SYNC_INDEX_PATH overrides the SQLite file.
+        """
+        return cls(path=os.getenv("SYNC_INDEX_PATH", os.path.join(".serpapi_cache", "sync_index.sqlite")))
+
+    @staticmethod
+    def enabled_by_env() -> bool:
+        """
+        Whether SUPABASE_DIFF_SYNC asks for diff sync
+        """
+        return os.getenv("SUPABASE_DIFF_SYNC", "").lower() in ("1", "true", "yes")
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connections keep the index safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def row_hash(row: Dict, ignore: Sequence[str] = VOLATILE_COLUMNS) -> str:
+        """
+        Stable hash of a row's content
+
+        Keys are sorted, so the hash doesn't depend on the order columns were set in.
+        """
+        content = {column: value for column, value in row.items() if column not in ignore}
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def row_key(row: Dict, key_columns: Sequence[str]) -> str:
+        return "\x1f".join(str(row.get(column, "")) for column in key_columns)
+
+    def _lookup(self, table: str, keys: List[str]) -> Dict[str, Tuple[str, Optional[int]]]:
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(keys), _CHUNK_SIZE):
+                chunk = keys[i:i + _CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for key, row_hash, row_id in conn.execute(
+                        f"SELECT key, hash, row_id FROM synced WHERE tbl = ? AND key IN ({placeholders})",
+                        [table, *chunk]):
+                    found[key] = (row_hash, row_id)
+        return found
+
+    def diff(self,
+             table: str,
+             rows: List[Dict],
+             key_columns: Sequence[str],
+             ignore: Sequence[str] = VOLATILE_COLUMNS) -> Tuple[List[Dict], Dict[str, Optional[int]]]:
+        """
+        Split rows into those that changed since they were last synced and those that didn't
+
+        Args:
+            table: Supabase table
+            rows: Rows about to be written
+            key_columns: Columns identifying a row (the upsert conflict key)
+            ignore: Columns left out of the hash
+
+        Returns:
+            Tuple of (rows to write, {key: row id} for the unchanged rows)
+        """
+        if not rows:
+            return [], {}
+
+        keys = [self.row_key(row, key_columns) for row in rows]
+        synced = self._lookup(table, list(set(keys)))
+
+        changed, unchanged = [], {}
+        for key, row in zip(keys, rows):
+            previous = synced.get(key)
+            if previous and previous[0] == self.row_hash(row, ignore):
+                unchanged[key] = previous[1]
+            else:
+                changed.append(row)
+
+        self.stats["checked"] += len(rows)
+        self.stats["unchanged"] += len(unchanged)
+        return changed, unchanged
+
+    def mark(self,
+             table: str,
+             rows: List[Dict],
+             key_columns: Sequence[str],
+             ids: Optional[Dict[str, int]] = None,
+             ignore: Sequence[str] = VOLATILE_COLUMNS):
+        """
+        Record rows as synced; call only once their write has succeeded
+
+        Args:
+            table: Supabase table
+            rows: Rows that were written
+            key_columns: Columns identifying a row
+            ids: Database id per key, if the caller needs it back from diff()
+            ignore: Columns left out of the hash
+        """
+        if not rows:
+            return
+
+        now = time.time()
+        values = []
+        for row in rows:
+            key = self.row_key(row, key_columns)
+            values.append((table, key, self.row_hash(row, ignore), (ids or {}).get(key), now))
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO synced (tbl, key, hash, row_id, synced_at) VALUES (?, ?, ?, ?, ?)",
+                values
+            )
+
+    def forget(self, table: str, keys: Iterable[str]):
+        """
+        Drop rows from the index so they are written on the next sync
+        """
+        keys = list(keys)
+        with self._connect() as conn:
+            for i in range(0, len(keys), _CHUNK_SIZE):
+                chunk = keys[i:i + _CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                conn.execute(f"DELETE FROM synced WHERE tbl = ? AND key IN ({placeholders})", [table, *chunk])
+
+    def clear(self, table: Optional[str] = None):
+        """
+        Forget every synced row, or every row of one table
+        """
+        with self._connect() as conn:
+            if table is None:
+                conn.execute("DELETE FROM synced")
+            else:
+                conn.execute("DELETE FROM synced WHERE tbl = ?", (table,))
@@ -0,0 +1,147 @@
+import heapq
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+
+def _as_list(value, count: int, name: str) -> list:
+    values = list(value) if isinstance(value, (list, tuple)) else [value] * count
+    if len(values) != count:
+        raise ValueError(f"{name} needs one entry per sort key")
+    return values
+
+
+def sort_keys(sort_by: Union[str, Sequence[str]], ascending: Union[bool, Sequence[bool]] = False):
+    """
+    Normalize sort arguments to a list of keys and a matching list of directions
+
+    Args:
+        sort_by: Field, or fields in priority order
+        ascending: One direction for all keys, or one per key (as in DataFrame.sort_values)
+
+    Returns:
+        Tuple of (keys, ascending flags)
+    """
+    keys = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    if not keys:
+        raise ValueError("sort_by needs at least one key")
+    return keys, _as_list(ascending, len(keys), "ascending")
+
+
+class _Descending:
+    """
+    Wrapper that reverses the ordering of values that can't be negated, like strings
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _record_key(record: Dict[str, Any], keys: List[str], ascending: List[bool]) -> tuple:
+    parts = []
+    for key, asc in zip(keys, ascending):
+        value = record.get(key)
+        if value is None or value != value:
+            # Missing values (and NaN) sort last in either direction
+            parts.append((1, 0))
+        elif asc:
+            parts.append((0, value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            parts.append((0, -value))
+        else:
+            parts.append((0, _Descending(value)))
+    return tuple(parts)
+
+
+def _numeric_columns(records: Sequence[Dict[str, Any]], keys: List[str]) -> Optional[List[np.ndarray]]:
+    """
+    The sort keys as float arrays (missing values as NaN), or None if any key isn't numeric
+    """
+    try:
+        return [np.array([record.get(key) for record in records], dtype=np.float64) for key in keys]
+    except (TypeError, ValueError):
+        return None
+
+
+def top_records(records: Sequence[Dict[str, Any]],
+                count: int,
+                sort_by: Union[str, Sequence[str]] = "rating",
+                ascending: Union[bool, Sequence[bool]] = False) -> List[Dict[str, Any]]:
+    """
+    The first count records in sorted order, without sorting all of them
+
+    Numeric keys are copied into arrays and selected with top_indices().
+    Other keys (names, for instance) go through a heap of the best count
+    records seen so far, which costs O(n log count) rather than a full sort.
+    Either way records that tie on every key keep their input order, and
+    records missing a key sort after those that have it.
+
+    Args:
+        records: List of restaurant data dictionaries
+        count: Number of records to return
+        sort_by: Field, or fields in priority order
+        ascending: Sort direction, for all keys or per key
+
+    Returns:
+        The selected records themselves (not copies), best first
+    """
+    keys, directions = sort_keys(sort_by, ascending)
+    if count <= 0 or not records:
+        return []
+
+    columns = _numeric_columns(records, keys)
+    if columns is not None:
+        return [records[i] for i in top_indices(columns, count, directions).tolist()]
+
+    # heapq.nsmallest breaks ties by input position, which keeps the selection stable
+    return heapq.nsmallest(count, records, key=lambda record: _record_key(record, keys, directions))
+
+
+def top_indices(columns: Sequence[np.ndarray],
+                count: int,
+                ascending: Union[bool, Sequence[bool]] = False) -> np.ndarray:
+    """
+    Row indices of the first count rows sorted by one or more numeric columns
+
+    The first column is partitioned with np.partition to find the cut-off
+    value, so only rows at or above the cut-off are sorted: O(n) plus a sort
+    of the candidates instead of O(n log n). Ties keep row order and NaN
+    sorts last.
+
+    Args:
+        columns: Equal-length numeric arrays, in priority order
+        count: Number of rows to return
+        ascending: Sort direction, for all columns or per column
+
+    Returns:
+        Array of row indices, best first
+    """
+    directions = _as_list(ascending, len(columns), "ascending")
+    # Turn every column into an ascending float key with NaN pushed to the end
+    keys = []
+    for column, asc in zip(columns, directions):
+        key = column.astype(np.float64) if asc else -column.astype(np.float64)
+        keys.append(np.where(np.isnan(key), np.inf, key))
+
+    total = len(keys[0]) if keys else 0
+    count = min(max(count, 0), total)
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+
+    primary = keys[0]
+    if count < total:
+        cutoff = np.partition(primary, count - 1)[count - 1]
+        candidates = np.flatnonzero(primary <= cutoff)
+    else:
+        candidates = np.arange(total)
+
+    # lexsort is stable and treats its last key as the primary one
+    order = np.lexsort([key[candidates] for key in reversed(keys)])
+    return candidates[order[:count]]
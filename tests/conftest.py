@@ -0,0 +1,67 @@
+"""Record and scraper factories shared by the test modules"""
+import json
+import random
+
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+
+CATEGORIES = ["Italian", "Pizza", "Thai", "Sushi Bars", "Coffee & Tea", "Burgers"]
+NEIGHBORHOODS = ["Downtown", "Belltown", "Capitol Hill", "Fremont"]
+TRANSACTIONS = ["delivery", "pickup", "restaurant_reservation"]
+# Few distinct names, so sorts on name have ties to break
+NAMES = ["Alpha", "Bravo", "Charlie", "Delta"]
+
+
+def make_restaurants(count, seed=0):
+    """Random restaurant records shaped like a Yelp export"""
+    rng = random.Random(seed)
+    restaurants = []
+    for i in range(count):
+        categories = rng.sample(CATEGORIES, rng.randint(0, 3))
+        restaurants.append({
+            "id": f"biz_{i}",
+            "place_id": f"place_{i}",
+            "name": rng.choice(NAMES),
+            "rating": rng.choice([2.5, 3.0, 3.5, 4.0, 4.5, 4.8, 5.0]),
+            "reviews": rng.randint(0, 2000),
+            "price": rng.choice(["$", "$$", "$$$", ""]),
+            "neighborhood": rng.choice(NEIGHBORHOODS),
+            # Exports hold categories as lists or as JSON strings
+            "categories": json.dumps(categories) if i % 3 == 0 else categories,
+            "transactions": rng.sample(TRANSACTIONS, rng.randint(0, 2)),
+            "coordinates": {"latitude": 47.6 + i * 1e-4, "longitude": -122.3}
+        })
+    return restaurants
+
+
+def make_restaurant(i, reviews=3, details=True):
+    """One restaurant as the scraper exports it, with its reviews and details"""
+    return {
+        "place_id": f"place_{i}",
+        "name": f"Restaurant {i}",
+        "rating": 4.5,
+        "reviews": 120,
+        "categories": [{"title": "Italian"}],
+        "reviews_data": [
+            {"position": j, "rating": 5, "user": {"user_id": f"user_{i}_{j}", "name": "A"},
+             "comment": {"text": "Great pasta " * 20}}
+            for j in range(reviews)
+        ],
+        "details": {"address": f"{i} Pike St", "hours": {"Mon": "9-5"}} if details else {}
+    }
+
+
+def make_scraper(monkeypatch, tmp_path, supabase=None, scraper_class=YelpSupabaseScraper, **options):
+    """
+    A scraper that never reaches the real API or database
+
+    Its crawl frontier lives in tmp_path; supabase, if given, replaces the
+    (disabled) database client.
+    """
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.setenv("CRAWL_FRONTIER_PATH", str(tmp_path / "crawl_frontier.sqlite"))
+    options.setdefault("cache_mode", "bypass")
+    scraper = scraper_class(**options)
+    if supabase is not None:
+        scraper.supabase = supabase
+    return scraper
@@ -0,0 +1,119 @@
+"""In-memory stand-in for the parts of the Supabase client the scrapers use"""
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.payload = None
+        self.filters = []
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.window = None
+
+    def select(self, *columns, **kwargs):
+        self.action = "select"
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def update(self, values, **kwargs):
+        self.action, self.payload = "update", values
+        return self
+
+    def upsert(self, rows, on_conflict="", ignore_duplicates=False, **kwargs):
+        self.action, self.payload = "upsert", rows
+        self.on_conflict = [column.strip() for column in on_conflict.split(",") if column.strip()]
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def range(self, start, end):
+        self.window = (start, end)
+        return self
+
+    def _matches(self, row):
+        return all(check(row) for check in self.filters)
+
+    def execute(self):
+        self.client.requests.append((self.table, self.action))
+        rows = self.client.tables.setdefault(self.table, [])
+
+        if self.action == "select":
+            data = [dict(row) for row in rows if self._matches(row)]
+            if self.window:
+                data = data[self.window[0]:self.window[1] + 1]
+            return FakeResponse(data)
+
+        if self.action == "update":
+            data = []
+            for row in rows:
+                if self._matches(row):
+                    row.update(self.payload)
+                    data.append(dict(row))
+            return FakeResponse(data)
+
+        if self.action == "delete":
+            data = [dict(row) for row in rows if self._matches(row)]
+            rows[:] = [row for row in rows if not self._matches(row)]
+            return FakeResponse(data)
+
+        payload = self.payload if isinstance(self.payload, list) else [self.payload]
+        data = []
+        for new_row in payload:
+            existing = None
+            if self.action == "upsert":
+                key = self.on_conflict or ["id"]
+                existing = next((row for row in rows if all(row.get(c) == new_row.get(c) for c in key)), None)
+
+            if existing is not None:
+                if self.ignore_duplicates:
+                    continue
+                existing.update(new_row)
+                data.append(dict(existing))
+            else:
+                row = {"id": self.client.next_id(self.table), **new_row}
+                rows.append(row)
+                data.append(dict(row))
+        return FakeResponse(data)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {}
+        self.requests = []
+        self._ids = {}
+
+    def next_id(self, table):
+        self._ids[table] = self._ids.get(table, 0) + 1
+        return self._ids[table]
+
+    @property
+    def postgrest(self):
+        return self
+
+    def schema(self, name):
+        return self
+
+    def table(self, name):
+        return FakeQuery(self, name)
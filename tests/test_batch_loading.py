@@ -0,0 +1,68 @@
+import json
+
+from conftest import make_restaurant
+from fake_supabase import FakeSupabase
+
+from src.data_processing.load_json_to_db import TableBatchWriter, YelpToSupabase
+
+
+def test_whole_file_load_sends_multi_row_requests(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps([make_restaurant(i) for i in range(1000)]))
+    supabase = FakeSupabase()
+
+    assert YelpToSupabase(supabase).load_json_to_supabase(str(path), batch_size=500, max_wait=None)
+
+    assert len(supabase.tables["restaurants"]) == 1000
+    assert len(supabase.tables["reviews"]) == 3000
+    assert len(supabase.tables["restaurant_details"]) == 1000
+    # Previously 5000 requests (one per restaurant, review and details row)
+    assert supabase.requests.count(("reviews", "upsert")) == 6
+    assert len(supabase.requests) < 20
+
+
+def test_insert_reviews_chunks_without_a_batch():
+    supabase = FakeSupabase()
+    loader = YelpToSupabase(supabase)
+
+    assert loader.insert_reviews("place_0", make_restaurant(0, reviews=25)["reviews_data"], batch_size=10)
+
+    assert supabase.requests == [("reviews", "upsert")] * 3
+    assert len(supabase.tables["reviews"]) == 25
+
+
+def test_rows_are_flushed_after_max_wait():
+    supabase = FakeSupabase()
+    writer = TableBatchWriter(supabase, "restaurants", batch_size=100, on_conflict="place_id", max_wait=0)
+
+    writer.add({"place_id": "a"})
+    writer.add({"place_id": "b"})
+
+    # Far from full, but each row was older than max_wait
+    assert supabase.requests == [("restaurants", "upsert")] * 2
+    assert writer.rows == []
+
+
+def test_batch_block_flushes_on_exit():
+    supabase = FakeSupabase()
+    loader = YelpToSupabase(supabase)
+
+    with loader.batch(batch_size=100, max_wait=None):
+        loader.insert_restaurant(make_restaurant(0))
+        loader.insert_reviews("place_0", make_restaurant(0)["reviews_data"])
+        assert supabase.requests == []
+
+    assert supabase.requests == [("restaurants", "upsert"), ("reviews", "upsert")]
+    assert loader._writers is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_whole_file_load_sends_multi_row_requests(Path(tmp))
+    test_insert_reviews_chunks_without_a_batch()
+    test_rows_are_flushed_after_max_wait()
+    test_batch_block_flushes_on_exit()
+    print("All batch loading tests passed.")
@@ -0,0 +1,132 @@
+import json
+
+from conftest import make_scraper
+from fake_supabase import FakeSupabase
+
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.serpapi_standin import SerpAPIStandIn
+from src.api.write_journal import WriteBehindJournal
+
+
+def test_save_restaurants_upserts_in_chunks_and_returns_ids(monkeypatch, tmp_path):
+    scraper = make_scraper(monkeypatch, tmp_path, FakeSupabase())
+    restaurants = [{"place_id": f"place_{i}", "name": f"Restaurant {i}", "reviews_data": []} for i in range(5)]
+
+    ids = scraper.save_restaurants(restaurants, chunk_size=2)
+
+    assert sorted(ids) == [f"place_{i}" for i in range(5)]
+    assert scraper.supabase.requests == [("restaurants", "upsert")] * 3
+    assert "reviews_data" not in scraper.supabase.tables["restaurants"][0]
+
+    # Saving again updates the same rows and keeps their ids
+    restaurants.append(dict(restaurants[0], name="Renamed"))
+    again = scraper.save_restaurants(restaurants)
+
+    assert again == ids
+    assert len(scraper.supabase.tables["restaurants"]) == 5
+    assert scraper.supabase.tables["restaurants"][0]["name"] == "Renamed"
+
+
+def test_save_restaurant_is_a_single_request(monkeypatch, tmp_path):
+    scraper = make_scraper(monkeypatch, tmp_path, FakeSupabase())
+
+    saved = scraper.save_restaurant({"place_id": "abc", "name": "Solo"})
+
+    assert saved["id"] == 1 and saved["name"] == "Solo"
+    assert scraper.supabase.requests == [("restaurants", "upsert")]
+
+
+def test_search_and_save_upserts_each_page_once(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=20, page_size=10, reviews_per_place=2, seed=1)
+    server, backend = standin.start()
+    scraper = make_scraper(monkeypatch, tmp_path, FakeSupabase())
+    scraper.rate_limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+    scraper.backend = backend
+
+    try:
+        restaurants, metadata = scraper.search_and_save("Seattle, WA", max_pages=3, results_per_page=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert metadata["status"] == "completed"
+    assert len(restaurants) == 20
+    assert scraper.supabase.requests.count(("restaurants", "upsert")) == 2
+    assert len(scraper.supabase.tables["reviews"]) == 40
+    # One chunked review upsert per page
+    assert scraper.supabase.requests.count(("reviews", "upsert")) == 2
+    # Page checkpoints are coalesced between the start and the final state
+    assert scraper.supabase.requests.count(("scrape_metadata", "upsert")) == 1
+    assert scraper.supabase.requests.count(("scrape_metadata", "update")) == 1
+
+
+def test_search_and_save_through_write_behind_journal(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=20, page_size=10, reviews_per_place=2, seed=1)
+    server, backend = standin.start()
+    scraper = make_scraper(monkeypatch, tmp_path, FakeSupabase())
+    scraper.rate_limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+    scraper.backend = backend
+    scraper.journal = WriteBehindJournal(scraper.supabase, path=str(tmp_path / "journal.sqlite")).start()
+
+    try:
+        restaurants, metadata = scraper.search_and_save("Seattle, WA", max_pages=3, results_per_page=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+    scraper.close()
+
+    assert metadata["status"] == "completed"
+    assert len(scraper.supabase.tables["restaurants"]) == 20
+    assert len(scraper.supabase.tables["reviews"]) == 40
+    assert len(scraper.supabase.tables["review_sync_state"]) == 20
+
+
+def test_search_and_save_persists_fetched_details(monkeypatch, tmp_path):
+    for journaled in (False, True):
+        standin = SerpAPIStandIn(total_results=20, page_size=10, reviews_per_place=2, seed=1)
+        server, backend = standin.start()
+        scraper = make_scraper(monkeypatch, tmp_path / str(journaled), FakeSupabase())
+        scraper.rate_limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+        scraper.backend = backend
+        if journaled:
+            scraper.journal = WriteBehindJournal(scraper.supabase, path=str(tmp_path / "journal.sqlite")).start()
+
+        try:
+            restaurants, metadata = scraper.search_and_save("Seattle, WA", max_pages=3, results_per_page=10,
+                                                            fetch_details=True)
+        finally:
+            server.shutdown()
+            server.server_close()
+        scraper.close()
+
+        assert metadata["status"] == "completed"
+        details = {row["place_id"]: row for row in scraper.supabase.tables["restaurant_details"]}
+        assert sorted(details) == sorted(r["place_id"] for r in restaurants)
+        assert all(details[r["place_id"]]["address"] == r["details"]["address"] for r in restaurants)
+        if not journaled:
+            # One details upsert per page, like reviews
+            assert scraper.supabase.requests.count(("restaurant_details", "upsert")) == 2
+
+
+def test_json_loader_updates_reviews_the_scraper_wrote(monkeypatch, tmp_path):
+    from src.data_processing.load_json_to_db import YelpToSupabase
+
+    standin = SerpAPIStandIn(total_results=10, page_size=10, reviews_per_place=2, seed=1)
+    server, backend = standin.start()
+    scraper = make_scraper(monkeypatch, tmp_path, FakeSupabase())
+    scraper.rate_limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+    scraper.backend = backend
+
+    try:
+        restaurants, _ = scraper.search_and_save("Seattle, WA", max_pages=1, results_per_page=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    export = tmp_path / "export.json"
+    export.write_text(json.dumps(restaurants))
+    assert YelpToSupabase(scraper.supabase).load_json_to_supabase(str(export), max_wait=None)
+
+    # Both writers upsert on the same review_key, so nothing is inserted twice
+    assert len(scraper.supabase.tables["reviews"]) == 20
+    assert all(review["restaurant_id"] for review in scraper.supabase.tables["reviews"])
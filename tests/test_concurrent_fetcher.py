@@ -0,0 +1,119 @@
+import random
+import threading
+import time
+
+from src.api.concurrent_fetcher import ConcurrentFetcher, PagePrefetcher
+
+
+class SlowScraper:
+    """Scraper stand-in that sleeps a random amount per call and tracks concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _call(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(random.uniform(0.001, 0.02))
+        with self.lock:
+            self.in_flight -= 1
+
+    def get_reviews(self, place_id, max_reviews=10):
+        self._call()
+        if place_id == "broken":
+            raise Exception("API Error: boom")
+        return [{"place_id": place_id}]
+
+    def get_business_details(self, place_id, location):
+        self._call()
+        return {"place_id": place_id, "location": location}
+
+
+def test_fetch_page_keeps_page_order():
+    scraper = SlowScraper()
+    fetcher = ConcurrentFetcher(scraper, max_concurrency=3)
+    restaurants = [{"place_id": f"place_{i}"} for i in range(12)]
+
+    results = fetcher.fetch_page(restaurants, "Seattle, WA", fetch_details=True)
+
+    assert [r["reviews"][0]["place_id"] for r in results] == [f"place_{i}" for i in range(12)]
+    assert [r["details"]["place_id"] for r in results] == [f"place_{i}" for i in range(12)]
+    assert scraper.max_in_flight <= 3
+
+
+def test_fetch_page_reports_errors_per_restaurant():
+    fetcher = ConcurrentFetcher(SlowScraper(), max_concurrency=2)
+    restaurants = [{"place_id": "ok"}, {"place_id": "broken"}]
+
+    results = fetcher.fetch_page(restaurants, "Seattle, WA")
+
+    assert results[0]["reviews"] == [{"place_id": "ok"}]
+    assert results[1]["reviews"] == []
+    assert "reviews" in results[1]["errors"]
+
+
+def test_prefetcher_yields_pages_in_order_and_stops_at_last_page():
+    fetched = []
+
+    def fetch_page(page_num):
+        fetched.append(page_num)
+        return {"organic_results": [page_num] * (10 if page_num < 3 else 4)}
+
+    prefetcher = PagePrefetcher(
+        fetch_page,
+        range(0, 10),
+        is_last_page=lambda results: len(results["organic_results"]) < 10,
+        lookahead=2
+    )
+    pages = [page_num for page_num, _ in prefetcher]
+    prefetcher.close()
+
+    assert pages == [0, 1, 2, 3]
+    assert fetched == [0, 1, 2, 3]
+
+
+def test_prefetcher_overlaps_fetching_with_processing():
+    def fetch_page(page_num):
+        time.sleep(0.05)
+        return {"page": page_num}
+
+    start = time.time()
+    prefetcher = PagePrefetcher(fetch_page, range(5), lookahead=1)
+    for _ in prefetcher:
+        time.sleep(0.05)
+    prefetcher.close()
+
+    # Sequential would take ~0.5s; pipelined is bound by the slower stage
+    assert time.time() - start < 0.4
+
+
+def test_prefetcher_reraises_fetch_errors_and_closes_early():
+    def fetch_page(page_num):
+        if page_num == 1:
+            raise Exception("API Error: boom")
+        return {"page": page_num}
+
+    prefetcher = PagePrefetcher(fetch_page, range(5), lookahead=1)
+    seen = []
+    try:
+        for page_num, _ in prefetcher:
+            seen.append(page_num)
+        assert False, "expected the fetch error to be re-raised"
+    except Exception as e:
+        assert "boom" in str(e)
+    finally:
+        prefetcher.close()
+
+    assert seen == [0]
+
+
+if __name__ == "__main__":
+    test_fetch_page_keeps_page_order()
+    test_fetch_page_reports_errors_per_restaurant()
+    test_prefetcher_yields_pages_in_order_and_stops_at_last_page()
+    test_prefetcher_overlaps_fetching_with_processing()
+    test_prefetcher_reraises_fetch_errors_and_closes_early()
+    print("All concurrent fetcher tests passed.")
@@ -0,0 +1,98 @@
+from fake_supabase import FakeSupabase
+
+from src.api.crawl_frontier import CrawlFrontier
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.serpapi_standin import SerpAPIStandIn
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+
+
+def test_claim_returns_each_place_once_per_window(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"))
+
+    assert frontier.claim(["a", "b"], "reviews") == {"a", "b"}
+    assert frontier.claim(["b", "c"], "reviews") == {"c"}
+    # Kinds are tracked separately
+    assert frontier.claim(["a"], "details") == {"a"}
+    assert frontier.is_fresh("a", "reviews")
+
+
+def test_release_and_expiry_make_places_due_again(tmp_path):
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"), freshness={"details": 0})
+    frontier.claim(["a", "b"], "reviews")
+    frontier.claim(["a"], "details")
+
+    frontier.release(["b"], "reviews")
+
+    assert frontier.claim(["a", "b"], "reviews") == {"b"}
+    assert frontier.claim(["a"], "details") == {"a"}
+    assert frontier.prune() == 1
+    assert frontier.stats() == {"reviews": 2}
+
+
+def test_search_and_save_fetches_reviews_once_across_queries(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=10, page_size=10, reviews_per_place=3, seed=1)
+    server, backend = standin.start()
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+
+    scraper = YelpSupabaseScraper(
+        rate_limiter=TokenBucketRateLimiter(requests_per_second=1000, burst=100),
+        cache_mode="bypass",
+        frontier=CrawlFrontier(str(tmp_path / "frontier.sqlite"))
+    )
+    scraper.supabase = FakeSupabase()
+    scraper.backend = backend
+
+    try:
+        first, _ = scraper.search_and_save("Seattle, WA", "Restaurants", max_pages=1, results_per_page=10)
+        requests_after_first = standin.stats["requests"]
+        second, _ = scraper.search_and_save("Seattle, WA", "italian", max_pages=1, results_per_page=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # First query: 1 search + 10 review requests; second query: only the search
+    assert requests_after_first == 11
+    assert standin.stats["requests"] == 12
+    assert all(restaurant["reviews_data"] for restaurant in first)
+    assert len(second) == 10 and not any(restaurant["reviews_data"] for restaurant in second)
+
+
+def test_runs_without_a_database_claim_nothing(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=10, page_size=10, reviews_per_place=3, seed=1)
+    server, backend = standin.start()
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    frontier = CrawlFrontier(str(tmp_path / "frontier.sqlite"))
+
+    scraper = YelpSupabaseScraper(
+        rate_limiter=TokenBucketRateLimiter(requests_per_second=1000, burst=100),
+        cache_mode="bypass",
+        frontier=frontier
+    )
+    scraper.supabase = None
+    scraper.backend = backend
+
+    try:
+        scraper.search_and_save("Seattle, WA", max_pages=1, results_per_page=10)
+        assert frontier.stats() == {}
+
+        # A database run within the freshness window still saves every review
+        scraper.supabase = FakeSupabase()
+        scraper.search_and_save("Seattle, WA", max_pages=1, results_per_page=10)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(scraper.supabase.tables["reviews"]) == 30
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_claim_returns_each_place_once_per_window(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_release_and_expiry_make_places_due_again(Path(tmp))
+    print("All crawl frontier tests passed.")
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from src.api import crawl_orchestrator
+from src.api.crawl_orchestrator import CrawlOrchestrator, expand_work_units, resume_page
+from src.api.serpapi_standin import SerpAPIStandIn
+
+
+def test_expand_work_units_covers_every_combination():
+    spec = {"locations": ["Seattle, WA", "Portland, OR"], "categories": ["italian", "thai"], "prices": ["$", "$$"]}
+
+    units = expand_work_units(spec)
+
+    assert len(units) == 8
+    assert len({(unit["location"], unit["key"]) for unit in units}) == 8
+    assert units[0]["key"] == "Restaurants [category=italian, price=$, sort=recommended]"
+
+
+def test_resume_page_from_checkpoint():
+    assert resume_page(None) == 0
+    assert resume_page({"status": "completed", "last_page": 4}) is None
+    assert resume_page({"status": "processing", "last_page": 2}) == 3
+    assert resume_page({"status": "failed", "last_page": 2}) == 2
+
+
+def test_completed_units_are_crawled_again_once_stale():
+    fresh = {"status": "completed", "last_page": 4, "last_updated": datetime.now().isoformat()}
+    stale = {**fresh, "last_updated": (datetime.now() - timedelta(hours=30)).isoformat()}
+
+    assert resume_page(stale) is None
+    assert resume_page(fresh, max_age_hours=24) is None
+    assert resume_page(stale, max_age_hours=24) == 0
+
+
+def test_failed_units_are_retried_while_others_still_run(monkeypatch):
+    retried = threading.Event()
+    attempts = []
+
+    def fake_run_unit(unit, restart=False, max_age_hours=None):
+        attempts.append(unit["key"])
+        status = "completed"
+        if unit["category"] == "italian":
+            if attempts.count(unit["key"]) == 1:
+                status = "failed"
+            else:
+                retried.set()
+        elif not retried.wait(5):
+            # The slow unit only finishes once the failed one has been retried
+            status = "failed"
+        return {"key": unit["key"], "location": unit["location"], "status": status, "restaurants": 0,
+                "error": None}
+
+    monkeypatch.setattr(crawl_orchestrator, "run_unit", fake_run_unit)
+    monkeypatch.setattr(crawl_orchestrator, "_init_worker", lambda max_concurrency: None)
+    monkeypatch.setattr(crawl_orchestrator, "ProcessPoolExecutor", ThreadPoolExecutor)
+    units = expand_work_units({"locations": ["Seattle, WA"], "categories": ["italian", "thai"]})
+
+    summaries = CrawlOrchestrator(workers=2, max_retries=1, retry_delay=0.1).run(units)
+
+    assert [(summary["status"], summary["attempts"]) for summary in summaries] == [("completed", 2), ("completed", 1)]
+
+
+def test_orchestrator_crawls_units_across_processes(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=30, page_size=10, reviews_per_place=3, seed=1)
+    server, backend = standin.start()
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.setenv("SERPAPI_BACKEND", backend)
+    monkeypatch.setenv("SERPAPI_CACHE_MODE", "bypass")
+    monkeypatch.setenv("SERPAPI_REQUESTS_PER_SECOND", "1000")
+    monkeypatch.setenv("SERPAPI_BURST", "100")
+    monkeypatch.setenv("SERPAPI_RATE_LIMIT_FILE", str(tmp_path / "rate_limit.json"))
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.setenv("CRAWL_FRONTIER_PATH", str(tmp_path / "crawl_frontier.sqlite"))
+
+    units = expand_work_units({
+        "locations": ["Seattle, WA"],
+        "categories": ["italian", "thai"],
+        "max_pages": 5,
+        "results_per_page": 10,
+        "max_reviews": 3
+    })
+
+    try:
+        summaries = CrawlOrchestrator(workers=2, max_concurrency=2, retry_delay=0).run(units)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [summary["status"] for summary in summaries] == ["completed", "completed"]
+    assert [summary["restaurants"] for summary in summaries] == [30, 30]
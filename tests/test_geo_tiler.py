@@ -0,0 +1,102 @@
+import random
+
+from src.api.geo_tiler import GeoTiler, parse_bounds, split_tile
+
+
+class MapScraper:
+    """Scraper stand-in searching a fixed set of points with a result cap"""
+
+    def __init__(self, points, cap, report_totals, checkpoints=None):
+        self.points = points
+        self.cap = cap
+        self.report_totals = report_totals
+        self.pages = 0
+        self.crawled = []
+        # scrape_metadata rows by checkpoint key; None means no database
+        self.checkpoints = checkpoints
+        self.supabase = checkpoints is not None
+
+    def get_scrape_metadata(self, location, query):
+        return self.checkpoints.get(query)
+
+    def _in_bounds(self, bounds):
+        west, south, east, north = parse_bounds(bounds)
+        return [p for p in self.points if west <= p["lon"] < east and south <= p["lat"] < north]
+
+    def fetch_search_page(self, location, query, page_num, results_per_page=20, **search_params):
+        self.pages += 1
+        matches = self._in_bounds(search_params["bounds"])[:self.cap]
+        start = page_num * results_per_page
+        results = {"organic_results": matches[start:start + results_per_page]}
+        if start + results_per_page < len(matches):
+            results["serpapi_pagination"] = {"next": f"/search?start={start + results_per_page}"}
+        if self.report_totals:
+            results["search_information"] = {"total_results": len(self._in_bounds(search_params["bounds"]))}
+        return results
+
+    def search_and_save(self, location, query, start_page=0, max_pages=5, results_per_page=20, **kwargs):
+        self.crawled.append((kwargs["bounds"], start_page))
+        matches = self._in_bounds(kwargs["bounds"])[:self.cap][start_page * results_per_page:]
+        pages = min(max_pages, len(matches) // results_per_page + 1)
+        self.pages += pages
+        return [dict(p) for p in matches], {"status": "completed", "last_page": start_page + pages - 1}
+
+
+def make_points(count):
+    rng = random.Random(7)
+    # A dense downtown cluster plus sparse outskirts
+    points = [{"lon": rng.uniform(0.4, 0.5), "lat": rng.uniform(0.4, 0.5)} for _ in range(count // 2)]
+    points += [{"lon": rng.uniform(0, 1), "lat": rng.uniform(0, 1)} for _ in range(count - count // 2)]
+    for i, point in enumerate(points):
+        point["place_id"] = f"place_{i}"
+    return points
+
+
+def test_split_tile_covers_parent():
+    quadrants = split_tile((0.0, 0.0, 1.0, 2.0))
+
+    assert sorted(quadrants) == sorted([(0.0, 1.0, 0.5, 2.0), (0.5, 1.0, 1.0, 2.0),
+                                        (0.0, 0.0, 0.5, 1.0), (0.5, 0.0, 1.0, 1.0)])
+
+
+def test_crawl_covers_every_point_beyond_the_cap():
+    for report_totals in (True, False):
+        scraper = MapScraper(make_points(400), cap=50, report_totals=report_totals)
+        tiler = GeoTiler(scraper, result_cap=50, results_per_page=10, min_tile_degrees=0.001)
+
+        restaurants, stats = tiler.crawl("Test City", (0.0, 0.0, 1.0, 1.0))
+
+        assert len(restaurants) == 400
+        assert len({r["place_id"] for r in restaurants}) == 400
+        assert stats["split_tiles"] > 0 and stats["truncated_tiles"] == 0
+        # Dense tiles are split from their probe pages and never crawled themselves
+        assert all(len(scraper._in_bounds(bounds)) < 50 for bounds, _ in scraper.crawled)
+
+
+def test_crawl_resumes_tiles_from_their_checkpoints():
+    points = make_points(100)
+    bbox = (0.0, 0.0, 1.0, 1.0)
+    key = "Restaurants [tile=g:0.00000,0.00000,1.00000,1.00000]"
+
+    scraper = MapScraper(points, cap=500, report_totals=False,
+                         checkpoints={key: {"status": "processing", "last_page": 3}})
+    restaurants, stats = GeoTiler(scraper, result_cap=500, results_per_page=10).crawl("Test City", bbox)
+
+    # Pages 0-3 were saved by the interrupted run; the tile isn't probed again
+    assert scraper.crawled == [("g:0.00000,0.00000,1.00000,1.00000", 4)]
+    assert len(restaurants) == 60
+
+    scraper.checkpoints[key] = {"status": "completed", "last_page": 9}
+    restaurants, stats = GeoTiler(scraper, result_cap=500, results_per_page=10).crawl("Test City", bbox)
+    assert restaurants == [] and stats["skipped_tiles"] == 1
+
+    restaurants, stats = GeoTiler(scraper, result_cap=500, results_per_page=10).crawl("Test City", bbox,
+                                                                                      restart=True)
+    assert len(restaurants) == 100
+
+
+if __name__ == "__main__":
+    test_split_tile_covers_parent()
+    test_crawl_covers_every_point_beyond_the_cap()
+    test_crawl_resumes_tiles_from_their_checkpoints()
+    print("All geo tiler tests passed.")
@@ -0,0 +1,87 @@
+import json
+import tracemalloc
+
+from conftest import make_restaurant
+from fake_supabase import FakeSupabase
+
+from src.data_processing.load_json_to_db import YelpToSupabase
+
+
+def write_export(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(count):
+            if i:
+                f.write(",")
+            json.dump(make_restaurant(i, details=i % 2 == 0), f)
+        f.write("]")
+
+
+class CountingSupabase(FakeSupabase):
+    """Counts written rows without keeping them"""
+
+    def __init__(self):
+        super().__init__()
+        self.written = {}
+
+    def table(self, name):
+        client = self
+
+        class Query:
+            def upsert(self, rows, **kwargs):
+                client.written[name] = client.written.get(name, 0) + len(rows)
+                return self
+
+            insert = upsert
+
+            def execute(self):
+                return None
+
+        return Query()
+
+
+def test_streaming_load_writes_every_table_in_batches(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 25)
+    supabase = FakeSupabase()
+
+    assert YelpToSupabase(supabase).load_json_to_supabase(str(path), stream=True, batch_size=10)
+
+    assert len(supabase.tables["restaurants"]) == 25
+    assert len(supabase.tables["reviews"]) == 75
+    assert len(supabase.tables["restaurant_details"]) == 13
+    # 8 review and 2 details batches, each flushing the restaurants they refer to first
+    assert supabase.requests.count(("reviews", "upsert")) == 8
+    assert len(supabase.requests) < 25
+    first_review = supabase.requests.index(("reviews", "upsert"))
+    assert ("restaurants", "upsert") in supabase.requests[:first_review]
+    assert json.loads(supabase.tables["reviews"][0]["user_data"])["user_id"] == "user_0_0"
+
+
+def test_streaming_memory_does_not_grow_with_file_size(tmp_path):
+    peaks = []
+    for count in (300, 2400):
+        path = tmp_path / f"export_{count}.json"
+        write_export(path, count)
+        supabase = CountingSupabase()
+
+        tracemalloc.start()
+        YelpToSupabase(supabase).load_json_streaming(str(path), batch_size=100)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        assert supabase.written["reviews"] == count * 3
+
+    # Eight times the input, roughly the same peak
+    assert peaks[1] < peaks[0] * 1.5
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_streaming_load_writes_every_table_in_batches,
+                 test_streaming_memory_does_not_grow_with_file_size):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All JSON streaming tests passed.")
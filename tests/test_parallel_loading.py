@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+
+from fake_supabase import FakeQuery, FakeSupabase
+
+from src.data_processing.load_json_to_db import ParallelTableLoader, YelpToSupabase
+
+
+class CheckedQuery(FakeQuery):
+    def execute(self):
+        client = self.client
+        with client.lock:
+            client.active += 1
+            client.max_active = max(client.max_active, client.active)
+        try:
+            # Simulated round trip, outside the lock so requests overlap
+            time.sleep(client.latency)
+            with client.lock:
+                if self.table in ("reviews", "restaurant_details") and self.action != "select":
+                    written = {row["place_id"] for row in client.tables.get("restaurants", [])}
+                    for row in self.payload:
+                        assert row["place_id"] in written, f"{self.table} row written before its restaurant"
+                return super().execute()
+        finally:
+            with client.lock:
+                client.active -= 1
+
+
+class ThreadSafeSupabase(FakeSupabase):
+    """Checks children are written after their restaurant and tracks request overlap"""
+
+    def __init__(self, latency=0.01, fail_table=None):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.fail_table = fail_table
+        self.active = 0
+        self.max_active = 0
+
+    def table(self, name):
+        if name == self.fail_table:
+            raise Exception("connection reset")
+        return CheckedQuery(self, name)
+
+
+def write_export(path, count, reviews=4):
+    restaurants = [
+        {
+            "place_id": f"place_{i}",
+            "name": f"Restaurant {i}",
+            "reviews_data": [{"position": j, "user": {"user_id": f"user_{i}_{j}"}} for j in range(reviews)],
+            "details": {"address": f"{i} Pike St"} if i % 2 == 0 else {}
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps(restaurants))
+
+
+def test_parallel_load_orders_children_after_parents(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 200)
+    supabase = ThreadSafeSupabase()
+
+    assert YelpToSupabase(supabase).load_json_to_supabase(str(path), batch_size=20, workers=4)
+
+    assert len(supabase.tables["restaurants"]) == 200
+    assert len(supabase.tables["reviews"]) == 800
+    assert len(supabase.tables["restaurant_details"]) == 100
+    # Requests really overlapped
+    assert supabase.max_active > 1
+
+
+def test_children_of_a_failed_restaurant_batch_are_not_written():
+    supabase = ThreadSafeSupabase(latency=0, fail_table="restaurants")
+    loader = ParallelTableLoader(supabase, workers=2, batch_size=10)
+
+    for i in range(15):
+        loader.add({"place_id": f"p{i}"}, [{"place_id": f"p{i}", "user_id": "u"}], {"place_id": f"p{i}"})
+    stats = loader.close()
+
+    assert stats["restaurants"]["rows_failed"] == 15
+    assert stats["reviews"]["rows_failed"] == 15
+    assert stats["restaurant_details"]["rows_failed"] == 15
+    assert "reviews" not in supabase.tables
+
+
+class SlowReviewsSupabase(ThreadSafeSupabase):
+    """Reviews are much slower to write than restaurants"""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        self.reviews_queued = 0
+
+    def table(self, name):
+        if name == "reviews":
+            time.sleep(0.02)
+        return super().table(name)
+
+
+def test_pending_batches_include_their_children():
+    supabase = SlowReviewsSupabase()
+    loader = ParallelTableLoader(supabase, workers=1, batch_size=5, max_pending=2)
+    submit = loader.pools["reviews"].submit
+    peak = []
+
+    def counting_submit(fn, *args):
+        with supabase.lock:
+            supabase.reviews_queued += 1
+            peak.append(supabase.reviews_queued)
+
+        def write():
+            try:
+                return fn(*args)
+            finally:
+                with supabase.lock:
+                    supabase.reviews_queued -= 1
+        return submit(write)
+
+    loader.pools["reviews"].submit = counting_submit
+    for i in range(100):
+        loader.add({"place_id": f"p{i}"}, [{"place_id": f"p{i}", "user_id": "u", "review_key": f"p{i}"}])
+    stats = loader.close()
+
+    assert stats["reviews"]["rows_written"] == 100
+    # Restaurants are quick, but the parser still waits for the slow reviews
+    assert max(peak) <= 2
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_parallel_load_orders_children_after_parents(Path(tmp))
+    test_children_of_a_failed_restaurant_batch_are_not_written()
+    test_pending_batches_include_their_children()
+    print("All parallel loading tests passed.")
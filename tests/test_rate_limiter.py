@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+
+from src.api.rate_limiter import TokenBucketRateLimiter, is_rate_limit_error
+
+
+def test_burst_then_throttle():
+    limiter = TokenBucketRateLimiter(requests_per_second=20, burst=3)
+
+    start = time.time()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.time() - start < 0.05
+
+    # The fourth request has to wait for a token to refill
+    limiter.acquire()
+    assert time.time() - start >= 0.04
+
+
+def test_state_file_is_shared_between_limiters():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, "serpapi_rate_limit.json")
+        first = TokenBucketRateLimiter(requests_per_second=10, burst=2, state_file=state_file)
+        second = TokenBucketRateLimiter(requests_per_second=10, burst=2, state_file=state_file)
+
+        start = time.time()
+        first.acquire()
+        second.acquire()
+        # Both limiters drew from the same bucket, so this one must wait
+        first.acquire()
+        assert time.time() - start >= 0.08
+
+
+def test_backoff_and_recovery():
+    limiter = TokenBucketRateLimiter(requests_per_second=10, burst=1, max_backoff=0.01)
+
+    limiter.report_rate_limited()
+    assert limiter._memory_state["rate"] == 5
+    assert limiter._memory_state["tokens"] == 0
+
+    for _ in range(20):
+        limiter.report_success()
+    assert limiter._memory_state["rate"] == 10
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error("Too Many Requests")
+    assert is_rate_limit_error("You have exceeded the rate limit.")
+    assert not is_rate_limit_error("Invalid API key.")
+
+
+if __name__ == "__main__":
+    test_burst_then_throttle()
+    test_state_file_is_shared_between_limiters()
+    test_backoff_and_recovery()
+    test_is_rate_limit_error()
+    print("All rate limiter tests passed.")
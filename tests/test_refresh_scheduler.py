@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from src.api.refresh_scheduler import RefreshScheduler
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+RESTAURANTS = [
+    {"id": 1, "place_id": "busy", "name": "Busy", "reviews_count": 2000, "updated_at": days_ago(3)},
+    {"id": 2, "place_id": "dormant", "name": "Dormant", "reviews_count": 40, "updated_at": days_ago(3)},
+    {"id": 3, "place_id": "new", "name": "New", "reviews_count": 120, "updated_at": days_ago(1)},
+]
+
+WATERMARKS = {
+    "busy": {"place_id": "busy", "last_review_date": days_ago(3), "last_reviews_count": 1990,
+             "reviews_per_day": 5.0, "last_synced_at": days_ago(3)},
+    "dormant": {"place_id": "dormant", "last_review_date": days_ago(90), "last_reviews_count": 40,
+                "reviews_per_day": 0.0, "last_synced_at": days_ago(3)},
+}
+
+
+def test_plan_prioritizes_busy_restaurants_and_skips_dormant_ones():
+    scheduler = RefreshScheduler(None, daily_budget=100)
+
+    plan = scheduler.plan(restaurants=RESTAURANTS, watermarks=WATERMARKS)
+    planned = {item["restaurant"]["place_id"]: item for item in plan["items"]}
+
+    assert plan["items"][0]["restaurant"]["place_id"] == "busy"
+    assert "dormant" not in planned
+    # 10 pending + ~15 expected from velocity fits in one page
+    assert planned["busy"]["tasks"] == {"reviews": 1}
+    # Never synced: 120 reviews need three pages
+    assert planned["new"]["tasks"] == {"reviews": 3}
+    assert plan["total_cost"] == 4
+
+
+def test_plan_respects_budget_and_adds_details_when_stale():
+    restaurants = [dict(RESTAURANTS[0], updated_at=days_ago(40))]
+    watermarks = {"busy": dict(WATERMARKS["busy"], last_synced_at=days_ago(40))}
+    scheduler = RefreshScheduler(None, daily_budget=3, max_review_pages=5)
+
+    plan = scheduler.plan(restaurants=restaurants, watermarks=watermarks)
+    item = plan["items"][0]
+
+    # 210 expected reviews would need 5 pages; trimmed to fit the budget
+    assert item["tasks"] == {"reviews": 2, "details": 1}
+    assert plan["total_cost"] == 3
+
+
+if __name__ == "__main__":
+    test_plan_prioritizes_busy_restaurants_and_skips_dormant_ones()
+    test_plan_respects_budget_and_adds_details_when_stale()
+    print("All refresh scheduler tests passed.")
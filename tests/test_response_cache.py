@@ -0,0 +1,101 @@
+import tempfile
+import time
+
+import pytest
+
+from conftest import make_scraper
+
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.response_cache import SerpAPIResponseCache, make_cache_key, production_cache_mode
+from src.api.serpapi_standin import SerpAPIStandIn
+from src.api import serpapi_yelp_scraper, serpapi_yelp_scraper2
+
+
+def test_cache_key_ignores_api_key_and_order():
+    first = make_cache_key({"engine": "yelp", "find_loc": "Seattle, WA", "api_key": "secret"})
+    second = make_cache_key({"find_loc": " Seattle, WA ", "engine": "yelp", "api_key": "other"})
+    third = make_cache_key({"engine": "yelp", "find_loc": "Portland, OR"})
+
+    assert first == second
+    assert first != third
+
+
+def test_get_set_and_ttl():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SerpAPIResponseCache(cache_dir=tmp, ttls={"yelp_reviews": -1})
+        search = {"engine": "yelp", "find_loc": "Seattle, WA"}
+        reviews = {"engine": "yelp_reviews", "place_id": "VOPdG8llLPaga9iJxXcMuQ"}
+
+        cache.set(search, {"organic_results": [{"title": "The Pink Door"}]})
+        cache.set(reviews, {"reviews": []})
+
+        assert cache.get(search) == {"organic_results": [{"title": "The Pink Door"}]}
+        # yelp_reviews entries expire immediately with a negative TTL
+        assert cache.get(reviews) is None
+        assert cache.stats()["entries"] == 1
+
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SerpAPIResponseCache(cache_dir=tmp, max_bytes=250)
+        payload = {"data": "x" * 100}
+
+        cache.set({"engine": "yelp", "start": 0}, payload)
+        cache.set({"engine": "yelp", "start": 10}, payload)
+        # Touch the first entry so the second one is least recently used
+        assert cache.get({"engine": "yelp", "start": 0}) == payload
+        cache.set({"engine": "yelp", "start": 20}, payload)
+
+        assert cache.get({"engine": "yelp", "start": 0}) == payload
+        assert cache.get({"engine": "yelp", "start": 10}) is None
+        assert cache.get({"engine": "yelp", "start": 20}) == payload
+
+
+def test_get_ignores_entries_cached_before_a_cutoff():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SerpAPIResponseCache(cache_dir=tmp)
+        search = {"engine": "yelp", "find_loc": "Seattle, WA"}
+        cache.set(search, {"organic_results": []})
+
+        assert cache.get(search, created_after=time.time() + 1) is None
+        # The entry is kept for callers without a cutoff
+        assert cache.get(search) == {"organic_results": []}
+
+
+# Both scraper modules share SerpAPIClient, so the modes mean the same in each
+@pytest.mark.parametrize("scraper_class", [serpapi_yelp_scraper.YelpSerpAPIScraper,
+                                           serpapi_yelp_scraper2.YelpSerpAPIScraper])
+def test_refresh_mode_only_reuses_pages_fetched_in_the_same_run(monkeypatch, tmp_path, scraper_class):
+    standin = SerpAPIStandIn(total_results=20, page_size=10, reviews_per_place=0, seed=1)
+    server, backend = standin.start()
+    monkeypatch.delenv("SERPAPI_CACHE_MODE", raising=False)
+    cache = SerpAPIResponseCache(cache_dir=str(tmp_path / "cache"))
+
+    def start_run():
+        scraper = make_scraper(monkeypatch, tmp_path, scraper_class=scraper_class, cache=cache,
+                               cache_mode=production_cache_mode(),
+                               rate_limiter=TokenBucketRateLimiter(requests_per_second=1000, burst=100))
+        scraper.backend = backend
+        return scraper
+
+    try:
+        # An earlier run (a week ago, for instance) left the page in the cache
+        start_run().search_restaurants("Seattle, WA")
+        assert standin.stats["requests"] == 1
+
+        # A scheduled run fetches it again, then reuses its own copy
+        scraper = start_run()
+        scraper.search_restaurants("Seattle, WA")
+        scraper.search_restaurants("Seattle, WA")
+        assert standin.stats["requests"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_cache_key_ignores_api_key_and_order()
+    test_get_set_and_ttl()
+    test_lru_eviction()
+    test_get_ignores_entries_cached_before_a_cutoff()
+    print("All response cache tests passed.")
@@ -0,0 +1,97 @@
+import pytest
+
+from conftest import make_restaurants
+
+from src.data_processing.restaurant_index import RestaurantIndex, load_transactions
+from src.data_processing.restaurant_table import category_names
+
+
+def scan(restaurants, categories=None, neighborhoods=None, prices=None, transactions=None):
+    return [r for r in restaurants
+            if (categories is None or set(categories) & set(category_names(r["categories"])))
+            and (neighborhoods is None or r["neighborhood"] in neighborhoods)
+            and (prices is None or r["price"] in prices)
+            and (transactions is None or set(transactions) & set(r["transactions"]))]
+
+
+@pytest.mark.parametrize("criteria", [
+    {},
+    {"categories": ["Italian", "Pizza"]},
+    {"categories": ["Thai"], "neighborhoods": ["Fremont", "Belltown"]},
+    {"categories": ["Sushi Bars"], "prices": ["$$"], "transactions": ["delivery"]},
+    {"neighborhoods": ["Downtown"], "prices": ["$", "$$$"], "transactions": ["pickup", "delivery"]},
+    {"categories": ["Unknown"]},
+])
+def test_queries_match_a_full_scan(criteria):
+    restaurants = make_restaurants(300)
+    expected = scan(restaurants, **criteria)
+
+    index = RestaurantIndex.from_records(restaurants)
+    assert index.search(**criteria) == expected
+
+    # Building the index one record at a time gives the same postings
+    incremental = RestaurantIndex()
+    for restaurant in restaurants:
+        incremental.add(restaurant)
+    assert incremental.search(**criteria) == expected
+
+
+def test_updates_and_removals_adjust_postings():
+    restaurants = make_restaurants(50)
+    index = RestaurantIndex.from_records(restaurants)
+
+    moved = dict(restaurants[0], neighborhood="Ballard", categories=["Vegan"])
+    assert index.add(moved) == 0
+    assert index.search(neighborhoods=["Ballard"]) == [moved]
+    old_categories = category_names(restaurants[0]["categories"])
+    assert all(restaurant is not moved for restaurant in index.search(categories=old_categories))
+
+    index.remove(index.row_of("biz_1"))
+    assert len(index) == 49
+    assert restaurants[1] not in index.search()
+    with pytest.raises(KeyError):
+        index.update(1, restaurants[1])
+
+    added = dict(restaurants[1], id="biz_new")
+    assert index.add(added) == 50
+    assert index.search(neighborhoods=[added["neighborhood"]])[-1] is added
+
+    # Values nobody has any more disappear from the index
+    index.remove(0)
+    assert "Ballard" not in index.values("neighborhood")
+
+
+def test_transactions_come_from_the_csv_by_business_id():
+    transactions = load_transactions()
+    assert transactions["UzL8_jvtznfsFDprG-O1UA"] >= {"delivery", "pickup"}
+
+    index = RestaurantIndex.from_records([{"id": "UzL8_jvtznfsFDprG-O1UA", "name": "From CSV"},
+                                          {"id": "unknown", "name": "Not listed"}], transactions)
+    assert [r["name"] for r in index.search(transactions=["pickup"])] == ["From CSV"]
+
+    index.set_transactions("unknown", ["Pickup"])
+    assert [r["name"] for r in index.search(transactions=["pickup"])] == ["From CSV", "Not listed"]
+
+
+def test_filter_restaurants_uses_the_index():
+    pytest.importorskip("openai")
+    from src.data_processing.process_yelp_api_data import filter_restaurants
+
+    restaurants = make_restaurants(200)
+    # The record scan only matches categories given as plain names
+    for restaurant in restaurants:
+        restaurant["categories"] = category_names(restaurant["categories"])
+    index = RestaurantIndex.from_records(restaurants)
+
+    assert filter_restaurants(index, min_rating=4.0, categories=["Italian"], neighborhood="Fremont") == \
+        filter_restaurants(restaurants, min_rating=4.0, categories=["Italian"], neighborhood="Fremont")
+    assert filter_restaurants(index, categories=["Pizza"], prices=["$$"], transactions=["delivery"]) == \
+        filter_restaurants(restaurants, categories=["Pizza"], prices=[2], transactions=["delivery"]) == \
+        scan(restaurants, categories=["Pizza"], prices=["$$"], transactions=["delivery"])
+
+
+if __name__ == "__main__":
+    test_queries_match_a_full_scan({"categories": ["Thai"], "neighborhoods": ["Fremont", "Belltown"]})
+    test_updates_and_removals_adjust_postings()
+    test_transactions_come_from_the_csv_by_business_id()
+    print("All restaurant index tests passed.")
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from conftest import make_restaurants
+
+from src.data_processing.restaurant_table import RestaurantTable, category_names
+
+
+def reference_filter(restaurants, min_rating=0, categories=None, neighborhood=None):
+    return [
+        r for r in restaurants
+        if r["rating"] >= min_rating
+        and (not categories or any(c in category_names(r["categories"]) for c in categories))
+        and (not neighborhood or r["neighborhood"] == neighborhood)
+    ]
+
+
+def test_columns_are_typed_and_dictionary_encoded():
+    restaurants = [
+        {"name": "A", "rating": 4.5, "reviews": 120, "price": "$$", "neighborhood": "Belltown",
+         "categories": [{"title": "Italian"}, {"title": "Pizza"}], "coordinates": {"latitude": 47.6, "longitude": -122.3}},
+        {"name": "B", "rating": 4.0, "reviews_count": 30, "categories": '["Pizza"]', "neighborhood": "Belltown"},
+        {"name": "C"}
+    ]
+
+    table = RestaurantTable.from_records(restaurants)
+
+    assert table.rating.dtype == np.float64 and table.reviews.dtype == np.int64
+    assert table.reviews.tolist() == [120, 30, 0]
+    assert table.price.tolist() == [2, 0, 0]
+    assert table.neighborhoods == ["Belltown"] and table.neighborhood.tolist() == [0, 0, -1]
+    assert table.categories == ["Italian", "Pizza"]
+    assert [table.restaurant_categories(i) for i in range(3)] == [["Italian", "Pizza"], ["Pizza"], []]
+    assert table.latitude[0] == 47.6 and np.isnan(table.latitude[1])
+    # The original dictionaries come back untouched
+    assert table.to_records() == restaurants
+    assert table.to_records()[0] is restaurants[0]
+
+
+def test_filter_matches_the_record_scan():
+    restaurants = make_restaurants(500)
+    table = RestaurantTable.from_records(restaurants)
+
+    for criteria in ({}, {"min_rating": 4.0}, {"categories": ["Italian", "Thai"]},
+                     {"neighborhood": "Fremont"}, {"neighborhood": "Nowhere"}, {"categories": ["Unknown"]},
+                     {"min_rating": 4.5, "categories": ["Pizza"], "neighborhood": "Downtown"}):
+        filtered = table.filter(**criteria)
+        assert filtered.to_records() == reference_filter(restaurants, **criteria)
+        # Filtering a filtered table keeps its columns consistent
+        assert [filtered.restaurant_categories(i) for i in range(len(filtered))] == \
+            [category_names(r["categories"]) for r in filtered.to_records()]
+
+
+def test_top_sorts_descending_with_ties_in_table_order():
+    restaurants = make_restaurants(300)
+    table = RestaurantTable.from_records(restaurants)
+
+    expected = sorted(range(300), key=lambda i: -restaurants[i]["rating"])[:10]
+    assert table.top(10, "rating").tolist() == expected
+    assert table.to_records(table.top(3, "reviews")) == \
+        sorted(restaurants, key=lambda r: -r["reviews"])[:3]
+
+    with pytest.raises(KeyError):
+        table.top(3, "name")
+
+
+def test_reviews_distribution_matches_the_record_statistics():
+    # 100 of these ratings sum to exactly 392.5 pairwise but not sequentially,
+    # which rounds differently, so the table has to sum like the record path
+    restaurants = make_restaurants(100)
+    ratings = [r["rating"] for r in restaurants]
+    reviews = [r["reviews"] for r in restaurants]
+
+    stats = RestaurantTable.from_records(restaurants).reviews_distribution()
+
+    assert stats["total_restaurants"] == 100
+    assert stats["average_rating"] == round(sum(ratings) / 100, 2) == 3.89
+    assert stats["average_reviews"] == round(sum(reviews) / 100, 2)
+    assert (stats["max_reviews"], stats["min_reviews"]) == (max(reviews), min(reviews))
+    assert stats["rating_distribution"] == {
+        "5-star": sum(1 for r in ratings if r >= 4.75),
+        "4.5-5": sum(1 for r in ratings if 4.5 <= r < 4.75),
+        "4-4.5": sum(1 for r in ratings if 4.0 <= r < 4.5),
+        "3.5-4": sum(1 for r in ratings if 3.5 <= r < 4.0),
+        "3-3.5": sum(1 for r in ratings if 3.0 <= r < 3.5),
+        "below-3": sum(1 for r in ratings if r < 3.0)
+    }
+    assert RestaurantTable.from_records([]).reviews_distribution()["total_restaurants"] == 0
+
+
+def test_large_table_filters_match_the_record_filter():
+    restaurants = make_restaurants(20000)
+    table = RestaurantTable.from_records(restaurants)
+
+    filtered = table.filter(min_rating=4.0, categories=["Italian", "Pizza"], neighborhood="Belltown")
+
+    assert 0 < len(filtered) < len(table)
+    assert filtered.to_records() == reference_filter(restaurants, min_rating=4.0, categories=["Italian", "Pizza"],
+                                                     neighborhood="Belltown")
+
+
+def test_processing_functions_accept_a_table():
+    pytest.importorskip("openai")
+    from src.data_processing import process_yelp_api_data
+
+    restaurants = make_restaurants(100)
+    table = RestaurantTable.from_records(restaurants)
+
+    assert process_yelp_api_data.filter_restaurants(table, min_rating=4.0, categories=["Thai"]) == \
+        process_yelp_api_data.filter_restaurants(restaurants, min_rating=4.0, categories=["Thai"])
+    assert process_yelp_api_data.filter_restaurants(table, categories=["Thai"], prices=["$$"]) == \
+        process_yelp_api_data.filter_restaurants(restaurants, categories=["Thai"], prices=["$$"])
+    assert process_yelp_api_data.analyze_reviews_distribution(table) == \
+        process_yelp_api_data.analyze_reviews_distribution(restaurants)
+    assert [r["rating"] for r in process_yelp_api_data.get_top_restaurants(table, count=5)] == \
+        sorted((r["rating"] for r in restaurants), reverse=True)[:5]
+
+
+if __name__ == "__main__":
+    test_columns_are_typed_and_dictionary_encoded()
+    test_filter_matches_the_record_scan()
+    test_top_sorts_descending_with_ties_in_table_order()
+    test_reviews_distribution_matches_the_record_statistics()
+    test_large_table_filters_match_the_record_filter()
+    print("All restaurant table tests passed.")
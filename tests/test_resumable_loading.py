@@ -0,0 +1,112 @@
+import json
+import os
+
+from fake_supabase import FakeSupabase
+
+from src.data_processing.load_checkpoint import LoadCheckpoint
+from src.data_processing.load_json_to_db import YelpToSupabase, review_key
+
+
+class FailingSupabase(FakeSupabase):
+    """Fails every request after the first `limit`"""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def table(self, name):
+        if len(self.requests) >= self.limit:
+            raise Exception("connection reset")
+        return super().table(name)
+
+
+def write_export(path, count):
+    restaurants = [
+        {
+            "place_id": f"place_{i}",
+            "name": f"Restaurant {i}",
+            "reviews_data": [{"position": j, "user": {"user_id": f"user_{j}"}} for j in range(3)]
+        }
+        for i in range(count)
+    ]
+    path.write_text(json.dumps(restaurants))
+
+
+def test_failed_load_resumes_from_its_checkpoint(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 100)
+    checkpoint = LoadCheckpoint(str(tmp_path / "checkpoints.sqlite"))
+
+    # Dies after a few batches
+    first = FailingSupabase(limit=7)
+    assert not YelpToSupabase(first).load_json_streaming(str(path), batch_size=10, checkpoint=checkpoint)
+    saved = checkpoint.get(str(path))
+    assert 0 < saved["records"] < 100 and not saved["completed"]
+
+    # The rerun skips the committed records and writes the rest once
+    second = FakeSupabase()
+    second.tables = first.tables
+    assert YelpToSupabase(second).load_json_streaming(str(path), batch_size=10, checkpoint=checkpoint)
+    assert len(second.tables["restaurants"]) == 100
+    assert len(second.tables["reviews"]) == 300
+    assert checkpoint.get(str(path)) == {"records": 100, "completed": True}
+    full = FakeSupabase()
+    assert YelpToSupabase(full).load_json_streaming(str(path), batch_size=10)
+    assert len(second.requests) < len(full.requests)
+
+    # A completed file is skipped, a changed one reloaded
+    requests = len(second.requests)
+    assert YelpToSupabase(second).load_json_streaming(str(path), batch_size=10, checkpoint=checkpoint)
+    assert len(second.requests) == requests
+    write_export(path, 100)
+    os.utime(path, ns=(0, 0))
+    assert checkpoint.get(str(path)) is None
+
+
+def test_parallel_load_checkpoints_committed_batches(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 50)
+    checkpoint = LoadCheckpoint(str(tmp_path / "checkpoints.sqlite"))
+    checkpoint.save(str(path), 20)
+    supabase = FakeSupabase()
+
+    assert YelpToSupabase(supabase).load_json_parallel(str(path), workers=3, batch_size=10, checkpoint=checkpoint)
+
+    assert len(supabase.tables["restaurants"]) == 30
+    assert supabase.tables["restaurants"][0]["place_id"] not in ("place_0", "place_19")
+    assert checkpoint.get(str(path)) == {"records": 50, "completed": True}
+
+
+def test_reloading_a_completed_file_is_reported_as_skipped(tmp_path, caplog):
+    path = tmp_path / "export.json"
+    write_export(path, 10)
+    checkpoint = LoadCheckpoint(str(tmp_path / "checkpoints.sqlite"))
+    supabase = FakeSupabase()
+    assert YelpToSupabase(supabase).load_json_streaming(str(path), batch_size=10, checkpoint=checkpoint)
+    requests = len(supabase.requests)
+
+    assert YelpToSupabase(supabase).load_json_streaming(str(path), batch_size=10, checkpoint=checkpoint)
+
+    assert len(supabase.requests) == requests
+    assert any(record.levelname == "WARNING" and "Skipping" in record.getMessage() for record in caplog.records)
+
+
+def test_review_keys_are_deterministic():
+    review = {"user": {"user_id": "u1"}, "position": 3, "comment": {"text": "Great"}}
+    moved = {**review, "position": 1}
+
+    assert review_key("p1", review) == review_key("p1", moved)
+    assert review_key("p1", review) != review_key("p2", review)
+    assert review_key("p1", {"date": "1/1/2024"}) != review_key("p1", {"date": "2/1/2024"})
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_failed_load_resumes_from_its_checkpoint,
+                 test_parallel_load_checkpoints_committed_batches):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_review_keys_are_deterministic()
+    print("All resumable loading tests passed.")
@@ -0,0 +1,66 @@
+from src.api.serpapi_yelp_scraper import YelpSerpAPIScraper
+
+
+def make_review(position, date):
+    return {
+        "position": position,
+        "rating": 5,
+        "date": date,
+        "user": {"name": f"User {position}", "user_id": f"user_{position}"},
+        "comment": {"text": "Great!", "language": "en"}
+    }
+
+
+class PagedScraper(YelpSerpAPIScraper):
+    """Scraper whose yelp_reviews engine serves 120 reviews, one day apart, newest first"""
+
+    def __init__(self):
+        super().__init__(cache_mode="bypass")
+        self.requests = []
+
+    def _search(self, params):
+        self.requests.append(dict(params))
+        start, num = params["start"], params["num"]
+        end = min(start + num, 120)
+        reviews = [make_review(i + 1, f"2025-04-{30 - i // 4:02d}T12:00:00Z") for i in range(start, end)]
+        response = {"reviews": reviews}
+        if end < 120:
+            response["serpapi_pagination"] = {"next": "..."}
+        return response
+
+
+def test_iter_reviews_follows_pages_lazily(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    scraper = PagedScraper()
+
+    stream = scraper.iter_reviews("VOPdG8llLPaga9iJxXcMuQ", page_size=49)
+    first = next(stream)
+    assert first["user"]["user_id"] == "user_1"
+    assert len(scraper.requests) == 1
+
+    remaining = list(stream)
+    assert len(remaining) == 119
+    assert [r["start"] for r in scraper.requests] == [0, 49, 98]
+
+
+def test_iter_reviews_stops_at_count(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    scraper = PagedScraper()
+
+    reviews = scraper.get_reviews("VOPdG8llLPaga9iJxXcMuQ", max_reviews=60)
+
+    assert len(reviews) == 60
+    # The second page only asks for the reviews that are still needed
+    assert [(r["start"], r["num"]) for r in scraper.requests] == [(0, 49), (49, 11)]
+
+
+def test_iter_reviews_stops_at_cutoff_date(monkeypatch):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    scraper = PagedScraper()
+
+    reviews = list(scraper.iter_reviews("VOPdG8llLPaga9iJxXcMuQ", since="2025-04-28"))
+
+    assert len(reviews) == 12
+    assert all(r["date"] >= "2025-04-28" for r in reviews)
+    assert scraper.requests[0]["sortby"] == "date_desc"
+    assert len(scraper.requests) == 1
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from conftest import make_scraper
+
+
+def test_plan_review_sync(monkeypatch, tmp_path):
+    scraper = make_scraper(monkeypatch, tmp_path)
+    restaurants = [
+        {"place_id": "new", "reviews_count": 10},
+        {"place_id": "unchanged", "reviews_count": 7615},
+        {"place_id": "changed", "reviews_count": 5012}
+    ]
+    watermarks = {
+        "unchanged": {"place_id": "unchanged", "last_reviews_count": 7615, "last_review_date": "2025-04-19T23:07:55Z"},
+        "changed": {"place_id": "changed", "last_reviews_count": 5011, "last_review_date": "2025-04-08T14:20:19Z"}
+    }
+
+    plans = scraper.plan_review_sync(restaurants, watermarks)
+
+    assert plans == [{}, None, {"since": "2025-04-08T14:20:19Z"}]
+
+
+def test_build_watermark_keeps_newest_date(monkeypatch, tmp_path):
+    scraper = make_scraper(monkeypatch, tmp_path)
+    restaurant = {"place_id": "VOPdG8llLPaga9iJxXcMuQ", "reviews_count": 7616}
+    previous = {"last_review_date": "2025-04-19T23:07:55Z", "last_reviews_count": 7615}
+
+    newer = scraper.build_watermark(restaurant, [{"date": "2025-05-01T08:00:00Z"}, {"date": "2025-04-20T10:00:00Z"}], previous)
+    unchanged = scraper.build_watermark(restaurant, [], previous)
+
+    assert newer == {
+        "place_id": "VOPdG8llLPaga9iJxXcMuQ",
+        "last_review_date": "2025-05-01T08:00:00Z",
+        "last_reviews_count": 7616,
+        "reviews_per_day": None
+    }
+    assert unchanged["last_review_date"] == "2025-04-19T23:07:55Z"
+
+
+def test_build_watermark_tracks_review_velocity(monkeypatch, tmp_path):
+    scraper = make_scraper(monkeypatch, tmp_path)
+    restaurant = {"place_id": "VOPdG8llLPaga9iJxXcMuQ", "reviews_count": 7625}
+    two_days_ago = (datetime.now() - timedelta(days=2)).isoformat()
+    previous = {"last_reviews_count": 7615, "last_synced_at": two_days_ago, "reviews_per_day": 3.0}
+
+    watermark = scraper.build_watermark(restaurant, [], previous)
+
+    # 10 new reviews over 2 days, averaged with the previous rate of 3/day
+    assert abs(watermark["reviews_per_day"] - 4.0) < 0.01
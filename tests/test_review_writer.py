@@ -0,0 +1,51 @@
+from fake_supabase import FakeSupabase
+
+from src.api.review_writer import BulkReviewWriter
+
+
+def review_row(restaurant_id, user_id, text="Great"):
+    return {"restaurant_id": restaurant_id, "review_key": f"{restaurant_id}:{user_id}", "user_id": user_id,
+            "comment_text": text}
+
+
+def test_writer_flushes_full_chunks_and_dedups():
+    supabase = FakeSupabase()
+    writer = BulkReviewWriter(supabase, chunk_size=3, verbose=False)
+
+    writer.add(review_row(1, "a"))
+    writer.add(review_row(1, "a", "Updated"))
+    writer.add(review_row(1, "b"))
+    assert supabase.requests == []
+
+    flushed = writer.add(review_row(2, "a"))
+    assert flushed["rows"] == 3 and flushed["requests"] == 1
+    assert len(writer) == 0
+
+    # The same review written again updates the stored row
+    writer.add(review_row(1, "b", "Changed"))
+    writer.flush()
+
+    rows = supabase.tables["reviews"]
+    assert len(rows) == 3
+    assert {row["comment_text"] for row in rows} == {"Updated", "Changed", "Great"}
+    assert writer.stats["flushes"] == 2 and writer.stats["rows"] == 4
+
+
+def test_writer_records_failed_restaurants():
+    class FailingSupabase(FakeSupabase):
+        def table(self, name):
+            raise Exception("connection reset")
+
+    writer = BulkReviewWriter(FailingSupabase(), chunk_size=10, verbose=False)
+    writer.add_many([review_row(1, "a"), review_row(2, "b")])
+
+    result = writer.flush()
+
+    assert result["failed_rows"] == 2
+    assert writer.failed_restaurant_ids == {1, 2}
+
+
+if __name__ == "__main__":
+    test_writer_flushes_full_chunks_and_dedups()
+    test_writer_records_failed_restaurants()
+    print("All review writer tests passed.")
@@ -0,0 +1,51 @@
+from fake_supabase import FakeSupabase
+
+from src.api import scrape_metadata
+from src.api.scrape_metadata import ScrapeMetadataTracker
+
+
+def test_tracker_coalesces_intermediate_states():
+    supabase = FakeSupabase()
+    tracker = ScrapeMetadataTracker(supabase, "Seattle, WA", "Restaurants", min_interval=60)
+
+    tracker.update(page=0, status="in_progress")
+    for page in range(5):
+        tracker.update(page=page, status="processing_page", total_count=page * 10)
+        tracker.update(page=page, status="processing", total_count=(page + 1) * 10)
+    final = tracker.update(page=4, status="completed", total_count=50)
+
+    # First write upserts, the final state updates the cached row id
+    assert supabase.requests == [("scrape_metadata", "upsert"), ("scrape_metadata", "update")]
+    assert final["id"] == tracker.row_id
+    rows = supabase.tables["scrape_metadata"]
+    assert len(rows) == 1 and rows[0]["status"] == "completed" and rows[0]["total_count"] == 50
+
+
+def test_pending_checkpoint_is_flushed_at_exit():
+    supabase = FakeSupabase()
+    tracker = ScrapeMetadataTracker(supabase, "Seattle, WA", "Restaurants", min_interval=60)
+    tracker.update(page=0, status="in_progress")
+    tracker.update(page=3, status="processing", total_count=40)
+
+    scrape_metadata._flush_open_trackers()
+
+    assert supabase.tables["scrape_metadata"][0]["last_page"] == 3
+    assert len(supabase.requests) == 2
+
+
+def test_tracker_reuses_existing_row():
+    supabase = FakeSupabase()
+    supabase.tables["scrape_metadata"] = [{"id": 7, "location": "Seattle, WA", "query": "Restaurants", "status": "failed"}]
+    tracker = ScrapeMetadataTracker(supabase, "Seattle, WA", "Restaurants")
+
+    tracker.update(page=1, status="completed")
+
+    assert tracker.row_id == 7
+    assert len(supabase.tables["scrape_metadata"]) == 1
+
+
+if __name__ == "__main__":
+    test_tracker_coalesces_intermediate_states()
+    test_pending_checkpoint_is_flushed_at_exit()
+    test_tracker_reuses_existing_row()
+    print("All scrape metadata tests passed.")
@@ -0,0 +1,73 @@
+import os
+
+from src.api.benchmark_scraper import run_benchmark
+from src.api.rate_limiter import TokenBucketRateLimiter, rate_limited_search
+from src.api.serpapi_standin import SerpAPIStandIn
+
+
+def test_standin_serves_paginated_search_and_reviews():
+    standin = SerpAPIStandIn(total_results=25, page_size=10, reviews_per_place=15, seed=1)
+    server, backend = standin.start()
+    limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+
+    try:
+        last_page = rate_limited_search(
+            {"engine": "yelp", "find_loc": "Seattle, WA", "start": 20, "api_key": "x"},
+            limiter, backend=backend
+        )
+        assert len(last_page["organic_results"]) == 5
+        assert "serpapi_pagination" not in last_page
+
+        # Search pages honour num the way review pages do
+        short_page = rate_limited_search(
+            {"engine": "yelp", "find_loc": "Seattle, WA", "start": 0, "num": 4, "api_key": "x"},
+            limiter, backend=backend
+        )
+        assert short_page["serpapi_pagination"]["next"].endswith("start=4")
+        assert len(short_page["organic_results"]) == 4
+
+        place_id = last_page["organic_results"][0]["place_id"]
+        reviews = rate_limited_search(
+            {"engine": "yelp_reviews", "place_id": place_id, "start": 10, "api_key": "x"},
+            limiter, backend=backend
+        )
+        assert [review["position"] for review in reviews["reviews"]] == list(range(11, 16))
+
+        details = rate_limited_search(
+            {"engine": "yelp", "place_id": place_id, "find_loc": "Seattle, WA", "api_key": "x"},
+            limiter, backend=backend
+        )
+        assert details["organic_results"][0]["place_id"] == place_id
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert standin.stats["requests"] == 4
+
+
+def test_standin_injects_errors():
+    standin = SerpAPIStandIn(error_rate=1.0, seed=1)
+
+    assert "error" in standin.respond({"engine": "yelp", "find_loc": "Seattle, WA"})
+    assert standin.stats["errors"] == 1
+
+
+def test_benchmark_never_opens_the_database(monkeypatch, tmp_path):
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_API_KEY", "key")
+    monkeypatch.setenv("SUPABASE_DIFF_SYNC", "1")
+    monkeypatch.setenv("SYNC_INDEX_PATH", str(tmp_path / "sync_index.sqlite"))
+
+    result = run_benchmark(pages=2, total_results=20, reviews_per_place=2, seed=1)
+
+    assert result["status"] == "completed"
+    assert result["restaurants"] == 20
+    assert not (tmp_path / "sync_index.sqlite").exists()
+    # The settings are restored once the scraper is built
+    assert os.environ["SUPABASE_URL"] == "https://example.supabase.co"
+
+
+if __name__ == "__main__":
+    test_standin_serves_paginated_search_and_reviews()
+    test_standin_injects_errors()
+    print("All SerpAPI stand-in tests passed.")
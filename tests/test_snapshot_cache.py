@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from src.data_processing.snapshot_cache import SnapshotCache
+
+
+def write_export(path, count):
+    restaurants = [{"place_id": f"place_{i}", "name": f"Restaurant {i}", "rating": 4.5,
+                    "categories": ["Italian"], "reviews_data": [{"rating": 5}]} for i in range(count)]
+    path.write_text(json.dumps(restaurants))
+    return restaurants
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        with open(path, "r") as f:
+            return json.load(f)
+
+
+def test_parses_once_then_loads_from_memory_and_snapshot(tmp_path):
+    path = tmp_path / "export.json"
+    restaurants = write_export(path, 50)
+    parse = CountingParser()
+
+    cache = SnapshotCache(str(tmp_path / "snapshots"))
+    assert cache.load(str(path), parse) == restaurants
+    assert cache.load(str(path), parse) == restaurants
+    assert cache.stats["memory_hits"] == 1
+
+    # A new process finds the snapshot on disk
+    fresh = SnapshotCache(str(tmp_path / "snapshots"))
+    assert fresh.load(str(path), parse) == restaurants
+    assert fresh.stats["snapshot_hits"] == 1
+    assert parse.calls == 1
+
+
+def test_changed_source_invalidates_its_snapshot(tmp_path):
+    path = tmp_path / "export.json"
+    write_export(path, 5)
+    parse = CountingParser()
+    cache = SnapshotCache(str(tmp_path / "snapshots"))
+    cache.load(str(path), parse)
+
+    updated = write_export(path, 7)
+    os.utime(path, ns=(1, 1))
+
+    assert cache.load(str(path), parse) == updated
+    assert parse.calls == 2
+    # The snapshot and in-memory copy of the old contents were replaced
+    assert len(os.listdir(tmp_path / "snapshots")) == 1
+    assert list(cache._memo) == [cache.source_key(str(path))]
+
+
+def test_unreadable_snapshot_falls_back_to_parsing(tmp_path):
+    path = tmp_path / "export.json"
+    restaurants = write_export(path, 3)
+    cache = SnapshotCache(str(tmp_path / "snapshots"), memoize=False)
+    cache.load(str(path), CountingParser())
+
+    with open(cache.snapshot_path(str(path)), "wb") as f:
+        f.write(b"not a pickle")
+
+    assert cache.load(str(path), CountingParser()) == restaurants
+
+
+def test_load_json_uses_the_snapshot_cache(monkeypatch, tmp_path):
+    pytest.importorskip("openai")
+    from src.data_processing import process_yelp_api_data
+
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps({"restaurants": [{"name": "Pink Door"}]}))
+    monkeypatch.setattr(process_yelp_api_data, "snapshot_cache", SnapshotCache(str(tmp_path / "snapshots")))
+
+    assert process_yelp_api_data.load_json(str(path)) == [{"name": "Pink Door"}]
+    assert process_yelp_api_data.load_json(str(path)) == [{"name": "Pink Door"}]
+    assert process_yelp_api_data.snapshot_cache.stats == {"memory_hits": 1, "snapshot_hits": 0, "misses": 1}
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_parses_once_then_loads_from_memory_and_snapshot,
+                 test_changed_source_invalidates_its_snapshot,
+                 test_unreadable_snapshot_falls_back_to_parsing):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All snapshot cache tests passed.")
@@ -0,0 +1,125 @@
+import json
+
+from fake_supabase import FakeSupabase
+
+from src.api.rate_limiter import TokenBucketRateLimiter
+from src.api.review_writer import BulkReviewWriter
+from src.api.serpapi_standin import SerpAPIStandIn
+from src.api.serpapi_yelp_scraper2 import YelpSupabaseScraper
+from src.data_processing.load_json_to_db import YelpToSupabase
+from src.data_processing.sync_index import SyncIndex
+
+
+def test_diff_skips_rows_whose_content_is_unchanged(tmp_path):
+    index = SyncIndex(str(tmp_path / "sync_index.sqlite"))
+    rows = [{"place_id": "a", "name": "A"}, {"place_id": "b", "name": "B"}]
+
+    changed, unchanged = index.diff("restaurants", rows, ["place_id"])
+    assert changed == rows and unchanged == {}
+    index.mark("restaurants", rows, ["place_id"], ids={"a": 1, "b": 2})
+
+    # Timestamps and column order don't count as changes
+    again = [{"name": "A", "place_id": "a", "updated_at": "later"}, {"place_id": "b", "name": "B2"}]
+    changed, unchanged = index.diff("restaurants", again, ["place_id"])
+    assert changed == [again[1]]
+    assert unchanged == {"a": 1}
+
+    index.clear("restaurants")
+    assert len(index.diff("restaurants", rows, ["place_id"])[0]) == 2
+
+
+def test_reloading_a_file_only_sends_changed_rows(tmp_path):
+    path = tmp_path / "export.json"
+    restaurants = [
+        {"place_id": f"place_{i}", "name": f"Restaurant {i}",
+         "reviews_data": [{"user": {"user_id": f"user_{j}"}, "rating": 4} for j in range(3)]}
+        for i in range(20)
+    ]
+    path.write_text(json.dumps(restaurants))
+    index = SyncIndex(str(tmp_path / "sync_index.sqlite"))
+
+    first = FakeSupabase()
+    assert YelpToSupabase(first, sync_index=index).load_json_streaming(str(path), batch_size=50)
+
+    second = FakeSupabase()
+    assert YelpToSupabase(second, sync_index=index).load_json_streaming(str(path), batch_size=50)
+    assert second.requests == []
+
+    restaurants[3]["name"] = "Renamed"
+    restaurants[7]["reviews_data"][0]["rating"] = 1
+    path.write_text(json.dumps(restaurants))
+    third = FakeSupabase()
+    assert YelpToSupabase(third, sync_index=index).load_json_streaming(str(path), batch_size=50)
+    assert [row["place_id"] for row in third.tables["restaurants"]] == ["place_3"]
+    assert len(third.tables["reviews"]) == 1
+
+
+def test_review_writer_skips_unchanged_reviews(tmp_path):
+    supabase = FakeSupabase()
+    index = SyncIndex(str(tmp_path / "sync_index.sqlite"))
+    rows = [{"restaurant_id": 1, "review_key": f"k{i}", "user_id": f"u{i}", "rating": 5} for i in range(4)]
+
+    with BulkReviewWriter(supabase, verbose=False, sync_index=index) as writer:
+        writer.add_many([dict(row) for row in rows])
+    with BulkReviewWriter(supabase, verbose=False, sync_index=index) as writer:
+        writer.add_many([dict(row) for row in rows])
+
+    assert supabase.requests == [("reviews", "upsert")]
+    assert writer.stats["unchanged_rows"] == 4
+
+
+def test_second_crawl_writes_nothing_when_nothing_changed(monkeypatch, tmp_path):
+    standin = SerpAPIStandIn(total_results=20, page_size=10, reviews_per_place=2, seed=1)
+    server, backend = standin.start()
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.setenv("CRAWL_FRONTIER_PATH", str(tmp_path / "crawl_frontier.sqlite"))
+    scraper = YelpSupabaseScraper(cache_mode="bypass", sync_index=SyncIndex(str(tmp_path / "sync_index.sqlite")))
+    scraper.supabase = FakeSupabase()
+    scraper.rate_limiter = TokenBucketRateLimiter(requests_per_second=1000, burst=100)
+    scraper.backend = backend
+
+    try:
+        for _ in range(2):
+            scraper.search_and_save("Seattle, WA", max_pages=3, results_per_page=10,
+                                    incremental=False, use_frontier=False)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # The second crawl refetched everything but found nothing new to write
+    assert scraper.supabase.requests.count(("restaurants", "upsert")) == 2
+    assert scraper.supabase.requests.count(("reviews", "upsert")) == 2
+    assert len(scraper.supabase.tables["reviews"]) == 40
+
+
+def test_rows_synced_without_an_id_are_written_again_for_their_id(monkeypatch, tmp_path):
+    monkeypatch.setenv("SERPAPI_API_KEY", "test")
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    index = SyncIndex(str(tmp_path / "sync_index.sqlite"))
+    scraper = YelpSupabaseScraper(cache_mode="bypass", sync_index=index)
+    scraper.supabase = FakeSupabase()
+    restaurant = {"place_id": "place_1", "name": "Pink Door", "rating": 4.5}
+
+    # The JSON loader records what it wrote but not the row ids
+    index.mark("restaurants", [dict(restaurant)], ["place_id"])
+
+    ids = scraper.save_restaurants([dict(restaurant)])
+    assert ids["place_1"] is not None
+    assert scraper.supabase.requests == [("restaurants", "upsert")]
+
+    # Once the id is known, the unchanged row is skipped
+    assert scraper.save_restaurants([dict(restaurant)]) == ids
+    assert scraper.supabase.requests == [("restaurants", "upsert")]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_diff_skips_rows_whose_content_is_unchanged,
+                 test_reloading_a_file_only_sends_changed_rows,
+                 test_review_writer_skips_unchanged_reviews):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All sync index tests passed.")
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from conftest import make_restaurants
+
+from src.data_processing.restaurant_table import RestaurantTable
+from src.data_processing.top_k import top_indices, top_records
+
+
+def full_sort(restaurants, keys, ascending):
+    # Python's sort is stable, so sorting by the least significant key first gives the reference order
+    ordered = list(restaurants)
+    for key, asc in reversed(list(zip(keys, ascending))):
+        ordered.sort(key=lambda r: r[key], reverse=not asc)
+    return ordered
+
+
+@pytest.mark.parametrize("keys, ascending", [
+    (["rating"], [False]),
+    (["rating"], [True]),
+    (["rating", "reviews"], [False, False]),
+    (["rating", "reviews"], [False, True]),
+    (["name", "rating"], [False, True]),
+])
+def test_top_records_matches_a_stable_full_sort(keys, ascending):
+    restaurants = make_restaurants(400)
+
+    for count in (0, 1, 7, 400, 1000):
+        expected = full_sort(restaurants, keys, ascending)[:count]
+        assert top_records(restaurants, count, keys, ascending) == expected
+
+        # The table path selects the same rows for numeric columns
+        if "name" not in keys:
+            table = RestaurantTable.from_records(restaurants)
+            assert table.to_records(table.top(count, keys, ascending)) == expected
+
+
+def test_missing_values_sort_last_and_records_are_not_copied():
+    restaurants = [{"name": "A"}, {"name": "B", "rating": 4.0}, {"name": "C", "rating": None},
+                   {"name": "D", "rating": 4.5}]
+
+    top = top_records(restaurants, 4, "rating")
+    assert [r["name"] for r in top] == ["D", "B", "A", "C"]
+    assert [r["name"] for r in top_records(restaurants, 4, "rating", ascending=True)] == ["B", "D", "A", "C"]
+    assert top[0] is restaurants[3]
+
+    assert top_indices([np.array([1.0, np.nan, 3.0])], 3).tolist() == [2, 0, 1]
+
+
+def test_ascending_needs_one_flag_per_key():
+    with pytest.raises(ValueError):
+        top_records(make_restaurants(5), 2, ["rating", "reviews"], [True])
+
+
+def test_get_top_restaurants_skips_the_dataframe_round_trip(monkeypatch):
+    pytest.importorskip("openai")
+    from src.data_processing import process_yelp_api_data
+
+    def fail(restaurants):
+        raise AssertionError("get_top_restaurants shouldn't build a DataFrame")
+
+    monkeypatch.setattr(process_yelp_api_data, "convert_json_to_dataframe", fail)
+    restaurants = make_restaurants(50)
+
+    top = process_yelp_api_data.get_top_restaurants(restaurants, count=5, sort_by=["rating", "reviews"])
+    assert top == full_sort(restaurants, ["rating", "reviews"], [False, False])[:5]
+    # The records themselves come back, not rows rebuilt from a DataFrame
+    assert any(top[0] is restaurant for restaurant in restaurants)
+    assert process_yelp_api_data.get_top_restaurants(restaurants, count=3, sort_by="missing") == restaurants[:3]
+
+
+if __name__ == "__main__":
+    for keys, ascending in ((["rating"], [False]), (["rating", "reviews"], [False, True]),
+                            (["name", "rating"], [False, True])):
+        test_top_records_matches_a_stable_full_sort(keys, ascending)
+    test_missing_values_sort_last_and_records_are_not_copied()
+    test_ascending_needs_one_flag_per_key()
+    print("All top-k tests passed.")
@@ -0,0 +1,108 @@
+import sqlite3
+
+from fake_supabase import FakeSupabase
+
+from src.api.write_journal import WriteBehindJournal
+
+
+class FlakySupabase(FakeSupabase):
+    """Fails every request until `healthy` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.healthy = False
+
+    def table(self, name):
+        if not self.healthy:
+            raise Exception("connection reset")
+        return super().table(name)
+
+
+def test_flush_writes_restaurants_before_their_reviews(tmp_path):
+    supabase = FakeSupabase()
+    journal = WriteBehindJournal(supabase, path=str(tmp_path / "journal.sqlite"))
+
+    journal.append("review", {"place_id": "abc", "user_id": "u1", "restaurant_id": None})
+    journal.append("restaurant", {"place_id": "abc", "name": "Pink Door"})
+    journal.append("review_sync_state", {"place_id": "abc", "last_reviews_count": 1})
+
+    assert journal.flush_once() == 3
+    assert journal.pending() == 0
+    review = supabase.tables["reviews"][0]
+    assert review["restaurant_id"] == supabase.tables["restaurants"][0]["id"]
+    assert "place_id" not in review
+
+
+def test_failed_records_are_replayed_by_the_next_journal(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    supabase = FlakySupabase()
+    journal = WriteBehindJournal(supabase, path=path, max_attempts=10)
+    journal.append_many("restaurant", [{"place_id": f"p{i}"} for i in range(3)])
+
+    assert journal.flush_once() == 0
+    assert journal.close(timeout=0) == 3
+
+    # A later run picks the records up from the same file
+    supabase.healthy = True
+    replay = WriteBehindJournal(supabase, path=path).start()
+    assert replay.close() == 0
+    assert len(supabase.tables["restaurants"]) == 3
+
+
+def test_records_that_keep_failing_go_to_dead_letters(tmp_path):
+    journal = WriteBehindJournal(FakeSupabase(), path=str(tmp_path / "journal.sqlite"), max_attempts=2)
+    # No restaurant with this place_id is ever written
+    journal.append("review", {"place_id": "missing", "user_id": "u1"})
+
+    journal.flush_once()
+    journal.flush_once()
+
+    assert journal.pending() == 0
+    assert journal.stats["dead_letters"] == 1
+
+
+class ReviewsDownSupabase(FakeSupabase):
+    """Fails every request to the reviews table"""
+
+    def table(self, name):
+        if name == "reviews":
+            raise Exception("reviews unavailable")
+        return super().table(name)
+
+
+def test_watermarks_wait_for_their_reviews(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    supabase = ReviewsDownSupabase()
+    journal = WriteBehindJournal(supabase, path=path, max_attempts=3)
+    journal.append("restaurant", {"place_id": "abc", "name": "Pink Door"})
+    journal.append("review", {"place_id": "abc", "user_id": "u1"})
+    journal.append("review_sync_state", {"place_id": "abc", "last_reviews_count": 1})
+    journal.append("review_sync_state", {"place_id": "other", "last_reviews_count": 4})
+
+    # The restaurant and the other place's mark are written; abc's mark is held
+    assert journal.flush_once() == 2
+    assert [row["place_id"] for row in supabase.tables["review_sync_state"]] == ["other"]
+    assert journal.pending() == 2
+
+    journal.flush_once()
+    journal.flush_once()
+
+    # Once the review is dead-lettered its place's mark is dropped, not written
+    assert journal.pending() == 0
+    assert [row["place_id"] for row in supabase.tables["review_sync_state"]] == ["other"]
+    with sqlite3.connect(path) as conn:
+        errors = dict(conn.execute("SELECT kind, error FROM dead_letters").fetchall())
+    assert errors == {"review": "reviews unavailable", "review_sync_state": "reviews not saved"}
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_flush_writes_restaurants_before_their_reviews,
+                 test_failed_records_are_replayed_by_the_next_journal,
+                 test_records_that_keep_failing_go_to_dead_letters,
+                 test_watermarks_wait_for_their_reviews):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("All write journal tests passed.")